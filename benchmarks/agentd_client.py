@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Throughput and latency of every client command against a local wazo-agentd.
+
+A FakeAgentd stand-in is started in-process on a random port, so the numbers
+include the full HTTP round trip over loopback but no real agentd work.
+
+    python benchmarks/agentd_client.py [--agents 1000] [--threads 1]
+        [--decode-sizes 1000 10000 100000]
+"""
+
+import argparse
+import itertools
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.commands.agents import AgentsCommand
+from wazo_agentd_client.commands.status import StatusCommand
+from wazo_agentd_client.helpers import ResponseProcessor
+from wazo_agentd_client.tests.fake_agentd import FakeAgentd, FakeAgentdState
+
+TOKEN = 'benchmark-token'
+
+
+class _BenchClient(AgentdClient):
+    def _load_plugins(self):
+        self.agents = AgentsCommand(self)
+        self.status = StatusCommand(self)
+
+
+def new_client(agentd):
+    return _BenchClient(agentd.host, port=agentd.port, https=False, token=TOKEN)
+
+
+def run(operation, args_list, threads):
+    latencies = []
+
+    def timed(args):
+        start = time.perf_counter()
+        operation(*args)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if threads == 1:
+        for args in args_list:
+            timed(args)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(timed, args_list))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, latencies
+
+
+def percentile(latencies, p):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def report(name, ops_per_sec, latencies):
+    print(
+        f'{name:<28} {ops_per_sec:>10.0f} '
+        f'{percentile(latencies, 50) * 1e3:>9.2f} '
+        f'{percentile(latencies, 99) * 1e3:>9.2f}'
+    )
+
+
+def bench_commands(nb_agents, threads):
+    state = FakeAgentdState()
+    state.populate(nb_agents, nb_queues=1, logged_ratio=0)
+    state.add_queue(1000, 'benchmark')
+    state.user_agents[TOKEN] = 1
+
+    with FakeAgentd(state) as agentd:
+        agents = new_client(agentd).agents
+        status = new_client(agentd).status
+        ids = [(agent_id,) for agent_id in range(2, nb_agents + 1)]
+        numbers = [(str(1000 + agent_id),) for (agent_id,) in ids]
+        logins = [(agent_id, str(2000 + agent_id), 'default') for (agent_id,) in ids]
+        number_logins = [
+            (number, str(3000 + int(number)), 'default') for (number,) in numbers
+        ]
+        in_queue = [(agent_id, 1000) for (agent_id,) in ids]
+        user_cycles = max(1, len(ids) // 4)
+
+        print(f'{"command":<28} {"ops/sec":>10} {"p50 (ms)":>9} {"p99 (ms)":>9}')
+        benchmarks = [
+            ('login_agent', agents.login_agent, logins),
+            ('pause_agent_by_number', agents.pause_agent_by_number, numbers),
+            ('unpause_agent_by_number', agents.unpause_agent_by_number, numbers),
+            ('add_agent_to_queue', agents.add_agent_to_queue, in_queue),
+            ('remove_agent_from_queue', agents.remove_agent_from_queue, in_queue),
+            ('get_agent_status', agents.get_agent_status, ids),
+            ('get_agent_status_by_number', agents.get_agent_status_by_number, numbers),
+            ('logoff_agent', agents.logoff_agent, ids),
+            ('login_agent_by_number', agents.login_agent_by_number, number_logins),
+            ('logoff_agent_by_number', agents.logoff_agent_by_number, numbers),
+            ('get_agent_statuses', agents.get_agent_statuses, [()] * 50),
+            ('relog_all_agents', agents.relog_all_agents, [()] * 50),
+            ('logoff_all_agents', agents.logoff_all_agents, [()] * 50),
+            ('status', status, [()] * len(ids)),
+        ]
+        for name, operation, args_list in benchmarks:
+            report(name, *run(operation, args_list, threads))
+
+        def user_agent_cycle(line_id):
+            agents.login_user_agent(line_id)
+            agents.pause_user_agent()
+            agents.get_user_agent_status()
+            agents.unpause_user_agent()
+            agents.logoff_user_agent()
+
+        ops_per_sec, latencies = run(
+            user_agent_cycle, [(i,) for i in range(user_cycles)], threads=1
+        )
+        report('users/me cycle (5 calls)', ops_per_sec * 5, latencies)
+
+
+def bench_decode(sizes):
+    processor = ResponseProcessor()
+    print()
+    print(f'{"agents":>8} {"fetch+decode (ms)":>18} {"decode (ms)":>12}')
+    for nb_agents in sizes:
+        state = FakeAgentdState()
+        state.populate(nb_agents, nb_tenants=10)
+        with FakeAgentd(state) as agentd:
+            client = new_client(agentd)
+            agents = client.agents
+            start = time.perf_counter()
+            agents.get_agent_statuses(recurse=True)
+            fetch = time.perf_counter() - start
+
+            session = client.session()
+            resp = session.get(f'{agents.base_url}?recurse=true')
+            resp.content
+            timings = []
+            for _ in itertools.repeat(None, 3):
+                start = time.perf_counter()
+                processor.status_all(resp)
+                timings.append(time.perf_counter() - start)
+        print(
+            f'{nb_agents:>8} {fetch * 1e3:>18.1f} '
+            f'{statistics.median(timings) * 1e3:>12.1f}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--agents', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument(
+        '--decode-sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    bench_commands(args.agents, args.threads)
+    bench_decode(args.decode_sizes)
+
+
+if __name__ == '__main__':
+    main()
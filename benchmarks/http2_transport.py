@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compare the HTTP/1.1 and HTTP/2 transports under concurrent calls.
+
+Both servers run FakeAgentdState in another process. They answer every request
+after `--latency` milliseconds, standing in for the work done by wazo-agentd,
+and serve a new connection after `--connect-latency` milliseconds, standing in
+for the TCP and TLS handshakes that loopback does not have. The HTTP/2
+stand-in speaks cleartext HTTP/2 (prior knowledge); against wazo-agentd on
+port 443, HTTP/2 is negotiated with ALPN instead.
+
+The HTTP/2 stand-in is a single-threaded pure Python server and limits the
+calls per second of HTTP/2; "client CPU" is the CPU time used per call by the
+client process alone.
+
+Needs h2 (pip install httpx[http2]).
+
+    python benchmarks/http2_transport.py [--calls 3000] [--threads 50]
+        [--latency 5] [--connect-latency 3]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h2.config
+import h2.connection
+import h2.events
+from requests.structures import CaseInsensitiveDict
+
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.commands.agents import AgentsCommand
+from wazo_agentd_client.http2 import HTTP2Adapter
+from wazo_agentd_client.tests.fake_agentd import FakeAgentd, FakeAgentdState
+
+TOKEN = 'benchmark-token'
+
+
+class _BenchClient(AgentdClient):
+    def _load_plugins(self):
+        self.agents = AgentsCommand(self)
+
+
+class _SlowState:
+    """The state of the HTTP/1.1 server, answering after `latency` seconds."""
+
+    def __init__(self, state, latency):
+        self._state = state
+        self._latency = latency
+
+    def handle(self, *args):
+        time.sleep(self._latency)
+        return self._state.handle(*args)
+
+
+class _H2Protocol(asyncio.Protocol):
+    def __init__(self, server):
+        self._server = server
+        self._conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding='utf-8')
+        )
+        self._requests = {}
+        # stream id -> response body not sent yet for lack of flow control window
+        self._pending = {}
+        self._transport = None
+        self._ready_at = None
+
+    def connection_made(self, transport):
+        self._server.connections += 1
+        self._transport = transport
+        loop = asyncio.get_running_loop()
+        self._ready_at = loop.time() + self._server.connect_latency
+        self._conn.initiate_connection()
+        transport.write(self._conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self._conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self._requests[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self._requests[event.stream_id][1].extend(event.data)
+                self._conn.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                headers, body = self._requests.pop(event.stream_id)
+                asyncio.ensure_future(self._respond(event.stream_id, headers, body))
+            elif isinstance(event, h2.events.WindowUpdated):
+                for stream_id in list(self._pending):
+                    self._send_body(stream_id)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self._transport.close()
+        self._transport.write(self._conn.data_to_send())
+
+    async def _respond(self, stream_id, headers, body):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(0.0, self._ready_at - loop.time()))
+        await asyncio.sleep(self._server.latency)
+        status_code, response_headers, content = self._server.state.handle(
+            headers[':method'], headers[':path'], CaseInsensitiveDict(headers), body
+        )
+        self._conn.send_headers(
+            stream_id,
+            [
+                (':status', str(status_code)),
+                ('content-length', str(len(content))),
+                *((name.lower(), value) for name, value in response_headers.items()),
+            ],
+            end_stream=not content,
+        )
+        if content:
+            self._pending[stream_id] = content
+            self._send_body(stream_id)
+        self._transport.write(self._conn.data_to_send())
+
+    def _send_body(self, stream_id):
+        content = self._pending[stream_id]
+        size = min(
+            len(content),
+            self._conn.local_flow_control_window(stream_id),
+            self._conn.max_outbound_frame_size,
+        )
+        while size > 0:
+            chunk, content = content[:size], content[size:]
+            self._conn.send_data(stream_id, chunk, end_stream=not content)
+            size = min(
+                len(content),
+                self._conn.local_flow_control_window(stream_id),
+                self._conn.max_outbound_frame_size,
+            )
+        if content:
+            self._pending[stream_id] = content
+        else:
+            del self._pending[stream_id]
+
+
+class FakeAgentdHTTP2:
+    """A cleartext HTTP/2 server in front of a FakeAgentdState."""
+
+    def __init__(self, state, latency=0.0, host='127.0.0.1', connect_latency=0.0):
+        self.state = state
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.host = host
+        self.port = None
+        self.connections = 0
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self._server = self._loop.run_until_complete(
+            self._loop.create_server(lambda: _H2Protocol(self), self.host, 0)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def run(client, nb_calls, threads):
+    agents = client.agents
+    operations = [
+        lambda agent: agents.get_agent_status(agent),
+        lambda agent: agents.pause_agent_by_number(str(1000 + agent)),
+        lambda agent: agents.unpause_agent_by_number(str(1000 + agent)),
+    ]
+    latencies = []
+
+    def call(i):
+        start = time.perf_counter()
+        operations[i % len(operations)](i // len(operations) % 100 + 1)
+        latencies.append(time.perf_counter() - start)
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, range(nb_calls)))
+    elapsed = time.perf_counter() - start
+    cpu = (time.process_time() - cpu_start) / nb_calls
+    latencies.sort()
+    return nb_calls / elapsed, latencies[len(latencies) // 2], latencies[-1], cpu
+
+
+def serve(server_class, latency, connect_latency, ready, stop, connections):
+    state = FakeAgentdState()
+    state.populate(100, logged_ratio=1)
+    with server_class(state, latency, connect_latency=connect_latency) as agentd:
+        ready.send((agentd.host, agentd.port))
+        stop.wait()
+        connections.value = agentd.connections
+
+
+def _serve_http1(state, latency, connect_latency):
+    return FakeAgentd(_SlowState(state, latency), connect_latency=connect_latency)
+
+
+def bench(name, server_class, args, **client_kwargs):
+    # servers run in another process, so that they do not compete with the
+    # client for the GIL
+    ready, ready_child = multiprocessing.Pipe()
+    stop = multiprocessing.Event()
+    connections = multiprocessing.Value('i', 0)
+    server = multiprocessing.Process(
+        target=serve,
+        args=(
+            server_class,
+            args.latency / 1e3,
+            args.connect_latency / 1e3,
+            ready_child,
+            stop,
+            connections,
+        ),
+    )
+    server.start()
+    host, port = ready.recv()
+    client = _BenchClient(host, port=port, https=False, token=TOKEN, **client_kwargs)
+    ops, p50, slowest, cpu = run(client, args.calls, args.threads)
+    stop.set()
+    server.join()
+    print(
+        f'{name:<10} {ops:>9.0f} {p50 * 1e3:>9.1f} {slowest * 1e3:>9.1f} '
+        f'{cpu * 1e6:>16.0f} {connections.value:>12}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=3000)
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=5.0, help='milliseconds')
+    parser.add_argument(
+        '--connect-latency', type=float, default=3.0, help='milliseconds'
+    )
+    args = parser.parse_args()
+
+    print(
+        f'{"transport":<10} {"calls/s":>9} {"p50 (ms)":>9} {"max (ms)":>9} '
+        f'{"client CPU (us)":>16} {"connections":>12}'
+    )
+    bench('http1', _serve_http1, args)
+    adapter = HTTP2Adapter(http1=False, max_connections=1)
+    bench('http2', FakeAgentdHTTP2, args, transport=adapter)
+    adapter.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compare the codecs decoding agent status snapshots and encoding bodies.
+
+"requests" is the path used without codec: Response.json() and then
+_AgentStatus.new_from_dict. Codecs whose backend is not installed are skipped.
+
+    python benchmarks/json_codec.py [--agents 10000 100000] [--runs 5]
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+from status_memory import generate_payload
+
+from wazo_agentd_client.codec import JSONCodec, MsgspecCodec, OrjsonCodec
+from wazo_agentd_client.helpers import ResponseProcessor
+
+LOGIN = {'extension': '1001', 'context': 'internal'}
+
+
+def best_of(runs, fun):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fun()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def new_response(content):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = content
+    return response
+
+
+def processors():
+    yield 'requests', ResponseProcessor(), None
+    for codec_class in (JSONCodec, OrjsonCodec, MsgspecCodec):
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f'{codec_class.name}: not installed, skipped')
+            continue
+        yield codec.name, ResponseProcessor(codec), codec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--agents', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--bodies', type=int, default=100_000)
+    args = parser.parse_args()
+
+    candidates = list(processors())
+    print(
+        f'{"codec":<9} {"agents":>8} {"decode min (ms)":>16} '
+        f'{"decode p50 (ms)":>16} {"agents/s":>12}'
+    )
+    for nb_agents in args.agents:
+        content = generate_payload(nb_agents).encode()
+        for name, processor, _ in candidates:
+            fastest, median = best_of(
+                args.runs, lambda: processor.status_all(new_response(content))
+            )
+            print(
+                f'{name:<9} {nb_agents:>8} {fastest * 1e3:>16.1f} '
+                f'{median * 1e3:>16.1f} {nb_agents / fastest:>12,.0f}'
+            )
+
+    print()
+    print(f'{"codec":<9} {"bodies":>8} {"encode (ms)":>12}')
+    for name, _, codec in candidates:
+        if codec is None:
+            continue
+        fastest, _ = best_of(
+            args.runs, lambda: [codec.dumps(LOGIN) for _ in range(args.bodies)]
+        )
+        print(f'{name:<9} {args.bodies:>8} {fastest * 1e3:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
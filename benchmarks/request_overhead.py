@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Measure the client-side CPU cost of a call, without any network I/O.
+
+Responses are produced by a transport adapter mounted on the session, so the
+numbers only include request building, preparation and response decoding.
+"before" sends through a new session and Session.prepare_request on every
+call, as _execute used to; "after" is the current path.
+
+    python benchmarks/request_overhead.py [--calls 20000]
+"""
+
+import argparse
+import json
+import time
+
+import requests
+from requests.adapters import BaseAdapter
+
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.commands.agents import AgentsCommand
+
+TENANT_UUID = '2c3a8f4e-8d5c-4e0b-a3e5-7a0c9f1d2b3c'
+STATUS = {
+    'id': 12,
+    'number': '1012',
+    'origin_uuid': 'f3c4ad4d-7a5b-4f0b-9d2f-0b8a3b3e9a11',
+    'logged': True,
+    'paused': False,
+    'extension': '1001',
+    'context': 'internal',
+    'state_interface': 'PJSIP/abcdef',
+    'tenant_uuid': TENANT_UUID,
+    'queues': ['sales'],
+}
+
+
+class _CannedAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if request.method == 'GET':
+            response.status_code = 200
+            response._content = json.dumps(STATUS).encode()
+        else:
+            response.status_code = 204
+            response._content = b''
+        return response
+
+    def close(self):
+        pass
+
+
+class _BenchClient(AgentdClient):
+    def _load_plugins(self):
+        pass
+
+    def session(self):
+        session = super().session()
+        session.mount('https://', _CannedAdapter())
+        return session
+
+
+def _legacy_send(command):
+    def _send(req, processor_fun, timeout=None, stream=False):
+        client = command._client
+        resp = client.session().send(
+            client.session().prepare_request(req), timeout=timeout, stream=stream
+        )
+        return processor_fun(resp)
+
+    return _send
+
+
+def _per_call_us(fun, calls):
+    start = time.process_time()
+    for _ in range(calls):
+        fun()
+    return (time.process_time() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20_000)
+    args = parser.parse_args()
+
+    client = _BenchClient('agentd.example.com', token='token', tenant=TENANT_UUID)
+    after = AgentsCommand(client)
+    before = AgentsCommand(client)
+    before._send = _legacy_send(before)
+
+    operations = {
+        'login': lambda command: command.login_agent(12, '1001', 'internal'),
+        'pause': lambda command: command.pause_agent_by_number('1012'),
+        'status': lambda command: command.get_agent_status(12),
+    }
+
+    print(f'{"operation":<10} {"before (us)":>12} {"after (us)":>11} {"speedup":>8}')
+    for name, operation in operations.items():
+        before_us = _per_call_us(lambda: operation(before), args.calls)
+        after_us = _per_call_us(lambda: operation(after), args.calls)
+        print(
+            f'{name:<10} {before_us:>12.1f} {after_us:>11.1f} '
+            f'{before_us / after_us:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Import and construction time of the client, with and without entry points.
+
+Every run is a fresh interpreter, so module and entry point caches of the
+measuring process do not hide the cost paid by a short-lived process.
+
+    python benchmarks/startup.py [--runs 20]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from wazo_agentd_client import Client
+imported = time.perf_counter()
+client = Client('localhost', token='token', static_registry={static})
+created = time.perf_counter()
+client.agents, client.status
+accessed = time.perf_counter()
+json.dump([imported - start, created - imported, accessed - created], sys.stdout)
+'''
+
+
+def probe(static):
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(static=static)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f'{"registry":<12} {"import (ms)":>12} {"Client() (ms)":>14} '
+        f'{"first access (ms)":>18} {"total (ms)":>11}'
+    )
+    for name, static in (('entry points', False), ('static', True)):
+        runs = [probe(static) for _ in range(args.runs)]
+        medians = [statistics.median(phase) * 1e3 for phase in zip(*runs)]
+        print(
+            f'{name:<12} {medians[0]:>12.1f} {medians[1]:>14.1f} '
+            f'{medians[2]:>18.1f} {sum(medians):>11.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compare the memory retained by decoded agent status snapshots.
+
+The "dict" representation is the previous _AgentStatus (a regular dataclass
+without interning), "compact" is the current slot-based one.
+
+    python benchmarks/status_memory.py [--agents 10000 50000 100000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+
+from wazo_agentd_client.helpers import _AgentStatus
+
+
+@dataclass
+class _DictAgentStatus:
+    id: str
+    number: str
+    origin_uuid: str
+    logged: bool = False
+    paused: bool = False
+    extension: str | None = None
+    context: str | None = None
+    state_interface: str | None = None
+    tenant_uuid: str | None = None
+    queues: list[str] = field(default_factory=list)
+
+    @classmethod
+    def new_from_dict(cls, d):
+        obj = cls(d['id'], d['number'], d['origin_uuid'])
+        obj.logged = d['logged']
+        obj.paused = d['paused']
+        obj.extension = d['extension']
+        obj.context = d['context']
+        obj.state_interface = d['state_interface']
+        obj.tenant_uuid = d['tenant_uuid']
+        obj.queues = d.get('queues', [])
+        return obj
+
+
+def generate_payload(nb_agents, nb_tenants=50, nb_queues=20):
+    tenants = [f'{i:08x}-0000-4000-8000-000000000000' for i in range(nb_tenants)]
+    statuses = []
+    for i in range(nb_agents):
+        tenant_index = i % nb_tenants
+        statuses.append(
+            {
+                'id': i,
+                'number': str(1000 + i),
+                'origin_uuid': 'f3c4ad4d-7a5b-4f0b-9d2f-0b8a3b3e9a11',
+                'logged': i % 3 != 0,
+                'paused': i % 7 == 0,
+                'extension': str(2000 + i),
+                'context': f'ctx-tenant-{tenant_index}',
+                'state_interface': f'PJSIP/line-{i}',
+                'tenant_uuid': tenants[tenant_index],
+                'queues': [f'queue-{(i + q) % nb_queues}' for q in range(3)],
+            }
+        )
+    return json.dumps(statuses)
+
+
+def measure(cls, payload):
+    gc.collect()
+    tracemalloc.start()
+    statuses = [cls.new_from_dict(d) for d in json.loads(payload)]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert statuses
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--agents', type=int, nargs='+', default=[10_000, 50_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    print(f'{"agents":>8} {"dict (MiB)":>12} {"compact (MiB)":>14} {"saved":>7}')
+    for nb_agents in args.agents:
+        payload = generate_payload(nb_agents)
+        before = measure(_DictAgentStatus, payload)
+        after = measure(_AgentStatus, payload)
+        print(
+            f'{nb_agents:>8} {before / 2**20:>12.1f} {after / 2**20:>14.1f} '
+            f'{1 - after / before:>7.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from setuptools import find_packages, setup
@@ -14,9 +14,22 @@ setup(
     url='http://wazo.community',
     packages=find_packages(),
     entry_points={
+        'console_scripts': [
+            'wazo-agentd-bulk = wazo_agentd_client.cli:main',
+        ],
         'wazo_agentd_client.commands': [
             'agents = wazo_agentd_client.commands.agents:AgentsCommand',
             'status = wazo_agentd_client.commands.status:StatusCommand',
         ],
+        'wazo_agentd_client.aio_commands': [
+            'agents = wazo_agentd_client.aio.commands.agents:AsyncAgentsCommand',
+            'status = wazo_agentd_client.aio.commands.status:AsyncStatusCommand',
+        ],
+    },
+    extras_require={
+        'aio': ['httpx'],
+        'http2': ['httpx[http2]'],
+        'msgspec': ['msgspec'],
+        'orjson': ['orjson'],
     },
 )
@@ -0,0 +1,6 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from wazo_agentd_client.aio.client import AsyncAgentdClient
+
+__all__ = ['AsyncAgentdClient']
@@ -0,0 +1,108 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import ssl
+from datetime import timedelta
+from time import perf_counter
+
+import httpx
+
+from wazo_agentd_client.aio.helpers import (
+    to_httpx_timeout,
+    to_requests_exceptions,
+    to_requests_response,
+)
+from wazo_agentd_client.client import AgentdClient
+
+# hop-by-hop headers set on the requests session that would defeat connection reuse
+_EXCLUDED_HEADERS = frozenset(['connection'])
+
+
+class AsyncAgentdClient(AgentdClient):
+    namespace = 'wazo_agentd_client.aio_commands'
+    command_registry = {
+        'agents': 'wazo_agentd_client.aio.commands.agents:AsyncAgentsCommand',
+        'status': 'wazo_agentd_client.aio.commands.status:AsyncStatusCommand',
+    }
+
+    def __init__(
+        self, host, max_connections=100, max_keepalive_connections=20, **kwargs
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._http_client = None
+        super().__init__(host, **kwargs)
+
+    def http_client(self):
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                verify=self._ssl_verify(),
+                limits=self._limits,
+                http2=self.transport == 'http2',
+            )
+        return self._http_client
+
+    async def send(self, prepared_request, timeout=None, stream=False):
+        """Send a request and return a requests.Response.
+
+        With `stream`, the body of a successful response is not read: the
+        httpx response is the `raw` of the returned response, and must be
+        closed by the caller.
+        """
+        start = perf_counter()
+        http_client = self.http_client()
+        with to_requests_exceptions():
+            request = http_client.build_request(
+                prepared_request.method,
+                prepared_request.url,
+                headers=self._headers(prepared_request),
+                content=prepared_request.body,
+                timeout=to_httpx_timeout(timeout),
+            )
+            resp = await http_client.send(request, stream=stream)
+            if stream and not resp.is_success:
+                # error bodies are small and decoded by the response processor
+                try:
+                    await resp.aread()
+                finally:
+                    await resp.aclose()
+                stream = False
+        if stream:
+            response = to_requests_response(resp, prepared_request, raw=resp)
+        else:
+            response = to_requests_response(resp, prepared_request)
+        # without stream, httpx reads the whole body before returning: download
+        # time is included
+        response.elapsed = timedelta(seconds=perf_counter() - start)
+        return response
+
+    async def close(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @staticmethod
+    def _headers(prepared_request):
+        return {
+            name: value
+            for name, value in prepared_request.headers.items()
+            if name.lower() not in _EXCLUDED_HEADERS
+        }
+
+    def _adapter(self, session):
+        # requests are sent by the httpx client, HTTP/2 included
+        return None
+
+    def _ssl_verify(self):
+        verify = self.session().verify
+        if isinstance(verify, str):
+            return ssl.create_default_context(cafile=verify)
+        return verify
@@ -0,0 +1,215 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import itertools
+import time
+
+import requests
+
+from wazo_agentd_client.commands.agents import (
+    DEFAULT_BULK_WORKERS,
+    AgentsCommand,
+    _prepare_request,
+    _RetryableResponse,
+    _RetryingProcessor,
+    _tenants_of,
+)
+from wazo_agentd_client.deadline import (
+    _check_deadline,
+    _check_delay,
+    _deadline_errors,
+    _timeout,
+)
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import (
+    _BulkItemResult,
+    _BulkResult,
+    _diff_agent_statuses,
+    _TenantResult,
+)
+from wazo_agentd_client.instrumentation import CallTracker
+
+
+class AsyncAgentsCommand(AgentsCommand):
+    """Every public method of AgentsCommand returns an awaitable.
+
+    Requests are built by the same _RequestFactory and decoded by the same
+    ResponseProcessor; only the transport differs.
+    """
+
+    async def iter_agent_statuses(self, tenant_uuid=None, recurse=False):
+        tenant_uuid = tenant_uuid or self._client.tenant_uuid
+        req = self._req_factory.status_all(tenant_uuid=tenant_uuid, recurse=recurse)
+        statuses = await self._execute(
+            req, self._resp_processor.status_aiter, stream=True
+        )
+        async for status in statuses:
+            yield status
+
+    async def watch_agent_statuses(
+        self,
+        tenant_uuid=None,
+        recurse=False,
+        interval=1.0,
+        max_interval=10.0,
+        backoff=2.0,
+    ):
+        snapshot = {}
+        delay = interval
+        while True:
+            statuses = await self.get_agent_statuses(tenant_uuid, recurse)
+            snapshot, changes = _diff_agent_statuses(snapshot, statuses)
+            if changes:
+                delay = interval
+                for change in changes:
+                    yield change
+            else:
+                delay = min(delay * backoff, max_interval)
+            await asyncio.sleep(delay)
+
+    async def logoff_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        results = self._run_tenants(
+            self.logoff_all_agents, tenant_uuids, timeout, max_workers
+        )
+        async for result in results:
+            yield result
+
+    async def relog_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        results = self._run_tenants(
+            self.relog_all_agents, tenant_uuids, timeout, max_workers
+        )
+        async for result in results:
+            yield result
+
+    async def _run_tenants(self, fun, tenant_uuids, timeout, max_workers):
+        if tenant_uuids is None:
+            tenant_uuids = _tenants_of(await self.get_agent_statuses(recurse=True))
+        tenant_uuids = list(tenant_uuids)
+        semaphore = asyncio.Semaphore(max_workers or DEFAULT_BULK_WORKERS)
+
+        async def call(tenant_uuid):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    await fun(tenant_uuid, timeout=timeout)
+                except (AgentdClientError, requests.RequestException) as e:
+                    return tenant_uuid, time.monotonic() - start, e
+                return tenant_uuid, time.monotonic() - start, None
+
+        tasks = [
+            asyncio.ensure_future(call(tenant_uuid)) for tenant_uuid in tenant_uuids
+        ]
+        try:
+            for completed, task in enumerate(asyncio.as_completed(tasks), 1):
+                tenant_uuid, elapsed, error = await task
+                yield _TenantResult(
+                    tenant_uuid, error, elapsed, completed, len(tenant_uuids)
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_bulk(self, fun, items, max_workers=None):
+        semaphore = asyncio.Semaphore(max_workers or DEFAULT_BULK_WORKERS)
+
+        async def call(item):
+            async with semaphore:
+                try:
+                    await fun(**item)
+                except (AgentdClientError, requests.RequestException) as e:
+                    return _BulkItemResult(item, e)
+                return _BulkItemResult(item)
+
+        results = await asyncio.gather(*(call(item) for item in items))
+        return _BulkResult(list(results))
+
+    async def _execute(self, req, processor_fun, timeout=None, stream=False):
+        _check_deadline()
+        status_cache = self._client.status_cache
+        if status_cache is None:
+            return await self._send(req, processor_fun, timeout, stream)
+
+        if req.method == 'GET' and req.agent:
+            tenant_uuid = self._request_tenant(req)
+            status = status_cache.get(tenant_uuid, *req.agent)
+            if status is None:
+                status = await self._send(req, processor_fun, timeout)
+                status_cache.set(tenant_uuid, *req.agent, status)
+            return status
+
+        try:
+            return await self._send(req, processor_fun, timeout, stream)
+        finally:
+            if req.method != 'GET':
+                self._invalidate_status_cache(status_cache, req)
+
+    async def _send(self, req, processor_fun, timeout=None, stream=False):
+        if req.method != 'GET' or stream:
+            return await self._send_retrying(req, processor_fun, timeout, stream)
+
+        validator_cache = self._client.validator_cache
+        if validator_cache is not None:
+            processor_fun = self._conditional(validator_cache, req, processor_fun)
+        single_flight = self._client.single_flight
+        if single_flight is None:
+            return await self._send_retrying(req, processor_fun, timeout)
+        return await single_flight.ado(
+            self._flight_key(req),
+            lambda: self._send_retrying(req, processor_fun, timeout),
+        )
+
+    async def _send_retrying(self, req, processor_fun, timeout=None, stream=False):
+        retry_policy = self._client.retry_policy
+        if retry_policy is None:
+            return await self._send_once(req, processor_fun, timeout, stream)
+
+        host = self._host()
+        for attempt in itertools.count():
+            trial = retry_policy.before_attempt(host)
+            # the client reads the body of streamed responses that may be retried
+            retrying = _RetryingProcessor(
+                retry_policy, host, req.method, attempt, processor_fun
+            )
+            try:
+                return await self._send_once(req, retrying, timeout, stream)
+            except _RetryableResponse:
+                delay = retrying.delay
+            except requests.RequestException as e:
+                if retrying.reported:
+                    raise
+                retrying.reported = True
+                delay = retry_policy.retry_delay(host, req.method, attempt, error=e)
+                if delay is None:
+                    raise
+            finally:
+                # cancelled, cut by the deadline, or failed before sending
+                if trial and not retrying.reported:
+                    retry_policy.release_trial(host)
+            _check_delay(delay)
+            await asyncio.sleep(delay)
+
+    async def _send_once(self, req, processor_fun, timeout=None, stream=False):
+        rate_limiter = self._client.rate_limiter
+        if rate_limiter is not None:
+            async with rate_limiter.alimit(self._request_tenant(req)):
+                return await self._send_unlimited(req, processor_fun, timeout, stream)
+        return await self._send_unlimited(req, processor_fun, timeout, stream)
+
+    async def _send_unlimited(self, req, processor_fun, timeout=None, stream=False):
+        timeout = _timeout(timeout if timeout is not None else self.timeout)
+        listeners = self._client.instrumentation
+        with _deadline_errors():
+            if not listeners:
+                resp = await self._client.send(
+                    _prepare_request(self.session, req), timeout=timeout, stream=stream
+                )
+                return processor_fun(resp)
+
+            tenant_uuid = self._request_tenant(req)
+            with CallTracker(listeners, req.endpoint, tenant_uuid) as tracker:
+                prepared = _prepare_request(self.session, req)
+                tracker.prepared(prepared)
+                resp = await self._client.send(prepared, timeout=timeout, stream=stream)
+                tracker.received(resp)
+                return processor_fun(resp)
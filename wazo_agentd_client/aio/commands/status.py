@@ -0,0 +1,29 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import requests
+
+from wazo_agentd_client.commands.status import StatusCommand
+from wazo_agentd_client.deadline import _deadline_errors, _timeout
+from wazo_agentd_client.instrumentation import CallTracker
+
+
+class AsyncStatusCommand(StatusCommand):
+    async def __call__(self):
+        headers = self._get_headers()
+        req = requests.Request('GET', self.base_url, headers=headers)
+        timeout = _timeout(self.timeout)
+        listeners = self._client.instrumentation
+        with _deadline_errors():
+            if not listeners:
+                prepared = self.session.prepare_request(req)
+                r = await self._client.send(prepared, timeout=timeout)
+                return self._process(r)
+
+            tenant_uuid = self._client.tenant_uuid
+            with CallTracker(listeners, 'status', tenant_uuid) as tracker:
+                prepared = self.session.prepare_request(req)
+                tracker.prepared(prepared)
+                r = await self._client.send(prepared, timeout=timeout)
+                tracker.received(r)
+                return self._process(r)
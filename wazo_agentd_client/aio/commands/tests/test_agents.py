@@ -0,0 +1,161 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+import requests
+from hamcrest import assert_that, calling, contains_exactly, equal_to, raises
+from wazo_lib_rest_client.tests.command import RESTCommandTestCase
+
+from wazo_agentd_client.aio.commands.agents import AsyncAgentsCommand
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.retry import CircuitBreaker, RetryPolicy
+from wazo_agentd_client.tests.fake_client import FAKE_TENANT, new_client
+
+new_response = RESTCommandTestCase.new_response
+
+BASE_URL = 'https://example.org/api/agentd/1.0'
+
+
+class TestAsyncAgentsCommand(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = new_client(
+            send=AsyncMock(return_value=new_response(204)),
+            **{'url.side_effect': lambda *fragments: '/'.join([BASE_URL, *fragments])},
+        )
+        self.command = AsyncAgentsCommand(self.client)
+
+    async def test_login_agent(self):
+        await self.command.login_agent(2, '1001', 'default')
+
+        (prepared,) = self.client.send.call_args.args
+        assert_that(prepared.method, equal_to('POST'))
+        assert_that(prepared.url, equal_to(f'{BASE_URL}/agents/by-id/2/login'))
+        assert_that(prepared.headers['Wazo-Tenant'], equal_to(FAKE_TENANT))
+        assert_that(
+            json.loads(prepared.body),
+            equal_to({'extension': '1001', 'context': 'default'}),
+        )
+        assert_that(self.client.send.call_args.kwargs['timeout'], equal_to(10))
+
+    async def test_relog_all_agents_timeout(self):
+        await self.command.relog_all_agents(timeout=120)
+
+        assert_that(self.client.send.call_args.kwargs['timeout'], equal_to(120))
+
+    async def test_relog_tenants(self):
+        results = [
+            result
+            async for result in self.command.relog_tenants(['t1', 't2'], timeout=120)
+        ]
+
+        assert_that(
+            sorted(r.tenant_uuid for r in results if r.ok), contains_exactly('t1', 't2')
+        )
+        assert_that([r.completed for r in results], contains_exactly(1, 2))
+        tenants = sorted(
+            call.args[0].headers['Wazo-Tenant']
+            for call in self.client.send.call_args_list
+        )
+        assert_that(tenants, contains_exactly('t1', 't2'))
+
+    async def test_get_agent_statuses(self):
+        status = {
+            'id': 2,
+            'origin_uuid': '11-222',
+            'number': '1002',
+            'logged': True,
+            'paused': False,
+            'extension': '1222',
+            'context': 'alice',
+            'state_interface': 'SIP/alice',
+            'tenant_uuid': FAKE_TENANT,
+        }
+        self.client.send.return_value = new_response(200, [status])
+
+        statuses = await self.command.get_agent_statuses()
+
+        assert_that(statuses[0].number, equal_to('1002'))
+
+    async def test_watch_agent_statuses(self):
+        status = {
+            'id': 2,
+            'origin_uuid': '11-222',
+            'number': '1002',
+            'logged': False,
+            'paused': False,
+            'extension': None,
+            'context': None,
+            'state_interface': None,
+            'tenant_uuid': FAKE_TENANT,
+        }
+        paused = dict(status, logged=True, paused=True)
+        self.client.send.side_effect = [
+            new_response(200, [status]),
+            new_response(200, [status]),
+            new_response(200, [paused]),
+        ]
+
+        changes = self.command.watch_agent_statuses(interval=0)
+        kinds = [(await anext(changes)).kind for _ in range(2)]
+
+        assert_that(kinds, equal_to(['added', 'login']))
+        assert_that(self.client.send.call_count, equal_to(3))
+
+    async def test_error_is_raised_when_awaited(self):
+        self.client.send.return_value = new_response(409, {'error': 'already logged'})
+
+        coroutine = self.command.login_agent(2, '1001', 'default')
+
+        with self.assertRaises(AgentdClientError) as cm:
+            await coroutine
+        assert_that(cm.exception.error, equal_to('already logged'))
+
+    async def test_add_agents_to_queue(self):
+        async def send(prepared, timeout=None, stream=False):
+            if '/by-id/3/' in prepared.url:
+                return new_response(400, {'error': 'agent already in queue'})
+            return new_response(204)
+
+        self.client.send.side_effect = send
+
+        result = await self.command.add_agents_to_queue([1, 2, 3], 42, max_workers=2)
+
+        assert_that([r.ok for r in result.results], equal_to([True, True, False]))
+        assert_that(result.failed[0].error.error, equal_to('agent already in queue'))
+
+    async def test_instrumentation(self):
+        listener = Mock()
+        self.client.instrumentation.append(listener)
+
+        await self.command.logoff_agent_by_number('1002')
+
+        (metrics,) = listener.call_args.args
+        assert_that(metrics.command, equal_to('logoff_by_number'))
+        assert_that(metrics.tenant_uuid, equal_to(FAKE_TENANT))
+        assert_that(metrics.status_code, equal_to(204))
+
+    async def test_cancelled_trial_is_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.client.retry_policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+        self.client.send.side_effect = [
+            new_response(500),
+            asyncio.CancelledError(),
+            new_response(204),
+        ]
+
+        with self.assertRaises(requests.HTTPError):
+            await self.command.logoff_agent(2)
+        with self.assertRaises(asyncio.CancelledError):
+            await self.command.logoff_agent(2)
+        await self.command.logoff_agent(2)
+
+        assert_that(breaker.state('example.org:443'), equal_to('closed'))
+
+    def test_methods_are_awaitable(self):
+        coroutine = self.command.logoff_agent(2)
+
+        assert_that(calling(lambda: coroutine.send(None)), raises(StopIteration))
@@ -0,0 +1,64 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, equal_to
+
+from wazo_agentd_client import error
+from wazo_agentd_client.aio.client import AsyncAgentdClient
+from wazo_agentd_client.deadline import Deadline
+from wazo_agentd_client.error import AgentdClientError, DeadlineExceededError
+from wazo_agentd_client.ratelimit import RateLimiter
+from wazo_agentd_client.tests.fake_agentd import FakeAgentd, FakeAgentdState
+
+UNKNOWN_TENANT = 'ffffffff-ffff-4fff-8fff-ffffffffffff'
+
+
+class TestAsyncAgentsCommandOverHTTP(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.state = FakeAgentdState()
+        self.state.populate(nb_agents=4, nb_queues=2)
+        self.agentd = FakeAgentd(self.state).start()
+        self.addCleanup(self.agentd.stop)
+        self.rate_limiter = RateLimiter(rate=1000)
+        self.metrics = []
+        self.client = AsyncAgentdClient(
+            self.agentd.host,
+            port=self.agentd.port,
+            https=False,
+            rate_limiter=self.rate_limiter,
+            instrumentation=[self.metrics.append],
+        )
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_iter_agent_statuses(self):
+        statuses = await self.client.agents.get_agent_statuses()
+        streamed = [s async for s in self.client.agents.iter_agent_statuses()]
+
+        assert_that(streamed, equal_to(statuses))
+        assert_that(len(streamed), equal_to(4))
+        assert_that(self.rate_limiter.calls, equal_to(2))
+        assert_that(
+            [(m.command, m.status_code) for m in self.metrics],
+            equal_to([('status_all', 200)] * 2),
+        )
+
+    async def test_iter_agent_statuses_error(self):
+        streamed = self.client.agents.iter_agent_statuses(UNKNOWN_TENANT)
+
+        with self.assertRaises(AgentdClientError) as cm:
+            await anext(streamed)
+
+        assert_that(cm.exception.error, equal_to(error.UNAUTHORIZED))
+        assert_that(self.metrics[0].status_code, equal_to(401))
+
+    async def test_iter_agent_statuses_after_the_deadline(self):
+        with Deadline(0):
+            streamed = self.client.agents.iter_agent_statuses()
+            with self.assertRaises(DeadlineExceededError):
+                await anext(streamed)
+
+        assert_that(len(self.state.requests), equal_to(0))
@@ -0,0 +1,54 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from contextlib import contextmanager
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import NewConnectionError
+
+
+def to_httpx_timeout(timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def to_requests_response(resp, prepared_request, raw=None):
+    # ResponseProcessor works on requests.Response objects; converting keeps
+    # error mapping (including raise_for_status) identical to the sync client.
+    # With `raw`, the body is read from it instead of the read httpx response
+    response = requests.Response()
+    response.status_code = resp.status_code
+    response.headers = CaseInsensitiveDict(resp.headers.items())
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.reason = resp.reason_phrase
+    response.url = str(resp.url)
+    response.request = prepared_request
+    if raw is None:
+        response._content = resp.content
+    else:
+        response.raw = raw
+    return response
+
+
+@contextmanager
+def to_requests_exceptions():
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise requests.exceptions.ConnectTimeout(str(e)) from e
+    except httpx.ReadTimeout as e:
+        raise requests.exceptions.ReadTimeout(str(e)) from e
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.ConnectError as e:
+        # same shape as requests: tells retries that nothing reached the server
+        raise requests.exceptions.ConnectionError(
+            NewConnectionError(None, str(e))
+        ) from e
+    except httpx.TransportError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
@@ -0,0 +1,86 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+import httpx
+import requests
+from hamcrest import assert_that, calling, equal_to, not_none, raises
+
+from wazo_agentd_client.aio.helpers import (
+    to_httpx_timeout,
+    to_requests_exceptions,
+    to_requests_response,
+)
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import ResponseProcessor
+from wazo_agentd_client.retry import RetryPolicy
+
+
+def _convert(status_code, **kwargs):
+    url = 'http://example.org/agents'
+    transport = httpx.MockTransport(lambda r: httpx.Response(status_code, **kwargs))
+    with httpx.Client(transport=transport) as client:
+        httpx_resp = client.get(url)
+    return to_requests_response(httpx_resp, requests.Request('GET', url).prepare())
+
+
+class TestToRequestsResponse(unittest.TestCase):
+    def test_json_error_is_mapped(self):
+        resp = _convert(404, json={'error': 'no such agent'})
+
+        assert_that(
+            calling(ResponseProcessor().generic).with_args(resp),
+            raises(AgentdClientError),
+        )
+
+    def test_http_error_is_mapped(self):
+        resp = _convert(500, text='oops')
+
+        assert_that(
+            calling(ResponseProcessor().generic).with_args(resp),
+            raises(requests.HTTPError),
+        )
+
+    def test_body_and_headers(self):
+        resp = _convert(200, json=[], headers={'X-Foo': 'bar'})
+
+        assert_that(resp.json(), equal_to([]))
+        assert_that(resp.headers['x-foo'], equal_to('bar'))
+
+
+class TestToHttpxTimeout(unittest.TestCase):
+    def test_tuple(self):
+        timeout = to_httpx_timeout((1, 5))
+
+        assert_that(timeout.connect, equal_to(1))
+        assert_that(timeout.read, equal_to(5))
+
+    def test_none(self):
+        assert_that(to_httpx_timeout(None).read, equal_to(None))
+
+
+class TestToRequestsExceptions(unittest.TestCase):
+    def test_connect_timeout(self):
+        def fail():
+            with to_requests_exceptions():
+                raise httpx.ConnectTimeout('timeout')
+
+        assert_that(calling(fail), raises(requests.exceptions.ConnectTimeout))
+
+    def test_transport_error(self):
+        def fail():
+            with to_requests_exceptions():
+                raise httpx.RemoteProtocolError('closed')
+
+        assert_that(calling(fail), raises(requests.exceptions.ConnectionError))
+
+    def test_connect_error_is_safe_to_retry(self):
+        policy = RetryPolicy()
+        try:
+            with to_requests_exceptions():
+                raise httpx.ConnectError('refused')
+        except requests.exceptions.ConnectionError as e:
+            error = e
+
+        assert_that(policy.retry_delay('host', 'POST', 0, error=error), not_none())
@@ -0,0 +1,145 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class AgentStatusCache:
+    """Read-through cache of single agent statuses.
+
+    Entries are keyed by (tenant_uuid, 'by-id' or 'by-number', value), expire
+    after `ttl` seconds and the least recently used entry is evicted once
+    `maxsize` entries are stored. The cached status objects are shared between
+    callers and must not be modified.
+    """
+
+    def __init__(self, ttl=5.0, maxsize=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # ('id', id) or ('number', number) -> keys of the entries for that agent
+        self._agent_keys = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, tenant_uuid, by, value):
+        key = (tenant_uuid, by, str(value))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, status = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return status
+
+    def set(self, tenant_uuid, by, value, status):
+        key = (tenant_uuid, by, str(value))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + self.ttl, status)
+            for agent_key in self._agent_keys_of(status):
+                self._agent_keys.setdefault(agent_key, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, by, value):
+        """Drop every entry for an agent, whichever key it was cached under."""
+        agent_key = ('id' if by == 'by-id' else 'number', str(value))
+        with self._lock:
+            for key in list(self._agent_keys.get(agent_key, ())):
+                self._remove(key)
+
+    def invalidate_tenant(self, tenant_uuid):
+        with self._lock:
+            for key, (_, status) in list(self._entries.items()):
+                if tenant_uuid in (key[0], status.tenant_uuid):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._agent_keys.clear()
+
+    def _remove(self, key):
+        _, status = self._entries.pop(key)
+        for agent_key in self._agent_keys_of(status):
+            keys = self._agent_keys.get(agent_key)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._agent_keys[agent_key]
+
+    @staticmethod
+    def _agent_keys_of(status):
+        return ('id', str(status.id)), ('number', str(status.number))
+
+
+class ValidatorCache:
+    """Validators and decoded result of the last status responses.
+
+    Entries are keyed by request (URL, tenant and query) and keep the ETag and
+    Last-Modified of the last 200 response with its decoded result, which is
+    returned again when agentd answers 304 Not Modified to the conditional
+    request. The least recently used entry is evicted once `maxsize` entries
+    are stored. The cached results are shared between callers and must not be
+    modified.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return (conditional headers, result) for `key` or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, resp, result):
+        headers = {}
+        etag = resp.headers.get('ETag')
+        if etag:
+            headers['If-None-Match'] = etag
+        last_modified = resp.headers.get('Last-Modified')
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        self.seed(key, headers, result)
+
+    def seed(self, key, headers, result):
+        """Store conditional headers obtained elsewhere, such as a snapshot."""
+        with self._lock:
+            if not headers:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (headers, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,305 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Run agent operations read from CSV or JSON Lines.
+
+Every operation has an `action` and the arguments of the matching
+AgentsCommand method, agents given by `agent_id` or `agent_number`:
+
+    action             arguments
+    login              agent_id or agent_number, extension, context
+    logoff             agent_id or agent_number
+    pause, unpause     agent_number
+    add_to_queue       agent_id, queue_id
+    remove_from_queue  agent_id, queue_id
+
+and optionally a `tenant_uuid`. CSV files have a header line naming these
+columns, empty cells are ignored. The operations of an agent run one after the
+other in input order, those of different agents concurrently; an agent given
+by number is only known to be the agent given by id once a line gives both.
+A JSON line is printed on stdout for each operation as soon as it is done, and
+a summary on stderr at the end:
+
+    wazo-agentd-bulk --host agentd.example.com --workers 20 logins.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.ratelimit import RateLimiter
+
+DEFAULT_WORKERS = 10
+
+# action -> AgentsCommand method by id and by number
+_ACTIONS = {
+    'login': ('login_agent', 'login_agent_by_number'),
+    'logoff': ('logoff_agent', 'logoff_agent_by_number'),
+    'pause': (None, 'pause_agent_by_number'),
+    'unpause': (None, 'unpause_agent_by_number'),
+    'add_to_queue': ('add_agent_to_queue', None),
+    'remove_from_queue': ('remove_agent_from_queue', None),
+}
+_ARGUMENTS = {
+    'login_agent': ('agent_id', 'extension', 'context'),
+    'login_agent_by_number': ('agent_number', 'extension', 'context'),
+    'logoff_agent': ('agent_id',),
+    'logoff_agent_by_number': ('agent_number',),
+    'pause_agent_by_number': ('agent_number',),
+    'unpause_agent_by_number': ('agent_number',),
+    'add_agent_to_queue': ('agent_id', 'queue_id'),
+    'remove_agent_from_queue': ('agent_id', 'queue_id'),
+}
+_INTEGERS = ('agent_id', 'queue_id')
+
+
+class _Summary:
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.latencies = []
+        self._start = time.perf_counter()
+
+    def add(self, result, latency):
+        self.total += 1
+        if not result['ok']:
+            self.failed += 1
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def format(self):
+        elapsed = time.perf_counter() - self._start
+        rate = self.total / elapsed if elapsed else 0.0
+        summary = (
+            f'{self.total} operations, {self.failed} failed in {elapsed:.2f} s '
+            f'({rate:.1f} operations/s)'
+        )
+        if not self.latencies:
+            return summary
+        latencies = sorted(self.latencies)
+        percentiles = ', '.join(
+            f'p{p} {_percentile(latencies, p) * 1e3:.1f} ms' for p in (50, 90, 99)
+        )
+        return f'{summary}, latency {percentiles}, max {latencies[-1] * 1e3:.1f} ms'
+
+
+def read_operations(lines, input_format='jsonl'):
+    """Yield (line number, operation dict or ValueError) for each operation."""
+    if input_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            operation = {key: value for key, value in row.items() if value}
+            yield reader.line_num, _convert_integers(operation)
+        return
+
+    for line_num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            operation = json.loads(line)
+        except ValueError as e:
+            yield line_num, ValueError(f'invalid JSON: {e}')
+            continue
+        if not isinstance(operation, dict):
+            yield line_num, ValueError('not a JSON object')
+            continue
+        yield line_num, operation
+
+
+def run(agents, operations, output, workers=DEFAULT_WORKERS):
+    """Execute operations with `workers` threads and return a _Summary.
+
+    An operation is only submitted once the previous operation of its agent is
+    done. At most twice `workers` operations are read ahead of those done, and
+    the result of each one is written to `output` in the order they are done.
+    """
+    summary = _Summary()
+    aliases = {}
+    waiting = {}  # agent -> operations read while one of the agent is running
+    running = {}  # future -> agent
+    pending = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit(agent, line_num, operation):
+            future = executor.submit(_execute, agents, line_num, operation)
+            running[future] = agent
+
+        def report(done):
+            nonlocal pending
+            for future in done:
+                agent = running.pop(future)
+                result, latency = future.result()
+                summary.add(result, latency)
+                output.write(json.dumps(result) + '\n')
+                pending -= 1
+                if agent is None:
+                    continue
+                if waiting[agent]:
+                    submit(agent, *waiting[agent].popleft())
+                else:
+                    del waiting[agent]
+
+        for line_num, operation in operations:
+            while pending >= 2 * workers:
+                report(wait(running, return_when=FIRST_COMPLETED).done)
+            pending += 1
+            agent = _agent(operation, aliases)
+            if agent in waiting:
+                waiting[agent].append((line_num, operation))
+                continue
+            if agent is not None:
+                waiting[agent] = deque()
+            submit(agent, line_num, operation)
+        while running:
+            report(wait(running, return_when=FIRST_COMPLETED).done)
+    output.flush()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog='\n'.join(__doc__.splitlines()[2:]),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('input', nargs='?', default='-', help='file, or - for stdin')
+    parser.add_argument(
+        '--format', choices=('csv', 'jsonl'), help='default: from the file extension'
+    )
+    parser.add_argument('--host', required=True)
+    parser.add_argument('--port', type=int, default=443)
+    parser.add_argument(
+        '--token',
+        default=os.environ.get('WAZO_AGENTD_TOKEN'),
+        help='default: $WAZO_AGENTD_TOKEN',
+    )
+    parser.add_argument('--tenant')
+    parser.add_argument('--no-https', dest='https', action='store_false')
+    parser.add_argument('--no-verify', dest='verify', action='store_false')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--rate', type=float, help='maximum operations per second')
+    parser.add_argument('--burst', type=int)
+    args = parser.parse_args(argv)
+
+    input_format = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    rate_limiter = RateLimiter(rate=args.rate, burst=args.burst) if args.rate else None
+    client = AgentdClient(
+        args.host,
+        port=args.port,
+        https=args.https,
+        verify_certificate=args.verify,
+        token=args.token,
+        tenant=args.tenant,
+        rate_limiter=rate_limiter,
+        static_registry=True,
+    )
+
+    if args.input == '-':
+        summary = _run_file(client, sys.stdin, input_format, args.workers)
+    else:
+        with open(args.input, newline='') as f:
+            summary = _run_file(client, f, input_format, args.workers)
+    print(summary.format(), file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def _run_file(client, f, input_format, workers):
+    return run(client.agents, read_operations(f, input_format), sys.stdout, workers)
+
+
+def _execute(agents, line_num, operation):
+    result = {'line': line_num}
+    if isinstance(operation, Exception):
+        return {**result, 'ok': False, 'error': str(operation)}, None
+
+    result['action'] = operation.get('action')
+    try:
+        method, kwargs = _command(operation)
+    except ValueError as e:
+        return {**result, 'ok': False, 'error': str(e)}, None
+
+    start = time.perf_counter()
+    try:
+        getattr(agents, method)(**kwargs)
+    except AgentdClientError as e:
+        error = e.error
+    except requests.RequestException as e:
+        error = str(e)
+    else:
+        error = None
+    latency = time.perf_counter() - start
+    result['elapsed_ms'] = round(latency * 1e3, 3)
+    if error is None:
+        return {**result, 'ok': True}, latency
+    return {**result, 'ok': False, 'error': error}, latency
+
+
+def _command(operation):
+    action = operation.get('action')
+    if action not in _ACTIONS:
+        raise ValueError(f'unknown action: {action}')
+    by_id, by_number = _ACTIONS[action]
+    method = by_number if 'agent_number' in operation or not by_id else by_id
+    if method is None and 'agent_id' in operation:
+        method = by_id
+    if method is None:
+        raise ValueError(f'{action} needs an agent_id')
+    missing = [name for name in _ARGUMENTS[method] if name not in operation]
+    if missing:
+        raise ValueError(f'{action} needs {", ".join(missing)}')
+    kwargs = {name: operation[name] for name in _ARGUMENTS[method]}
+    if operation.get('tenant_uuid'):
+        kwargs['tenant_uuid'] = operation['tenant_uuid']
+    return method, kwargs
+
+
+def _agent(operation, aliases):
+    """Return the key of the agent of `operation`, None if it has none.
+
+    `aliases` maps the agent_id and agent_number seen so far to their key, so
+    that a line giving both ties the agent's later lines by id or by number.
+    """
+    if isinstance(operation, Exception):
+        return None
+    tenant_uuid = operation.get('tenant_uuid')
+    if not isinstance(tenant_uuid, str):
+        tenant_uuid = None
+    keys = [
+        (tenant_uuid, name, operation[name])
+        for name in ('agent_id', 'agent_number')
+        if isinstance(operation.get(name), (int, str))
+    ]
+    if not keys:
+        return None
+    agent = next((aliases[key] for key in keys if key in aliases), keys[0])
+    for key in keys:
+        aliases.setdefault(key, agent)
+    return agent
+
+
+def _convert_integers(operation):
+    for name in _INTEGERS:
+        if name in operation:
+            try:
+                operation[name] = int(operation[name])
+            except ValueError:
+                return ValueError(f'{name} is not an integer: {operation[name]}')
+    return operation
+
+
+def _percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,104 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import importlib
+
 from wazo_lib_rest_client.client import BaseClient
 
 
 class AgentdClient(BaseClient):
     namespace = 'wazo_agentd_client.commands'
+    # the entry points of `namespace`, used instead of scanning them when the
+    # client is created with static_registry=True
+    command_registry = {
+        'agents': 'wazo_agentd_client.commands.agents:AgentsCommand',
+        'status': 'wazo_agentd_client.commands.status:StatusCommand',
+    }
 
-    def __init__(self, host, port=443, prefix='/api/agentd', version='1.0', **kwargs):
+    def __init__(
+        self,
+        host,
+        port=443,
+        prefix='/api/agentd',
+        version='1.0',
+        status_cache=None,
+        instrumentation=None,
+        retry_policy=None,
+        single_flight=None,
+        validator_cache=None,
+        rate_limiter=None,
+        codec=None,
+        transport='http1',
+        static_registry=False,
+        **kwargs,
+    ):
+        self._static_registry = static_registry
+        self.status_cache = status_cache
+        self.retry_policy = retry_policy
+        self.single_flight = single_flight
+        self.validator_cache = validator_cache
+        self.rate_limiter = rate_limiter
+        self.codec = codec
+        # 'http1', 'http2' or a requests transport adapter
+        if transport not in ('http1', 'http2') and isinstance(transport, str):
+            raise ValueError(f'unknown transport: {transport}')
+        self.transport = transport
+        self._transport_adapter = None
+        # callables receiving the CallMetrics of every command call
+        self.instrumentation = list(instrumentation or [])
+        self._session = None
+        self._session_tenant_uuid = None
         super().__init__(host=host, port=port, prefix=prefix, version=version, **kwargs)
+
+    def __getattr__(self, name):
+        # only called for missing attributes: commands of the static registry
+        # are imported and created on first access
+        if not self.__dict__.get('_static_registry'):
+            raise AttributeError(name)
+        try:
+            module_name, class_name = self.command_registry[name].split(':')
+        except KeyError:
+            raise AttributeError(name) from None
+        command_class = getattr(importlib.import_module(module_name), class_name)
+        command = command_class(self)
+        setattr(self, name, command)
+        return command
+
+    def _load_plugins(self):
+        if not self._static_registry:
+            super()._load_plugins()
+
+    def session(self):
+        session = super().session()
+        adapter = self._adapter(session)
+        if adapter is not None:
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+
+    def _adapter(self, session):
+        # shared by every session of the client, so that its connections are
+        # kept when the token or tenant changes
+        if self._transport_adapter is None and self.transport != 'http1':
+            if self.transport == 'http2':
+                from wazo_agentd_client.http2 import HTTP2Adapter
+
+                self._transport_adapter = HTTP2Adapter(verify=session.verify)
+            else:
+                self._transport_adapter = self.transport
+        return self._transport_adapter
+
+    def cached_session(self):
+        """Return a session reused until the token or tenant of the client changes."""
+        if self._session is None or self._session_tenant_uuid != self.tenant_uuid:
+            self._session = self.session()
+            self._session_tenant_uuid = self.tenant_uuid
+        return self._session
+
+    def set_token(self, token):
+        super().set_token(token)
+        self._session = None
+
+    def set_tenant(self, tenant_uuid):
+        super().set_tenant(tenant_uuid)
+        self._session = None
@@ -0,0 +1,188 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import inspect
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from wazo_agentd_client.columns import StatusColumns
+from wazo_agentd_client.commands.agents import (
+    DEFAULT_BULK_WORKERS,
+    AgentsCommand,
+    _iter_tenant_results,
+    _tenants_of,
+)
+from wazo_agentd_client.deadline import _in_context
+from wazo_agentd_client.error import AgentdClientError, AgentdClusterError
+
+
+class AgentdClusterClient:
+    """Route agents calls to one of several wazo-agentd nodes by tenant.
+
+    `nodes` maps a node name to the AgentdClient of that node and `tenants`
+    maps a tenant UUID to a node name. Calls for other tenants, or without a
+    tenant, go to `default_node`, which defaults to the first node.
+    """
+
+    def __init__(self, nodes, tenants=None, default_node=None):
+        if not nodes:
+            raise ValueError('at least one node is required')
+        self.nodes = dict(nodes)
+        self.tenants = dict(tenants or {})
+        self.default_node = default_node or next(iter(self.nodes))
+        if self.default_node not in self.nodes:
+            raise ValueError(f'unknown default node: {self.default_node}')
+        self.agents = _ClusterAgentsCommand(self)
+
+    def node_for(self, tenant_uuid):
+        """Return the name of the node serving `tenant_uuid`."""
+        if tenant_uuid is None:
+            return self.default_node
+        return self.tenants.get(tenant_uuid, self.default_node)
+
+    def client_for(self, tenant_uuid):
+        return self.nodes[self.node_for(tenant_uuid)]
+
+
+class _ClusterAgentsCommand:
+    """The AgentsCommand API over every node of a cluster.
+
+    Calls given a tenant_uuid go to the node of that tenant. Without one,
+    get_agent_statuses, iter_agent_statuses, get_agent_status_columns,
+    watch_agent_statuses, logoff_all_agents and relog_all_agents are sent to
+    every node, each node using the tenant of its own client; other calls go
+    to the default node. Bulk operations route every item on its own tenant,
+    and logoff_tenants and relog_tenants every tenant on its node.
+    """
+
+    add_agents_to_queue = AgentsCommand.add_agents_to_queue
+    remove_agents_from_queue = AgentsCommand.remove_agents_from_queue
+    login_agents = AgentsCommand.login_agents
+    logoff_agents = AgentsCommand.logoff_agents
+    pause_agents = AgentsCommand.pause_agents
+    unpause_agents = AgentsCommand.unpause_agents
+    watch_agent_statuses = AgentsCommand.watch_agent_statuses
+    _run_bulk = AgentsCommand._run_bulk
+    _bulk_call = staticmethod(AgentsCommand._bulk_call)
+
+    def __init__(self, cluster):
+        self._cluster = cluster
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not callable(getattr(AgentsCommand, name, None)):
+            raise AttributeError(name)
+        signature = _signature(name)
+
+        def call(*args, **kwargs):
+            tenant_uuid = signature.bind(None, *args, **kwargs).arguments.get(
+                'tenant_uuid'
+            )
+            command = self._cluster.client_for(tenant_uuid).agents
+            return getattr(command, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def get_agent_statuses(self, tenant_uuid=None, recurse=False):
+        if tenant_uuid:
+            command = self._cluster.client_for(tenant_uuid).agents
+            return command.get_agent_statuses(tenant_uuid, recurse=recurse)
+        results = self._fan_out('get_agent_statuses', recurse=recurse)
+        return list(itertools.chain.from_iterable(results.values()))
+
+    def iter_agent_statuses(self, tenant_uuid=None, recurse=False):
+        if tenant_uuid:
+            command = self._cluster.client_for(tenant_uuid).agents
+            return command.iter_agent_statuses(tenant_uuid, recurse=recurse)
+        return itertools.chain.from_iterable(
+            client.agents.iter_agent_statuses(recurse=recurse)
+            for client in self._cluster.nodes.values()
+        )
+
+    def get_agent_status_columns(self, tenant_uuid=None, recurse=False):
+        if tenant_uuid:
+            command = self._cluster.client_for(tenant_uuid).agents
+            return command.get_agent_status_columns(tenant_uuid, recurse=recurse)
+        results = self._fan_out('get_agent_status_columns', recurse=recurse)
+        return StatusColumns.concat(results.values())
+
+    def logoff_all_agents(self, tenant_uuid=None, recurse=False, timeout=None):
+        if tenant_uuid:
+            command = self._cluster.client_for(tenant_uuid).agents
+            return command.logoff_all_agents(
+                tenant_uuid, recurse=recurse, timeout=timeout
+            )
+        self._fan_out('logoff_all_agents', recurse=recurse, timeout=timeout)
+
+    def relog_all_agents(self, tenant_uuid=None, recurse=False, timeout=None):
+        if tenant_uuid:
+            command = self._cluster.client_for(tenant_uuid).agents
+            return command.relog_all_agents(
+                tenant_uuid, recurse=recurse, timeout=timeout
+            )
+        self._fan_out('relog_all_agents', recurse=recurse, timeout=timeout)
+
+    def logoff_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        return self._run_tenants(
+            self.logoff_all_agents, tenant_uuids, timeout, max_workers
+        )
+
+    def relog_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        """Relog the agents of several tenants, each on the node of the tenant.
+
+        Same as AgentsCommand.relog_tenants, with `max_workers` relogs at a
+        time for each node and the tenants of each node taken in turn. Without
+        `tenant_uuids`, the tenants are those of the statuses of every node.
+        """
+        return self._run_tenants(
+            self.relog_all_agents, tenant_uuids, timeout, max_workers
+        )
+
+    def _run_tenants(self, fun, tenant_uuids, timeout, max_workers):
+        if tenant_uuids is None:
+            tenant_uuids = _tenants_of(self.get_agent_statuses(recurse=True))
+        by_node = {}
+        for tenant_uuid in tenant_uuids:
+            node = self._cluster.node_for(tenant_uuid)
+            by_node.setdefault(node, []).append(tenant_uuid)
+        # taken in turn from each node, so that every node is busy from the start
+        tenant_uuids = [
+            tenant_uuid
+            for tenant_uuids in itertools.zip_longest(*by_node.values())
+            for tenant_uuid in tenant_uuids
+            if tenant_uuid is not None
+        ]
+        max_workers = (max_workers or DEFAULT_BULK_WORKERS) * max(len(by_node), 1)
+        return _iter_tenant_results(fun, tenant_uuids, timeout, max_workers)
+
+    def _fan_out(self, name, **kwargs):
+        nodes = self._cluster.nodes
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            futures = {
+                node: executor.submit(
+                    _in_context(getattr(client.agents, name)), **kwargs
+                )
+                for node, client in nodes.items()
+            }
+
+        results, errors = {}, {}
+        for node, future in futures.items():
+            try:
+                results[node] = future.result()
+            except (AgentdClientError, requests.RequestException) as e:
+                errors[node] = e
+        if errors:
+            raise AgentdClusterError(errors, results)
+        return results
+
+
+_signatures = {}
+
+
+def _signature(name):
+    signature = _signatures.get(name)
+    if signature is None:
+        signature = _signatures[name] = inspect.signature(getattr(AgentsCommand, name))
+    return signature
@@ -0,0 +1,125 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+
+from wazo_agentd_client.helpers import _AgentStatus, _intern
+
+
+class JSONCodec:
+    """Encode request bodies and decode agent statuses with the stdlib json.
+
+    Codecs are given to the client with `codec=`; subclasses replace `dumps`,
+    `loads` or the status decoding with a faster implementation.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def decode_status(self, data):
+        return _AgentStatus.new_from_dict(self.loads(data))
+
+    def decode_statuses(self, data):
+        return [_AgentStatus.new_from_dict(d) for d in self.loads(data)]
+
+
+class OrjsonCodec(JSONCodec):
+    """JSONCodec parsing and serializing with orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgspecCodec(JSONCodec):
+    """JSONCodec decoding statuses in a single pass with msgspec.
+
+    Statuses are decoded into a typed struct instead of a dict, then copied
+    positionally into _AgentStatus.
+    """
+
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+
+        status_type = _msgspec_status_type(msgspec)
+        self._error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._status_decoder = msgspec.json.Decoder(status_type)
+        self._statuses_decoder = msgspec.json.Decoder(list[status_type])
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        return self._decode(self._decoder, data)
+
+    def decode_status(self, data):
+        return _from_struct(self._decode(self._status_decoder, data))
+
+    def decode_statuses(self, data):
+        return [_from_struct(s) for s in self._decode(self._statuses_decoder, data)]
+
+    def _decode(self, decoder, data):
+        try:
+            return decoder.decode(data)
+        except self._error as e:
+            # like the other codecs, malformed payloads raise a ValueError
+            raise ValueError(str(e)) from e
+
+
+def fastest_codec():
+    """Return the fastest installed codec, the stdlib JSONCodec as a last resort."""
+    for codec_class in (MsgspecCodec, OrjsonCodec):
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JSONCodec()
+
+
+def _msgspec_status_type(msgspec):
+    # the fields of the agentd payload; the ones without default are required,
+    # as they are by _AgentStatus.new_from_dict
+    return msgspec.defstruct(
+        '_StatusStruct',
+        [
+            ('id', object),
+            ('number', object),
+            ('origin_uuid', object),
+            ('logged', object),
+            ('paused', object),
+            ('extension', object),
+            ('context', object),
+            ('state_interface', object),
+            ('tenant_uuid', object),
+            ('queues', list, []),
+        ],
+        gc=False,
+    )
+
+
+def _from_struct(s):
+    return _AgentStatus(
+        s.id,
+        s.number,
+        _intern(s.origin_uuid),
+        s.logged,
+        s.paused,
+        s.extension,
+        _intern(s.context),
+        s.state_interface,
+        _intern(s.tenant_uuid),
+        [_intern(queue) for queue in s.queues],
+    )
@@ -0,0 +1,157 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import itertools
+from array import array
+
+
+class StatusColumns:
+    """A snapshot of agent statuses stored column by column.
+
+    Row i is the status of one agent:
+
+    - `ids[i]` and `numbers[i]`
+    - `tenant_codes[i]` and `context_codes[i]` index `tenants` and `contexts`,
+      -1 when the agent has no context
+    - `logged[i]` and `paused[i]` are 1 or 0
+    - its queues are `queues[c]` for the codes c of
+      `queue_codes[queue_offsets[i]:queue_offsets[i + 1]]`
+
+    Columns are `array` buffers that `to_numpy` shares with NumPy without
+    copying.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.numbers = []
+        self.tenants = []
+        self.tenant_codes = array('i')
+        self.contexts = []
+        self.context_codes = array('i')
+        self.logged = bytearray()
+        self.paused = bytearray()
+        self.queues = []
+        self.queue_offsets = array('i', [0])
+        self.queue_codes = array('i')
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_dicts(cls, statuses):
+        """Build the columns from the decoded body of a status list response."""
+        return cls._build(
+            (
+                d['id'],
+                d['number'],
+                d['tenant_uuid'],
+                d['context'],
+                d['logged'],
+                d['paused'],
+                d.get('queues', ()),
+            )
+            for d in statuses
+        )
+
+    @classmethod
+    def from_statuses(cls, statuses):
+        return cls._build(
+            (s.id, s.number, s.tenant_uuid, s.context, s.logged, s.paused, s.queues)
+            for s in statuses
+        )
+
+    @classmethod
+    def concat(cls, parts):
+        """Build the columns of the rows of every StatusColumns of `parts`."""
+        return cls._build(itertools.chain.from_iterable(part._rows() for part in parts))
+
+    @classmethod
+    def _build(cls, rows):
+        columns = cls()
+        # None is the context of agents logged off, its code is -1
+        tenant_index, context_index, queue_index = {}, {None: -1}, {}
+        ids, numbers = columns.ids, columns.numbers
+        tenant_codes, context_codes = columns.tenant_codes, columns.context_codes
+        logged, paused = columns.logged, columns.paused
+        queue_offsets, queue_codes = columns.queue_offsets, columns.queue_codes
+        for agent_id, number, tenant, context, is_logged, is_paused, queues in rows:
+            ids.append(agent_id)
+            numbers.append(number)
+            tenant_codes.append(tenant_index.setdefault(tenant, len(tenant_index)))
+            context_codes.append(
+                context_index.setdefault(context, len(context_index) - 1)
+            )
+            logged.append(1 if is_logged else 0)
+            paused.append(1 if is_paused else 0)
+            for queue in queues:
+                queue_codes.append(queue_index.setdefault(queue, len(queue_index)))
+            queue_offsets.append(len(queue_codes))
+        del context_index[None]
+        columns.tenants = list(tenant_index)
+        columns.contexts = list(context_index)
+        columns.queues = list(queue_index)
+        return columns
+
+    def _rows(self):
+        tenants, contexts, queues = self.tenants, self.contexts, self.queues
+        offsets, queue_codes = self.queue_offsets, self.queue_codes
+        for i, context_code in enumerate(self.context_codes):
+            yield (
+                self.ids[i],
+                self.numbers[i],
+                tenants[self.tenant_codes[i]],
+                contexts[context_code] if context_code >= 0 else None,
+                self.logged[i],
+                self.paused[i],
+                [queues[code] for code in queue_codes[offsets[i] : offsets[i + 1]]],
+            )
+
+    def to_numpy(self):
+        """Return a dict of NumPy arrays sharing the memory of the columns."""
+        import numpy
+
+        def view(column, dtype=None):
+            if not column:
+                return numpy.empty(0, dtype or column.typecode)
+            return numpy.frombuffer(column, dtype or column.typecode)
+
+        return {
+            'id': view(self.ids),
+            'number': numpy.array(self.numbers),
+            'tenant_code': view(self.tenant_codes),
+            'context_code': view(self.context_codes),
+            'logged': view(self.logged, numpy.bool_),
+            'paused': view(self.paused, numpy.bool_),
+            'queue_offsets': view(self.queue_offsets),
+            'queue_codes': view(self.queue_codes),
+        }
+
+    def to_arrow(self):
+        """Return a pyarrow Table, with dictionary encoded strings."""
+        import pyarrow
+
+        columns = self.to_numpy()
+        context_codes = columns['context_code']
+        context = pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(context_codes, mask=context_codes < 0),
+            pyarrow.array(self.contexts, pyarrow.string()),
+        )
+        queues = pyarrow.DictionaryArray.from_arrays(
+            columns['queue_codes'], pyarrow.array(self.queues, pyarrow.string())
+        )
+        return pyarrow.table(
+            {
+                'id': columns['id'],
+                'number': pyarrow.array(self.numbers, pyarrow.string()),
+                'tenant_uuid': pyarrow.DictionaryArray.from_arrays(
+                    columns['tenant_code'],
+                    pyarrow.array(self.tenants, pyarrow.string()),
+                ),
+                'context': context,
+                'logged': columns['logged'],
+                'paused': columns['paused'],
+                'queues': pyarrow.ListArray.from_arrays(
+                    columns['queue_offsets'], queues
+                ),
+            }
+        )
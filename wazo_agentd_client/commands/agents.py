@@ -1,12 +1,38 @@
-# Copyright 2015-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import itertools
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode
 
 import requests
+from requests.cookies import RequestsCookieJar
+from requests.hooks import default_hooks
+from requests.structures import CaseInsensitiveDict
+from requests.utils import resolve_proxies
 from wazo_lib_rest_client import RESTCommand
 
-from wazo_agentd_client.helpers import ResponseProcessor
+from wazo_agentd_client.deadline import (
+    _check_deadline,
+    _check_delay,
+    _deadline_errors,
+    _deadline_scope,
+    _in_context,
+    _timeout,
+)
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import (
+    ResponseProcessor,
+    _BulkItemResult,
+    _BulkResult,
+    _diff_agent_statuses,
+    _TenantResult,
+)
+from wazo_agentd_client.instrumentation import CallTracker
+
+DEFAULT_BULK_WORKERS = 10
 
 
 class AgentsCommand(RESTCommand):
@@ -14,89 +40,110 @@ class AgentsCommand(RESTCommand):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._req_factory = _RequestFactory(self.base_url)
-        self._resp_processor = ResponseProcessor()
+        codec = self._client.codec
+        self._req_factory = _RequestFactory(self.base_url, codec)
+        self._user_req_factory = _RequestFactory(self._client.url(), codec)
+        self._proxies_session = None
+        self._resolved_proxies = None
+        self._resp_processor = ResponseProcessor(codec)
 
     def add_agent_to_queue(self, agent_id, queue_id, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.add_to_queue_by_id(
             agent_id, queue_id, tenant_uuid=tenant_uuid
         )
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def remove_agent_from_queue(self, agent_id, queue_id, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.remove_from_queue_by_id(
             agent_id, queue_id, tenant_uuid=tenant_uuid
         )
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def login_agent(self, agent_id, extension, context, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.login_by_id(
             agent_id, extension, context, tenant_uuid=tenant_uuid
         )
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def login_agent_by_number(self, agent_number, extension, context, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.login_by_number(
             agent_number, extension, context, tenant_uuid=tenant_uuid
         )
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def login_user_agent(self, line_id, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
-        user_req_factory = _RequestFactory(self._client.url())
-        req = user_req_factory.login_user_agent(line_id, tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        req = self._user_req_factory.login_user_agent(line_id, tenant_uuid=tenant_uuid)
+        return self._execute(req, self._resp_processor.generic)
 
     def logoff_agent(self, agent_id, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.logoff_by_id(agent_id, tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def logoff_agent_by_number(self, agent_number, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.logoff_by_number(agent_number, tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def logoff_user_agent(self, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
-        user_req_factory = _RequestFactory(self._client.url())
-        req = user_req_factory.logoff_user_agent(tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        req = self._user_req_factory.logoff_user_agent(tenant_uuid=tenant_uuid)
+        return self._execute(req, self._resp_processor.generic)
 
-    def logoff_all_agents(self, tenant_uuid=None, recurse=False):
+    def logoff_all_agents(self, tenant_uuid=None, recurse=False, timeout=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.logoff_all(tenant_uuid=tenant_uuid, recurse=recurse)
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic, timeout=timeout)
 
     def relog_all_agents(self, tenant_uuid=None, recurse=False, timeout=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.relog_all(tenant_uuid=tenant_uuid, recurse=recurse)
-        self._execute(req, self._resp_processor.generic, timeout=timeout)
+        return self._execute(req, self._resp_processor.generic, timeout=timeout)
+
+    def logoff_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        """Log off the agents of several tenants concurrently.
+
+        See relog_tenants.
+        """
+        return self._run_tenants(
+            self.logoff_all_agents, tenant_uuids, timeout, max_workers
+        )
+
+    def relog_tenants(self, tenant_uuids=None, timeout=None, max_workers=None):
+        """Relog the agents of several tenants concurrently.
+
+        One relog is sent per tenant, at most `max_workers` at a time, each
+        with its own `timeout`. Without `tenant_uuids`, the tenants are those
+        of a recursive status snapshot. A _TenantResult is yielded as soon as
+        the relog of a tenant is done.
+        """
+        return self._run_tenants(
+            self.relog_all_agents, tenant_uuids, timeout, max_workers
+        )
 
     def pause_agent_by_number(self, agent_number, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
         req = self._req_factory.pause_by_number(agent_number, tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def pause_user_agent(self, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
-        user_req_factory = _RequestFactory(self._client.url())
-        req = user_req_factory.pause_user_agent(tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        req = self._user_req_factory.pause_user_agent(tenant_uuid=tenant_uuid)
+        return self._execute(req, self._resp_processor.generic)
 
     def unpause_agent_by_number(self, agent_number, tenant_uuid=None):
         req = self._req_factory.unpause_by_number(agent_number, tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        return self._execute(req, self._resp_processor.generic)
 
     def unpause_user_agent(self, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
-        user_req_factory = _RequestFactory(self._client.url())
-        req = user_req_factory.unpause_user_agent(tenant_uuid=tenant_uuid)
-        self._execute(req, self._resp_processor.generic)
+        req = self._user_req_factory.unpause_user_agent(tenant_uuid=tenant_uuid)
+        return self._execute(req, self._resp_processor.generic)
 
     def get_agent_status(self, agent_id, tenant_uuid=None):
         req = self._req_factory.status_by_id(agent_id, tenant_uuid=tenant_uuid)
@@ -108,8 +155,7 @@ class AgentsCommand(RESTCommand):
 
     def get_user_agent_status(self, tenant_uuid=None):
         tenant_uuid = tenant_uuid or self._client.tenant_uuid
-        user_req_factory = _RequestFactory(self._client.url())
-        req = user_req_factory.status_user_agent(tenant_uuid=tenant_uuid)
+        req = self._user_req_factory.status_user_agent(tenant_uuid=tenant_uuid)
         return self._execute(req, self._resp_processor.status)
 
     def get_agent_statuses(self, tenant_uuid=None, recurse=False):
@@ -117,16 +163,352 @@ class AgentsCommand(RESTCommand):
         req = self._req_factory.status_all(tenant_uuid=tenant_uuid, recurse=recurse)
         return self._execute(req, self._resp_processor.status_all)
 
-    def _execute(self, req, processor_fun, timeout=None):
-        timeout = timeout if timeout is not None else self.timeout
-        resp = self.session.send(self.session.prepare_request(req), timeout=timeout)
-        return processor_fun(resp)
+    def iter_agent_statuses(self, tenant_uuid=None, recurse=False):
+        """Yield agent statuses while the response is being received."""
+        tenant_uuid = tenant_uuid or self._client.tenant_uuid
+        req = self._req_factory.status_all(tenant_uuid=tenant_uuid, recurse=recurse)
+        return self._execute(req, self._resp_processor.status_iter, stream=True)
+
+    def get_agent_status_columns(self, tenant_uuid=None, recurse=False):
+        """Same as get_agent_statuses, as a columnar StatusColumns snapshot."""
+        tenant_uuid = tenant_uuid or self._client.tenant_uuid
+        req = self._req_factory.status_columns(tenant_uuid=tenant_uuid, recurse=recurse)
+        return self._execute(req, self._resp_processor.status_columns)
+
+    def watch_agent_statuses(
+        self,
+        tenant_uuid=None,
+        recurse=False,
+        interval=1.0,
+        max_interval=10.0,
+        backoff=2.0,
+    ):
+        """Poll agent statuses and yield what changed between polls.
+
+        The first poll yields an `added` change for every agent. Polls are
+        `interval` seconds apart; while nothing changes the delay is multiplied
+        by `backoff` up to `max_interval`.
+        """
+        snapshot = {}
+        delay = interval
+        while True:
+            statuses = self.get_agent_statuses(tenant_uuid, recurse)
+            snapshot, changes = _diff_agent_statuses(snapshot, statuses)
+            if changes:
+                delay = interval
+                yield from changes
+            else:
+                delay = min(delay * backoff, max_interval)
+            time.sleep(delay)
+
+    def add_agents_to_queue(
+        self, agent_ids, queue_id, tenant_uuid=None, max_workers=None
+    ):
+        items = (
+            {'agent_id': agent_id, 'queue_id': queue_id, 'tenant_uuid': tenant_uuid}
+            for agent_id in agent_ids
+        )
+        return self._run_bulk(self.add_agent_to_queue, items, max_workers)
+
+    def remove_agents_from_queue(
+        self, agent_ids, queue_id, tenant_uuid=None, max_workers=None
+    ):
+        items = (
+            {'agent_id': agent_id, 'queue_id': queue_id, 'tenant_uuid': tenant_uuid}
+            for agent_id in agent_ids
+        )
+        return self._run_bulk(self.remove_agent_from_queue, items, max_workers)
+
+    def login_agents(self, logins, tenant_uuid=None, max_workers=None):
+        """Log in agents concurrently.
+
+        Each login is a dict of login_agent arguments: agent_id, extension,
+        context and, optionally, tenant_uuid.
+        """
+        items = ({'tenant_uuid': tenant_uuid, **login} for login in logins)
+        return self._run_bulk(self.login_agent, items, max_workers)
+
+    def logoff_agents(self, agent_ids, tenant_uuid=None, max_workers=None):
+        items = (
+            {'agent_id': agent_id, 'tenant_uuid': tenant_uuid} for agent_id in agent_ids
+        )
+        return self._run_bulk(self.logoff_agent, items, max_workers)
+
+    def pause_agents(self, agent_numbers, tenant_uuid=None, max_workers=None):
+        items = (
+            {'agent_number': agent_number, 'tenant_uuid': tenant_uuid}
+            for agent_number in agent_numbers
+        )
+        return self._run_bulk(self.pause_agent_by_number, items, max_workers)
+
+    def unpause_agents(self, agent_numbers, tenant_uuid=None, max_workers=None):
+        items = (
+            {'agent_number': agent_number, 'tenant_uuid': tenant_uuid}
+            for agent_number in agent_numbers
+        )
+        return self._run_bulk(self.unpause_agent_by_number, items, max_workers)
+
+    def _run_bulk(self, fun, items, max_workers=None):
+        max_workers = max_workers or DEFAULT_BULK_WORKERS
+        bulk_call = _in_context(self._bulk_call)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda item: bulk_call(fun, item), items)
+            return _BulkResult(list(results))
+
+    def _run_tenants(self, fun, tenant_uuids, timeout, max_workers):
+        if tenant_uuids is None:
+            tenant_uuids = _tenants_of(self.get_agent_statuses(recurse=True))
+        tenant_uuids = list(tenant_uuids)
+        return _iter_tenant_results(fun, tenant_uuids, timeout, max_workers)
+
+    @staticmethod
+    def _bulk_call(fun, item):
+        try:
+            fun(**item)
+        except (AgentdClientError, requests.RequestException) as e:
+            return _BulkItemResult(item, e)
+        return _BulkItemResult(item)
+
+    def _execute(self, req, processor_fun, timeout=None, stream=False):
+        # the timeout itself is cut to the deadline when each attempt is sent
+        _check_deadline()
+        status_cache = self._client.status_cache
+        if status_cache is None:
+            return self._send(req, processor_fun, timeout, stream)
+
+        if req.method == 'GET' and req.agent:
+            tenant_uuid = self._request_tenant(req)
+            status = status_cache.get(tenant_uuid, *req.agent)
+            if status is None:
+                status = self._send(req, processor_fun, timeout)
+                status_cache.set(tenant_uuid, *req.agent, status)
+            return status
+
+        try:
+            return self._send(req, processor_fun, timeout, stream)
+        finally:
+            if req.method != 'GET':
+                self._invalidate_status_cache(status_cache, req)
+
+    @property
+    def session(self):
+        return self._client.cached_session()
+
+    def _send(self, req, processor_fun, timeout=None, stream=False):
+        if req.method != 'GET' or stream:
+            return self._send_retrying(req, processor_fun, timeout, stream)
+
+        validator_cache = self._client.validator_cache
+        if validator_cache is not None:
+            processor_fun = self._conditional(validator_cache, req, processor_fun)
+        single_flight = self._client.single_flight
+        if single_flight is None:
+            return self._send_retrying(req, processor_fun, timeout)
+        return single_flight.do(
+            self._flight_key(req),
+            lambda: self._send_retrying(req, processor_fun, timeout),
+        )
+
+    def _conditional(self, validator_cache, req, processor_fun):
+        key = self._validator_key(req)
+        validated = validator_cache.get(key)
+        if validated is not None:
+            conditional_headers, _ = validated
+            req.headers = {**req.headers, **conditional_headers}
+        return _ConditionalProcessor(validator_cache, key, validated, processor_fun)
+
+    def _send_retrying(self, req, processor_fun, timeout=None, stream=False):
+        retry_policy = self._client.retry_policy
+        if retry_policy is None:
+            return self._send_once(req, processor_fun, timeout, stream)
+
+        host = self._host()
+        for attempt in itertools.count():
+            trial = retry_policy.before_attempt(host)
+            retrying = _RetryingProcessor(
+                retry_policy, host, req.method, attempt, processor_fun, stream
+            )
+            try:
+                return self._send_once(req, retrying, timeout, stream)
+            except _RetryableResponse:
+                delay = retrying.delay
+            except requests.RequestException as e:
+                if retrying.reported:
+                    raise
+                retrying.reported = True
+                delay = retry_policy.retry_delay(host, req.method, attempt, error=e)
+                if delay is None:
+                    raise
+            finally:
+                # cancelled, cut by the deadline, or failed before sending
+                if trial and not retrying.reported:
+                    retry_policy.release_trial(host)
+            _check_delay(delay)
+            time.sleep(delay)
+
+    def _send_once(self, req, processor_fun, timeout=None, stream=False):
+        rate_limiter = self._client.rate_limiter
+        if rate_limiter is not None:
+            with rate_limiter.limit(self._request_tenant(req)):
+                return self._send_unlimited(req, processor_fun, timeout, stream)
+        return self._send_unlimited(req, processor_fun, timeout, stream)
+
+    def _send_unlimited(self, req, processor_fun, timeout=None, stream=False):
+        timeout = _timeout(timeout if timeout is not None else self.timeout)
+        with _deadline_errors():
+            if self._client.instrumentation:
+                return self._send_tracked(req, processor_fun, timeout, stream)
+
+            session = self.session
+            prepared = _prepare_request(session, req)
+            resp = session.send(
+                prepared,
+                timeout=timeout,
+                stream=stream,
+                proxies=self._proxies(session, prepared),
+            )
+            return processor_fun(resp)
+
+    def _send_tracked(self, req, processor_fun, timeout, stream=False):
+        listeners = self._client.instrumentation
+        tenant_uuid = self._request_tenant(req)
+        with CallTracker(listeners, req.endpoint, tenant_uuid) as tracker:
+            session = self.session
+            prepared = _prepare_request(session, req)
+            tracker.prepared(prepared)
+            resp = session.send(
+                prepared,
+                timeout=timeout,
+                stream=stream,
+                proxies=self._proxies(session, prepared),
+            )
+            tracker.received(resp)
+            return processor_fun(resp)
+
+    def _proxies(self, session, prepared):
+        # Session.send resolves proxies from the environment on every call; every
+        # request of a command goes to the same host so it is done once per session
+        if self._proxies_session is not session:
+            self._resolved_proxies = resolve_proxies(
+                prepared, session.proxies, session.trust_env
+            )
+            self._proxies_session = session
+        return self._resolved_proxies
+
+    def _validator_key(self, req):
+        params = tuple(sorted(req.params.items())) if req.params else None
+        return (req.url, req.endpoint, self._request_tenant(req), params)
+
+    def _status_all_validator_key(self, tenant_uuid=None, recurse=False):
+        # the key of the validators of get_agent_statuses(tenant_uuid, recurse)
+        tenant_uuid = tenant_uuid or self._client.tenant_uuid
+        req = self._req_factory.status_all(tenant_uuid, recurse)
+        return self._validator_key(req)
+
+    def _flight_key(self, req):
+        # requests of another client may differ by host, token or timeout, and
+        # a call must not fail on the deadline of another
+        params = tuple(sorted(req.params.items())) if req.params else None
+        return (
+            self._client,
+            req.endpoint,
+            self._request_tenant(req),
+            req.agent,
+            params,
+            _deadline_scope(),
+        )
+
+    def _host(self):
+        return f'{self._client.host}:{self._client.port}'
+
+    def _request_tenant(self, req):
+        return req.headers.get('Wazo-Tenant') or self._client.tenant_uuid
+
+    def _invalidate_status_cache(self, status_cache, req):
+        if req.agent:
+            status_cache.invalidate(*req.agent)
+        elif req.params and req.params.get('recurse'):
+            status_cache.clear()
+        else:
+            status_cache.invalidate_tenant(self._request_tenant(req))
+
+
+_DEFAULT_HOOKS = default_hooks()
+
+
+def _tenants_of(statuses):
+    return list(dict.fromkeys(status.tenant_uuid for status in statuses))
+
+
+def _iter_tenant_results(fun, tenant_uuids, timeout, max_workers):
+    total = len(tenant_uuids)
+    max_workers = max_workers or DEFAULT_BULK_WORKERS
+    tenant_call = _in_context(_tenant_call)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(tenant_call, fun, tenant_uuid, timeout)
+            for tenant_uuid in tenant_uuids
+        ]
+        for completed, future in enumerate(as_completed(futures), 1):
+            tenant_uuid, elapsed, error = future.result()
+            yield _TenantResult(tenant_uuid, error, elapsed, completed, total)
+
+
+def _tenant_call(fun, tenant_uuid, timeout):
+    start = time.monotonic()
+    try:
+        fun(tenant_uuid, timeout=timeout)
+    except (AgentdClientError, requests.RequestException) as e:
+        return tenant_uuid, time.monotonic() - start, e
+    return tenant_uuid, time.monotonic() - start, None
+
+
+def _prepare_request(session, req):
+    """Prepare a request built by _RequestFactory for the given session.
+
+    The factory only produces well-formed URLs, str or bytes JSON bodies and
+    dict params, so the full Session.prepare_request (URL parsing and IDNA checks,
+    cookie, auth, netrc and hook merging) is only needed when the session was
+    configured with cookies, auth, params or hooks.
+    """
+    if (
+        session.auth
+        or session.cookies
+        or session.params
+        or any(session.hooks.values())
+        or req.hooks != _DEFAULT_HOOKS
+    ):
+        return session.prepare_request(req)
+
+    prepared = requests.PreparedRequest()
+    prepared.method = req.method
+    prepared.url = f'{req.url}?{urlencode(req.params)}' if req.params else req.url
+    prepared.headers = CaseInsensitiveDict(session.headers)
+    prepared.headers.update(req.headers)
+    if req.data:
+        # codecs other than the stdlib one encode bodies to bytes
+        body = req.data
+        prepared.body = body.encode('utf-8') if isinstance(body, str) else body
+        prepared.headers['Content-Length'] = str(len(prepared.body))
+    elif req.method not in ('GET', 'HEAD'):
+        prepared.headers['Content-Length'] = '0'
+    prepared.hooks = default_hooks()
+    prepared._cookies = RequestsCookieJar()
+    return prepared
 
 
 class _RequestFactory:
-    def __init__(self, base_url):
+    def __init__(self, base_url, codec=None):
         self._base_url = base_url
-        self._headers = {'Accept': 'application/json'}
+        self._dumps = json.dumps if codec is None else codec.dumps
+        # compression is negotiated explicitly rather than left to the
+        # session defaults
+        self._headers = {
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+        }
+        self._tenant_headers = {}
+        self._tenant_post_headers = {}
 
     def add_to_queue_by_id(self, agent_id, queue_id, tenant_uuid=None):
         return self._add_to_queue('by-id', agent_id, queue_id, tenant_uuid=tenant_uuid)
@@ -134,10 +516,13 @@ class _RequestFactory:
     def _add_to_queue(self, by, value, queue_id, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}/add'
         obj = {'queue_id': queue_id}
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, obj, additional_headers=additional_headers)
+        return self._new_post_request(
+            _endpoint('add_to_queue', by),
+            url,
+            obj,
+            tenant_uuid=tenant_uuid,
+            agent=(by, value),
+        )
 
     def remove_from_queue_by_id(self, agent_id, queue_id, tenant_uuid=None):
         return self._remove_from_queue(
@@ -147,10 +532,13 @@ class _RequestFactory:
     def _remove_from_queue(self, by, value, queue_id, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}/remove'
         obj = {'queue_id': queue_id}
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, obj, additional_headers=additional_headers)
+        return self._new_post_request(
+            _endpoint('remove_from_queue', by),
+            url,
+            obj,
+            tenant_uuid=tenant_uuid,
+            agent=(by, value),
+        )
 
     def login_by_id(self, agent_id, extension, context, tenant_uuid=None):
         return self._login(
@@ -165,18 +553,16 @@ class _RequestFactory:
     def _login(self, by, value, extension, context, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}/login'
         obj = {'extension': extension, 'context': context}
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, obj, additional_headers=additional_headers)
+        return self._new_post_request(
+            _endpoint('login', by), url, obj, tenant_uuid=tenant_uuid, agent=(by, value)
+        )
 
     def login_user_agent(self, line_id, tenant_uuid=None):
         url = f'{self._base_url}/users/me/agents/login'
         obj = {'line_id': line_id}
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, obj, additional_headers=additional_headers)
+        return self._new_post_request(
+            'login_user_agent', url, obj, tenant_uuid=tenant_uuid
+        )
 
     def logoff_by_id(self, agent_id, tenant_uuid=None):
         return self._logoff('by-id', agent_id, tenant_uuid=tenant_uuid)
@@ -186,17 +572,13 @@ class _RequestFactory:
 
     def _logoff(self, by, value, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}/logoff'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, additional_headers=additional_headers)
+        return self._new_post_request(
+            _endpoint('logoff', by), url, tenant_uuid=tenant_uuid, agent=(by, value)
+        )
 
     def logoff_user_agent(self, tenant_uuid=None):
         url = f'{self._base_url}/users/me/agents/logoff'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, additional_headers=additional_headers)
+        return self._new_post_request('logoff_user_agent', url, tenant_uuid=tenant_uuid)
 
     def pause_by_number(self, agent_number, tenant_uuid=None, reason=None):
         return self._pause(
@@ -205,26 +587,24 @@ class _RequestFactory:
 
     def _pause(self, by, value, tenant_uuid=None, reason=None):
         url = f'{self._base_url}/{by}/{value}/pause'
-        additional_headers = {}
         body = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
         if reason:
             body['reason'] = reason
         return self._new_post_request(
-            url, obj=body, additional_headers=additional_headers
+            _endpoint('pause', by),
+            url,
+            obj=body,
+            tenant_uuid=tenant_uuid,
+            agent=(by, value),
         )
 
     def pause_user_agent(self, tenant_uuid=None, reason=None):
         url = f'{self._base_url}/users/me/agents/pause'
-        additional_headers = {}
         body = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
         if reason:
             body['reason'] = reason
         return self._new_post_request(
-            url, obj=body, additional_headers=additional_headers
+            'pause_user_agent', url, obj=body, tenant_uuid=tenant_uuid
         )
 
     def unpause_by_number(self, agent_number, tenant_uuid=None):
@@ -232,17 +612,15 @@ class _RequestFactory:
 
     def _unpause(self, by, value, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}/unpause'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, additional_headers=additional_headers)
+        return self._new_post_request(
+            _endpoint('unpause', by), url, tenant_uuid=tenant_uuid, agent=(by, value)
+        )
 
     def unpause_user_agent(self, tenant_uuid=None):
         url = f'{self._base_url}/users/me/agents/unpause'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_post_request(url, additional_headers=additional_headers)
+        return self._new_post_request(
+            'unpause_user_agent', url, tenant_uuid=tenant_uuid
+        )
 
     def status_by_id(self, agent_id, tenant_uuid=None):
         return self._status('by-id', agent_id, tenant_uuid=tenant_uuid)
@@ -252,65 +630,165 @@ class _RequestFactory:
 
     def _status(self, by, value, tenant_uuid=None):
         url = f'{self._base_url}/{by}/{value}'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_get_request(url, additional_headers=additional_headers)
+        return self._new_get_request(
+            _endpoint('status', by), url, tenant_uuid=tenant_uuid, agent=(by, value)
+        )
 
     def status_user_agent(self, tenant_uuid=None):
         url = f'{self._base_url}/users/me/agents'
-        additional_headers = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
-        return self._new_get_request(url, additional_headers=additional_headers)
+        return self._new_get_request('status_user_agent', url, tenant_uuid=tenant_uuid)
 
     def logoff_all(self, tenant_uuid=None, recurse=False):
         url = f'{self._base_url}/logoff'
-        additional_headers = {}
         params = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
         if recurse:
             params['recurse'] = True
-        return self._new_post_request(url)
+        return self._new_post_request(
+            'logoff_all', url, tenant_uuid=tenant_uuid, params=params
+        )
 
     def relog_all(self, tenant_uuid=None, recurse=False):
         url = f'{self._base_url}/relog'
-        additional_headers = {}
         params = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
         if recurse:
             params['recurse'] = True
         return self._new_post_request(
-            url, additional_headers=additional_headers, params=params
+            'relog_all', url, tenant_uuid=tenant_uuid, params=params
         )
 
     def status_all(self, tenant_uuid=None, recurse=False):
+        return self._status_all('status_all', tenant_uuid, recurse)
+
+    def status_columns(self, tenant_uuid=None, recurse=False):
+        # another endpoint name, so that the list and columnar results of the
+        # same URL are never shared or cached for one another
+        return self._status_all('status_columns', tenant_uuid, recurse)
+
+    def _status_all(self, endpoint, tenant_uuid, recurse):
         url = self._base_url
-        additional_headers = {}
         params = {}
-        if tenant_uuid:
-            additional_headers['Wazo-Tenant'] = tenant_uuid
         if recurse:
             params['recurse'] = True
         return self._new_get_request(
-            url, additional_headers=additional_headers, params=params
+            endpoint, url, tenant_uuid=tenant_uuid, params=params
         )
 
-    def _new_get_request(self, url, additional_headers=None, params=None):
-        headers = dict(self._headers)
-        if additional_headers:
-            headers.update(additional_headers)
-        return requests.Request('GET', url, headers, params=params)
+    def _new_get_request(
+        self, endpoint, url, tenant_uuid=None, params=None, agent=None
+    ):
+        headers = self._get_headers(tenant_uuid)
+        return _Request(
+            'GET', url, headers, params=params, endpoint=endpoint, agent=agent
+        )
 
-    def _new_post_request(self, url, obj=None, additional_headers=None, params=None):
-        headers = dict(self._headers)
-        if additional_headers:
-            headers.update(additional_headers)
+    def _new_post_request(
+        self, endpoint, url, obj=None, tenant_uuid=None, params=None, agent=None
+    ):
         if obj is None:
+            headers = self._get_headers(tenant_uuid)
             data = None
         else:
-            data = json.dumps(obj)
+            headers = self._post_headers(tenant_uuid)
+            data = self._dumps(obj)
+        return _Request(
+            'POST',
+            url,
+            headers,
+            data=data,
+            params=params,
+            endpoint=endpoint,
+            agent=agent,
+        )
+
+    def _get_headers(self, tenant_uuid):
+        # header dicts are built once per tenant and shared by every request;
+        # requests copies them when the request is prepared
+        try:
+            return self._tenant_headers[tenant_uuid]
+        except KeyError:
+            headers = dict(self._headers)
+            if tenant_uuid:
+                headers['Wazo-Tenant'] = tenant_uuid
+            self._tenant_headers[tenant_uuid] = headers
+            return headers
+
+    def _post_headers(self, tenant_uuid):
+        try:
+            return self._tenant_post_headers[tenant_uuid]
+        except KeyError:
+            headers = dict(self._get_headers(tenant_uuid))
             headers['Content-Type'] = 'application/json'
-        return requests.Request('POST', url, headers, data=data, params=params)
+            self._tenant_post_headers[tenant_uuid] = headers
+            return headers
+
+
+class _ConditionalProcessor:
+    # returns the previous result on 304 and keeps the validators of a 200
+    __slots__ = ('_cache', '_key', '_validated', '_fun')
+
+    def __init__(self, cache, key, validated, processor_fun):
+        self._cache = cache
+        self._key = key
+        self._validated = validated
+        self._fun = processor_fun
+
+    def __call__(self, resp):
+        if resp.status_code == 304 and self._validated is not None:
+            self._cache.not_modified += 1
+            return self._validated[1]
+        result = self._fun(resp)
+        self._cache.set(self._key, resp, result)
+        return result
+
+
+class _RetryableResponse(Exception):
+    pass
+
+
+class _RetryingProcessor:
+    # reports every response to the retry policy before decoding it; `reported`
+    # tells whether the outcome of the attempt was given to the policy
+    __slots__ = (
+        'delay',
+        'reported',
+        '_policy',
+        '_host',
+        '_method',
+        '_attempt',
+        '_fun',
+        '_stream',
+    )
+
+    def __init__(self, policy, host, method, attempt, processor_fun, stream=False):
+        self.delay = None
+        self.reported = False
+        self._policy = policy
+        self._host = host
+        self._method = method
+        self._attempt = attempt
+        self._fun = processor_fun
+        self._stream = stream
+
+    def __call__(self, resp):
+        self.reported = True
+        self.delay = self._policy.retry_delay(
+            self._host, self._method, self._attempt, resp=resp
+        )
+        if self.delay is not None:
+            if self._stream:
+                resp.close()
+            raise _RetryableResponse(resp.status_code)
+        return self._fun(resp)
+
+
+def _endpoint(action, by):
+    return f'{action}_{by.replace("-", "_")}'
+
+
+class _Request(requests.Request):
+    def __init__(self, *args, endpoint=None, agent=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # name of the _RequestFactory method that built the request
+        self.endpoint = endpoint
+        # ('by-id', agent_id) or ('by-number', agent_number) of the targeted agent
+        self.agent = agent
@@ -1,21 +1,35 @@
-# Copyright 2022-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2022-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
 from wazo_lib_rest_client.command import RESTCommand
 
+from wazo_agentd_client.deadline import _deadline_errors, _timeout
 from wazo_agentd_client.helpers import ResponseProcessor
+from wazo_agentd_client.instrumentation import CallTracker
 
 
 class StatusCommand(RESTCommand):
     resource = 'status'
 
     def __call__(self):
-        _resp_processor = ResponseProcessor()
         headers = self._get_headers()
         url = self.base_url
-        r = self.session.get(url, headers=headers)
-
+        timeout = _timeout(self.timeout)
+        listeners = self._client.instrumentation
+        with _deadline_errors():
+            if not listeners:
+                r = self.session.get(url, headers=headers, timeout=timeout)
+                return self._process(r)
+
+            tenant_uuid = self._client.tenant_uuid
+            with CallTracker(listeners, 'status', tenant_uuid) as tracker:
+                r = self.session.get(url, headers=headers, timeout=timeout)
+                tracker.received(r)
+                return self._process(r)
+
+    def _process(self, r):
+        _resp_processor = ResponseProcessor()
         if r.status_code != 200:
             _resp_processor.generic(r)
 
@@ -1,20 +1,57 @@
-# Copyright 2015-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import io
 import json
+import threading
+import time
 import unittest
-
-from hamcrest import assert_that, equal_to
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import requests
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    instance_of,
+    not_,
+    same_instance,
+)
 from requests.exceptions import HTTPError
 from wazo_lib_rest_client.tests.command import RESTCommandTestCase
 
-from wazo_agentd_client.commands.agents import _RequestFactory
-from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.cache import AgentStatusCache
+from wazo_agentd_client.commands.agents import (
+    AgentsCommand,
+    _prepare_request,
+    _RequestFactory,
+)
+from wazo_agentd_client.deadline import Deadline
+from wazo_agentd_client.error import (
+    AgentdClientError,
+    CircuitOpenError,
+    DeadlineExceededError,
+)
 from wazo_agentd_client.helpers import ResponseProcessor
+from wazo_agentd_client.ratelimit import RateLimiter
+from wazo_agentd_client.retry import CircuitBreaker, RetryPolicy
+from wazo_agentd_client.singleflight import SingleFlight
+from wazo_agentd_client.tests.fake_client import FAKE_TENANT, new_client
 
 new_response = RESTCommandTestCase.new_response
 
-FAKE_TENANT = 'eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee'
+STATUS = {
+    'id': 2,
+    'origin_uuid': '11-222',
+    'number': '1002',
+    'logged': True,
+    'paused': False,
+    'extension': '1222',
+    'context': 'alice',
+    'state_interface': 'SIP/alice',
+    'tenant_uuid': FAKE_TENANT,
+}
 
 
 class TestRequestFactory(unittest.TestCase):
@@ -154,6 +191,14 @@ class TestRequestFactory(unittest.TestCase):
 
         self._assert_post_request(req, expected_url)
 
+    def test_logoff_all_with_tenant_and_recurse(self):
+        expected_url = f'{self.base_url}/logoff?recurse=True'
+
+        req = self.req_factory.logoff_all(tenant_uuid=FAKE_TENANT, recurse=True)
+
+        self._assert_post_request(req, expected_url)
+        assert_that(req.headers['Wazo-Tenant'], equal_to(FAKE_TENANT))
+
     def test_relog_all(self):
         expected_url = f'{self.base_url}/relog'
 
@@ -168,6 +213,12 @@ class TestRequestFactory(unittest.TestCase):
 
         self._assert_get_request(req, expected_url)
 
+    def test_status_columns(self):
+        req = self.req_factory.status_columns(recurse=True)
+
+        self._assert_get_request(req, f'{self.base_url}?recurse=True')
+        assert_that(req.endpoint, equal_to('status_columns'))
+
     def _assert_get_request(self, req, expected_url):
         prep_req = req.prepare()
         assert_that(prep_req.method, equal_to('GET'))
@@ -183,6 +234,43 @@ class TestRequestFactory(unittest.TestCase):
             assert_that(json.loads(prep_req.body), equal_to(expected_body))
 
 
+class TestPrepareRequest(unittest.TestCase):
+    def setUp(self):
+        self.req_factory = _RequestFactory('https://example.org/api/agentd/1.0/agents')
+        self.session = requests.Session()
+        self.session.headers = {'Connection': 'close', 'X-Auth-Token': 'token'}
+
+    def test_same_as_session_prepare_request(self):
+        reqs = [
+            self.req_factory.login_by_id(2, '1001', 'default', tenant_uuid=FAKE_TENANT),
+            self.req_factory.logoff_by_number('1002'),
+            self.req_factory.pause_by_number('1002', reason='lunch'),
+            self.req_factory.status_by_id(2, tenant_uuid=FAKE_TENANT),
+            self.req_factory.status_all(tenant_uuid=FAKE_TENANT, recurse=True),
+            self.req_factory.relog_all(recurse=True),
+        ]
+
+        for req in reqs:
+            expected = self.session.prepare_request(req)
+            prepared = _prepare_request(self.session, req)
+
+            assert_that(prepared.method, equal_to(expected.method))
+            assert_that(prepared.url, equal_to(expected.url))
+            assert_that(dict(prepared.headers), equal_to(dict(expected.headers)))
+            expected_body = expected.body
+            if isinstance(expected_body, str):
+                expected_body = expected_body.encode()
+            assert_that(prepared.body, equal_to(expected_body))
+
+    def test_session_with_auth_uses_full_preparation(self):
+        self.session.auth = ('user', 'secret')
+        req = self.req_factory.status_by_id(2)
+
+        prepared = _prepare_request(self.session, req)
+
+        assert_that('Authorization' in prepared.headers, equal_to(True))
+
+
 class TestResponseProcessor(unittest.TestCase):
     def setUp(self):
         self.resp_processor = ResponseProcessor()
@@ -263,3 +351,341 @@ class TestResponseProcessor(unittest.TestCase):
         assert_that(status.context, equal_to(v['context']))
         assert_that(status.state_interface, equal_to(v['state_interface']))
         assert_that(status.tenant_uuid, equal_to(FAKE_TENANT))
+
+    def test_status_columns_on_200(self):
+        resp = new_response(200, [STATUS, dict(STATUS, id=3, logged=False)])
+
+        columns = self.resp_processor.status_columns(resp)
+
+        assert_that(list(columns.ids), contains_exactly(2, 3))
+        assert_that(columns.tenants, contains_exactly(FAKE_TENANT))
+        assert_that(list(columns.logged), contains_exactly(1, 0))
+
+    def test_status_all_interns_repeated_values(self):
+        body = json.dumps(
+            [
+                dict(STATUS, id=2, queues=['sales']),
+                dict(STATUS, id=3, queues=['sales']),
+            ]
+        )
+        resp = new_response(200)
+        resp._content = body.encode()
+
+        first, second = self.resp_processor.status_all(resp)
+
+        assert_that(first.tenant_uuid is second.tenant_uuid, equal_to(True))
+        assert_that(first.context is second.context, equal_to(True))
+        assert_that(first.queues[0] is second.queues[0], equal_to(True))
+        assert_that(hasattr(first, '__dict__'), equal_to(False))
+
+    def test_status_iter_on_200(self):
+        resp = new_response(200)
+        resp.raw = io.BytesIO(json.dumps([STATUS, dict(STATUS, id=3)]).encode())
+
+        statuses = self.resp_processor.status_iter(resp, chunk_size=7)
+
+        assert_that([status.id for status in statuses], contains_exactly(2, 3))
+
+    def test_status_iter_raises_before_iterating(self):
+        resp = new_response(404, {'error': 'meh'})
+
+        self.assertRaises(AgentdClientError, self.resp_processor.status_iter, resp)
+
+
+class TestAgentsCommandBulk(unittest.TestCase):
+    def setUp(self):
+        self.session = requests.Session()
+        self.session.send = Mock(side_effect=self._send)
+        self.client = new_client(self.session)
+        self.command = AgentsCommand(self.client)
+
+    @staticmethod
+    def _send(prepared, **kwargs):
+        if '/by-id/3/' in prepared.url:
+            return new_response(409, {'error': 'already logged'})
+        if prepared.method == 'GET':
+            statuses = [
+                dict(STATUS, id=1, tenant_uuid='t1'),
+                dict(STATUS, id=2, tenant_uuid='t2'),
+                dict(STATUS, id=3, tenant_uuid='t1'),
+            ]
+            return new_response(200, statuses)
+        if prepared.headers.get('Wazo-Tenant') == 'failing':
+            return new_response(500)
+        return new_response(204)
+
+    def test_login_agents_reports_each_item(self):
+        logins = [
+            {'agent_id': agent_id, 'extension': '1001', 'context': 'default'}
+            for agent_id in (1, 2, 3, 4)
+        ]
+
+        result = self.command.login_agents(logins, max_workers=2)
+
+        assert_that(result.ok, equal_to(False))
+        assert_that(
+            [r.item['agent_id'] for r in result.succeeded], contains_exactly(1, 2, 4)
+        )
+        (failed,) = result.failed
+        assert_that(failed.item['agent_id'], equal_to(3))
+        assert_that(failed.error, instance_of(AgentdClientError))
+        assert_that(self.session.send.call_count, equal_to(4))
+
+    def test_pause_agents(self):
+        result = self.command.pause_agents(['1001', '1002'])
+
+        assert_that(result.ok, equal_to(True))
+        urls = sorted(call.args[0].url for call in self.session.send.call_args_list)
+        assert_that(
+            urls,
+            contains_exactly(
+                'http://example.org/foo/by-number/1001/pause',
+                'http://example.org/foo/by-number/1002/pause',
+            ),
+        )
+
+    def test_relog_tenants_streams_a_result_per_tenant(self):
+        results = list(self.command.relog_tenants(['t1', 'failing', 't2'], timeout=30))
+
+        assert_that(
+            sorted(r.tenant_uuid for r in results if r.ok), contains_exactly('t1', 't2')
+        )
+        (failed,) = [r for r in results if not r.ok]
+        assert_that(failed.tenant_uuid, equal_to('failing'))
+        assert_that(failed.error, instance_of(HTTPError))
+        assert_that([r.completed for r in results], contains_exactly(1, 2, 3))
+        assert_that({r.total for r in results}, equal_to({3}))
+        for call in self.session.send.call_args_list:
+            assert_that(call.args[0].url, equal_to('http://example.org/foo/relog'))
+            assert_that(call.kwargs['timeout'], equal_to(30))
+
+    def test_logoff_tenants_discovers_tenants(self):
+        results = list(self.command.logoff_tenants())
+
+        assert_that(
+            sorted(r.tenant_uuid for r in results), contains_exactly('t1', 't2')
+        )
+        snapshot, *logoffs = self.session.send.call_args_list
+        assert_that(
+            snapshot.args[0].url, equal_to('http://example.org/foo?recurse=True')
+        )
+        assert_that(
+            sorted(call.args[0].headers['Wazo-Tenant'] for call in logoffs),
+            contains_exactly('t1', 't2'),
+        )
+
+    def test_calls_are_rate_limited(self):
+        self.client.rate_limiter = RateLimiter(max_in_flight=1)
+
+        self.command.pause_agents(['1001', '1002', '1003'], tenant_uuid='other')
+
+        assert_that(self.client.rate_limiter.calls, equal_to(3))
+        assert_that(self.client.rate_limiter.tenant_in_flight('other'), equal_to(0))
+
+
+class TestAgentsCommandStatusCache(unittest.TestCase):
+    def setUp(self):
+        self.session = requests.Session()
+        self.session.send = Mock(side_effect=self._send)
+        self.client = new_client(self.session, status_cache=AgentStatusCache())
+        self.command = AgentsCommand(self.client)
+
+    @staticmethod
+    def _send(prepared, **kwargs):
+        if prepared.method == 'GET':
+            return new_response(200, STATUS)
+        return new_response(204)
+
+    def test_status_is_cached(self):
+        self.command.get_agent_status(2)
+        status = self.command.get_agent_status(2)
+
+        assert_that(status.number, equal_to('1002'))
+        assert_that(self.session.send.call_count, equal_to(1))
+        assert_that(self.client.status_cache.hits, equal_to(1))
+
+    def test_mutation_invalidates_status(self):
+        self.command.get_agent_status_by_number('1002')
+
+        self.command.login_agent(2, '1001', 'default')
+        self.command.get_agent_status_by_number('1002')
+
+        assert_that(self.session.send.call_count, equal_to(3))
+
+    def test_failed_mutation_invalidates_status(self):
+        self.command.get_agent_status(2)
+        self.session.send.side_effect = [new_response(409, {'error': 'meh'})]
+
+        self.assertRaises(AgentdClientError, self.command.pause_agent_by_number, '1002')
+
+        assert_that(len(self.client.status_cache), equal_to(0))
+
+
+class TestAgentsCommandInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.listener = Mock()
+        self.session = requests.Session()
+        self.session.send = Mock(return_value=new_response(200, STATUS))
+        self.client = new_client(self.session, instrumentation=[self.listener])
+        self.command = AgentsCommand(self.client)
+
+    def test_metrics(self):
+        self.command.get_agent_status_by_number('1002', tenant_uuid='other-tenant')
+
+        (metrics,) = self.listener.call_args.args
+        assert_that(metrics.command, equal_to('status_by_number'))
+        assert_that(metrics.tenant_uuid, equal_to('other-tenant'))
+        assert_that(metrics.status_code, equal_to(200))
+        assert_that(metrics.bytes_received, equal_to(len(json.dumps(STATUS))))
+        assert_that(metrics.error, equal_to(None))
+
+    def test_error_is_reported(self):
+        self.session.send.return_value = new_response(409, {'error': 'meh'})
+
+        self.assertRaises(AgentdClientError, self.command.login_agent, 2, '1', 'ctx')
+
+        (metrics,) = self.listener.call_args.args
+        assert_that(metrics.command, equal_to('login_by_id'))
+        assert_that(metrics.status_code, equal_to(409))
+        assert_that(
+            metrics.bytes_sent, equal_to(len(b'{"extension": "1", "context": "ctx"}'))
+        )
+        assert_that(metrics.error, instance_of(AgentdClientError))
+
+
+class TestAgentsCommandRetry(unittest.TestCase):
+    def setUp(self):
+        self.session = requests.Session()
+        self.session.send = Mock()
+        self.client = new_client(
+            self.session, retry_policy=RetryPolicy(max_attempts=3, backoff_factor=0)
+        )
+        self.command = AgentsCommand(self.client)
+
+    def test_status_is_retried(self):
+        self.session.send.side_effect = [
+            requests.ConnectionError('reset'),
+            new_response(503),
+            new_response(200, STATUS),
+        ]
+
+        status = self.command.get_agent_status(2)
+
+        assert_that(status.id, equal_to(2))
+        assert_that(self.session.send.call_count, equal_to(3))
+
+    def test_mutation_is_not_retried_after_a_server_error(self):
+        self.session.send.side_effect = [new_response(500, {'error': 'meh'})]
+
+        self.assertRaises(AgentdClientError, self.command.logoff_agent, 2)
+
+        assert_that(self.session.send.call_count, equal_to(1))
+
+    def test_last_response_is_processed(self):
+        self.session.send.return_value = new_response(503, {'error': 'overloaded'})
+
+        with self.assertRaises(AgentdClientError) as cm:
+            self.command.logoff_agent(2)
+
+        assert_that(cm.exception.error, equal_to('overloaded'))
+        assert_that(self.session.send.call_count, equal_to(3))
+
+    def test_open_circuit_fails_fast(self):
+        self.client.retry_policy.circuit_breaker = CircuitBreaker(failure_threshold=1)
+        self.session.send.return_value = new_response(500)
+
+        self.assertRaises(CircuitOpenError, self.command.get_agent_status, 2)
+        self.assertRaises(CircuitOpenError, self.command.get_agent_status, 2)
+
+        assert_that(self.session.send.call_count, equal_to(1))
+
+    def test_interrupted_trial_is_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.client.retry_policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+        self.session.send.side_effect = [
+            new_response(500),
+            KeyboardInterrupt(),
+            new_response(200, STATUS),
+        ]
+
+        self.assertRaises(HTTPError, self.command.get_agent_status, 2)
+        self.assertRaises(KeyboardInterrupt, self.command.get_agent_status, 2)
+        status = self.command.get_agent_status(2)
+
+        assert_that(status.id, equal_to(2))
+        assert_that(breaker.state('example.org:443'), equal_to('closed'))
+
+    def test_trial_cut_by_the_deadline_is_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.client.retry_policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+
+        def send(prepared, **kwargs):
+            if self.session.send.call_count == 1:
+                return new_response(500)
+            # past the deadline, whatever the clock resolution
+            time.sleep(kwargs['timeout'] + 0.01)
+            raise requests.ReadTimeout()
+
+        self.session.send.side_effect = send
+
+        self.assertRaises(HTTPError, self.command.get_agent_status, 2)
+        with Deadline(0.01):
+            self.assertRaises(DeadlineExceededError, self.command.get_agent_status, 2)
+
+        assert_that(breaker.state('example.org:443'), equal_to('half-open'))
+        assert_that(breaker.enter('example.org:443'), equal_to(True))
+
+
+class TestAgentsCommandSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.session = requests.Session()
+        self.session.send = Mock(side_effect=self._send)
+        self.client = new_client(self.session, single_flight=SingleFlight())
+        self.command = AgentsCommand(self.client)
+
+    def _send(self, prepared, **kwargs):
+        self.release.wait(5)
+        if prepared.method == 'GET':
+            return new_response(200, STATUS)
+        return new_response(204)
+
+    def test_concurrent_status_reads_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.command.get_agent_status, 2) for _ in range(3)
+            ]
+            futures.append(executor.submit(self.command.get_agent_status, 3))
+            while self.client.single_flight.shared < 2:
+                threading.Event().wait(0.001)
+            self.release.set()
+            statuses = [future.result() for future in futures]
+
+        assert_that(statuses[0], same_instance(statuses[1]))
+        assert_that(self.session.send.call_count, equal_to(2))
+
+    def test_mutations_are_not_coalesced(self):
+        self.release.set()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(self.command.logoff_agent, [2, 2]))
+
+        assert_that(self.session.send.call_count, equal_to(2))
+
+    def test_reads_under_another_deadline_are_not_coalesced(self):
+        def read_within(timeout):
+            with Deadline(timeout):
+                return self.command.get_agent_status(2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.command.get_agent_status, 2),
+                executor.submit(read_within, 5),
+            ]
+            while self.session.send.call_count < 2:
+                threading.Event().wait(0.001)
+            self.release.set()
+            statuses = [future.result() for future in futures]
+
+        assert_that(statuses[0], not_(same_instance(statuses[1])))
+        assert_that(self.client.single_flight.shared, equal_to(0))
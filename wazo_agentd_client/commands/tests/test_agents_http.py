@@ -0,0 +1,249 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import time
+import unittest
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_string,
+    equal_to,
+    less_than,
+    not_none,
+    same_instance,
+)
+
+from wazo_agentd_client import error
+from wazo_agentd_client.cache import ValidatorCache
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.codec import JSONCodec, MsgspecCodec, OrjsonCodec
+from wazo_agentd_client.commands.agents import AgentsCommand
+from wazo_agentd_client.commands.status import StatusCommand
+from wazo_agentd_client.deadline import Deadline
+from wazo_agentd_client.error import AgentdClientError, DeadlineExceededError
+from wazo_agentd_client.instrumentation import HistogramCollector
+from wazo_agentd_client.tests.fake_agentd import (
+    PREFIX,
+    FakeAgentd,
+    FakeAgentdState,
+)
+
+TOKEN = 'my-token'
+
+
+class TestAgentsCommandOverHTTP(unittest.TestCase):
+    def setUp(self):
+        self.state = FakeAgentdState()
+        self.state.populate(nb_agents=4, nb_queues=2, logged_ratio=0)
+        self.state.user_agents[TOKEN] = 4
+        self.agentd = FakeAgentd(self.state).start()
+        self.addCleanup(self.agentd.stop)
+        self.client = AgentdClient(
+            self.agentd.host, port=self.agentd.port, https=False, token=TOKEN
+        )
+        self.agents = AgentsCommand(self.client)
+        self.status = StatusCommand(self.client)
+
+    def test_login_then_status(self):
+        self.agents.login_agent(1, '2001', 'default')
+
+        status = self.agents.get_agent_status_by_number('1001')
+
+        assert_that(status.logged, equal_to(True))
+        assert_that(status.extension, equal_to('2001'))
+        assert_that(status.queues, contains_exactly('queue-1', 'queue-2'))
+
+    def test_login_with_codecs(self):
+        for codec_class in (JSONCodec, OrjsonCodec, MsgspecCodec):
+            with self.subTest(codec=codec_class.name):
+                try:
+                    codec = codec_class()
+                except ImportError:
+                    self.skipTest(f'{codec_class.name} is not installed')
+                client = AgentdClient(
+                    self.agentd.host,
+                    port=self.agentd.port,
+                    https=False,
+                    token=TOKEN,
+                    codec=codec,
+                )
+                agents = AgentsCommand(client)
+
+                agents.login_agent(1, '2001', 'default')
+                agents.remove_agent_from_queue(1, 1)
+                agents.add_agent_to_queue(1, 1)
+                status = agents.get_agent_status(1)
+                agents.logoff_agent(1)
+
+                assert_that(status.logged, equal_to(True))
+                assert_that(status.extension, equal_to('2001'))
+
+    def test_error_mapping(self):
+        with self.assertRaises(AgentdClientError) as cm:
+            self.agents.logoff_agent(1)
+
+        assert_that(cm.exception.error, equal_to(error.NOT_LOGGED))
+
+    def test_user_agent(self):
+        self.agents.login_user_agent(line_id=12)
+        self.agents.pause_user_agent()
+
+        status = self.agents.get_user_agent_status()
+
+        assert_that(status.id, equal_to(4))
+        assert_that(status.paused, equal_to(True))
+
+    def test_statuses(self):
+        statuses = self.agents.get_agent_statuses()
+        streamed = self.agents.iter_agent_statuses()
+
+        assert_that([s.id for s in streamed], equal_to([s.id for s in statuses]))
+        assert_that(len(statuses), equal_to(4))
+
+    def test_status(self):
+        assert_that(self.status()['rest_api'], equal_to({'status': 'ok'}))
+
+    def test_instrumentation(self):
+        collector = HistogramCollector()
+        self.client.instrumentation.append(collector)
+
+        self.agents.get_agent_statuses()
+        self.status()
+
+        assert_that(collector.count('status_all', 200), equal_to(1))
+        assert_that(collector.count('status', 200), equal_to(1))
+
+    def test_watch_agent_statuses(self):
+        changes = self.agents.watch_agent_statuses(interval=0.01, max_interval=0.02)
+        added = [next(changes) for _ in range(4)]
+
+        self.agents.login_agent(2, '2002', 'default')
+        change = next(changes)
+
+        assert_that({c.kind for c in added}, equal_to({'added'}))
+        assert_that((change.kind, change.agent_id), equal_to(('login', 2)))
+        assert_that(change.changes['extension'], equal_to((None, '2002')))
+
+
+class TestConditionalRequestsOverHTTP(unittest.TestCase):
+    def setUp(self):
+        self.state = FakeAgentdState()
+        self.state.populate(nb_agents=50, nb_queues=2, logged_ratio=0)
+        self.agentd = FakeAgentd(self.state).start()
+        self.addCleanup(self.agentd.stop)
+        self.validator_cache = ValidatorCache()
+        self.metrics = []
+        client = AgentdClient(
+            self.agentd.host,
+            port=self.agentd.port,
+            https=False,
+            token=TOKEN,
+            validator_cache=self.validator_cache,
+            instrumentation=[self.metrics.append],
+        )
+        self.agents = AgentsCommand(client)
+
+    def test_not_modified(self):
+        statuses = self.agents.get_agent_statuses(recurse=True)
+        again = self.agents.get_agent_statuses(recurse=True)
+
+        assert_that(again, same_instance(statuses))
+        assert_that(self.metrics[-1].status_code, equal_to(304))
+        assert_that(self.validator_cache.not_modified, equal_to(1))
+        (_, _, headers) = self.state.requests[-1]
+        assert_that(headers['If-None-Match'], not_none())
+
+    def test_modified(self):
+        self.agents.get_agent_status(1)
+
+        self.agents.login_agent(1, '2001', 'default')
+        status = self.agents.get_agent_status(1)
+
+        assert_that(status.logged, equal_to(True))
+        assert_that(self.metrics[-1].status_code, equal_to(200))
+        assert_that(self.validator_cache.not_modified, equal_to(0))
+
+    def test_compression(self):
+        self.agents.get_agent_statuses()
+
+        metrics = self.metrics[-1]
+        (_, _, headers) = self.state.requests[-1]
+        assert_that(headers['Accept-Encoding'], contains_string('gzip'))
+        assert_that(metrics.bytes_received, less_than(metrics.bytes_decoded))
+
+
+class TestFakeAgentdValidators(unittest.TestCase):
+    def setUp(self):
+        self.state = FakeAgentdState()
+        self.state.populate(nb_agents=2)
+        self.target = '/api/agentd/1.0/agents'
+
+    def test_if_modified_since(self):
+        _, headers, _ = self.state.handle('GET', self.target, {}, b'')
+        conditional = {'If-Modified-Since': headers['Last-Modified']}
+
+        status_code, _, body = self.state.handle('GET', self.target, conditional, b'')
+
+        assert_that((status_code, body), equal_to((304, b'')))
+
+    def test_if_none_match_takes_precedence(self):
+        _, headers, _ = self.state.handle('GET', self.target, {}, b'')
+        conditional = {
+            'If-None-Match': '"other"',
+            'If-Modified-Since': headers['Last-Modified'],
+        }
+
+        status_code, _, _ = self.state.handle('GET', self.target, conditional, b'')
+
+        assert_that(status_code, equal_to(200))
+
+
+class _SlowState(FakeAgentdState):
+    def handle(self, *args):
+        time.sleep(0.2)
+        return super().handle(*args)
+
+
+class TestDeadlinesOverHTTP(unittest.TestCase):
+    def setUp(self):
+        self.state = _SlowState()
+        self.state.populate(nb_agents=4, nb_queues=2, logged_ratio=0)
+        self.agentd = FakeAgentd(self.state).start()
+        self.addCleanup(self.agentd.stop)
+        self.client = AgentdClient(
+            self.agentd.host, port=self.agentd.port, https=False, token=TOKEN
+        )
+        self.agents = AgentsCommand(self.client)
+        self.status = StatusCommand(self.client)
+
+    def test_composite_operation_bounded(self):
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            with Deadline(0.3):
+                self.agents.get_agent_status(1)
+                self.agents.login_agent(1, '2001', 'default')
+                self.agents.add_agent_to_queue(1, 1)
+
+        assert_that(time.monotonic() - start, less_than(0.5))
+        # the login timed out, the server answers it later
+        time.sleep(0.3)
+        paths = [path for _, path, _ in self.state.requests]
+        assert_that(
+            paths,
+            contains_exactly(
+                f'{PREFIX}/agents/by-id/1', f'{PREFIX}/agents/by-id/1/login'
+            ),
+        )
+
+    def test_expired_deadline_sends_nothing(self):
+        with Deadline(0):
+            with self.assertRaises(DeadlineExceededError):
+                self.status()
+            result = self.agents.logoff_agents([1, 2])
+
+        assert_that(
+            [type(r.error) for r in result.results],
+            contains_exactly(DeadlineExceededError, DeadlineExceededError),
+        )
+        assert_that(len(self.state.requests), equal_to(0))
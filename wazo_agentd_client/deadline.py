@@ -0,0 +1,110 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+
+from wazo_agentd_client.error import DeadlineExceededError
+
+_current = contextvars.ContextVar('wazo_agentd_client_deadline', default=None)
+
+
+@dataclass(frozen=True)
+class _Scope:
+    at: float
+    parent: '_Scope | None'
+
+
+class Deadline:
+    """A time budget shared by the calls made within `with` blocks of it.
+
+    Every request sent in the block has its timeout cut to the time left, and
+    calls made once the deadline has passed, or whose retry delay would end
+    after it, raise DeadlineExceededError without being sent. A Deadline can
+    be passed to functions and entered again; when deadlines are nested, the
+    earliest one applies. Deadlines follow asyncio tasks, and the threads of
+    bulk methods, but not threads started by the caller.
+    """
+
+    def __init__(self, timeout):
+        self.at = time.monotonic() + timeout
+
+    def __enter__(self):
+        parent = _current.get()
+        at = self.at if parent is None else min(self.at, parent.at)
+        _current.set(_Scope(at, parent))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current.set(_current.get().parent)
+
+    @property
+    def remaining(self):
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.at
+
+
+def remaining_time():
+    """Seconds left before the current deadline, None without deadline."""
+    scope = _current.get()
+    if scope is None:
+        return None
+    return max(0.0, scope.at - time.monotonic())
+
+
+def _deadline_scope():
+    # the deadline of the calls made now, which can be compared and hashed
+    return _current.get()
+
+
+def _check_deadline():
+    if remaining_time() == 0:
+        raise DeadlineExceededError()
+
+
+def _timeout(timeout):
+    # the timeout of a request sent now: `timeout` cut to the time left
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining == 0:
+        raise DeadlineExceededError()
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _check_delay(delay):
+    # no point waiting to retry a call that could not be sent in time
+    remaining = remaining_time()
+    if remaining is not None and delay >= remaining:
+        raise DeadlineExceededError()
+
+
+@contextmanager
+def _deadline_errors():
+    # a timeout cut by the deadline is reported as the deadline passing
+    try:
+        yield
+    except requests.Timeout as e:
+        if remaining_time() == 0:
+            raise DeadlineExceededError() from e
+        raise
+
+
+def _in_context(fun):
+    """Return `fun` running, in any thread, with the context of the caller."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # a context can only be entered by one thread at a time
+        return context.copy().run(fun, *args, **kwargs)
+
+    return run
@@ -1,4 +1,4 @@
-# Copyright 2015-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 NO_SUCH_AGENT = 'no such agent'
@@ -13,9 +13,37 @@ NO_SUCH_EXTEN = 'no such extension and context'
 CONTEXT_DIFFERENT_TENANT = 'agent and context are not in the same tenant'
 QUEUE_DIFFERENT_TENANT = 'agent and queue are not in the same tenant'
 UNAUTHORIZED = 'invalid token or unauthorized'
+CIRCUIT_OPEN = 'circuit open'
+NODES_FAILED = 'one or more nodes failed'
+DEADLINE_EXCEEDED = 'deadline exceeded'
 
 
 class AgentdClientError(Exception):
     def __init__(self, error):
         super().__init__(error)
         self.error = error
+
+
+class CircuitOpenError(AgentdClientError):
+    def __init__(self, host, retry_after=0.0):
+        super().__init__(CIRCUIT_OPEN)
+        self.host = host
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(AgentdClientError):
+    def __init__(self):
+        super().__init__(DEADLINE_EXCEEDED)
+
+
+class AgentdClusterError(AgentdClientError):
+    """Some nodes of an AgentdClusterClient failed a call sent to every node.
+
+    `errors` maps the failed node names to their exception and `results` the
+    other node names to their result.
+    """
+
+    def __init__(self, errors, results):
+        super().__init__(NODES_FAILED)
+        self.errors = errors
+        self.results = results
@@ -1,26 +1,80 @@
-# Copyright 2022-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2022-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import codecs
+import json
+import sys
+from contextlib import closing
 from dataclasses import dataclass, field
+from typing import Any
 
+from wazo_agentd_client.columns import StatusColumns
 from wazo_agentd_client.error import AgentdClientError
 
 
 class ResponseProcessor:
+    def __init__(self, codec=None):
+        # without codec, bodies are decoded by requests with the stdlib json
+        self._codec = codec
+
     def generic(self, resp):
         self._raise_if_not_success(resp)
 
     def status(self, resp):
         self._raise_if_not_success(resp, 200)
 
+        if self._codec is not None:
+            return self._codec.decode_status(resp.content)
         return _AgentStatus.new_from_dict(resp.json())
 
     def status_all(self, resp):
         self._raise_if_not_success(resp, 200)
 
+        if self._codec is not None:
+            return self._codec.decode_statuses(resp.content)
         return [_AgentStatus.new_from_dict(d) for d in resp.json()]
 
+    def status_columns(self, resp):
+        self._raise_if_not_success(resp, 200)
+
+        if self._codec is not None:
+            return StatusColumns.from_dicts(self._codec.loads(resp.content))
+        return StatusColumns.from_dicts(resp.json())
+
+    def status_iter(self, resp, chunk_size=64 * 1024):
+        self._raise_if_not_success(resp, 200)
+
+        return self._iter_statuses(resp, chunk_size)
+
+    @staticmethod
+    def _iter_statuses(resp, chunk_size):
+        decoder = _JSONArrayStreamDecoder()
+        with closing(resp):
+            for chunk in resp.iter_content(chunk_size):
+                for d in decoder.feed(chunk):
+                    yield _AgentStatus.new_from_dict(d)
+            for d in decoder.close():
+                yield _AgentStatus.new_from_dict(d)
+
+    def status_aiter(self, resp):
+        """Same as status_iter for a response streamed by the async client."""
+        self._raise_if_not_success(resp, 200)
+
+        return self._aiter_statuses(resp.raw)
+
+    @staticmethod
+    async def _aiter_statuses(raw):
+        decoder = _JSONArrayStreamDecoder()
+        try:
+            async for chunk in raw.aiter_bytes():
+                for d in decoder.feed(chunk):
+                    yield _AgentStatus.new_from_dict(d)
+            for d in decoder.close():
+                yield _AgentStatus.new_from_dict(d)
+        finally:
+            await raw.aclose()
+
     def _raise_if_not_success(self, resp, expected_status_code=None):
         status_code_class = resp.status_code // 100
         if status_code_class == 4 or status_code_class == 5:
@@ -39,7 +93,7 @@ class ResponseProcessor:
             resp.raise_for_status()
 
 
-@dataclass
+@dataclass(slots=True)
 class _AgentStatus:
     id: str
     number: str
@@ -54,12 +108,205 @@ class _AgentStatus:
 
     @classmethod
     def new_from_dict(cls, d):
-        obj = cls(d['id'], d['number'], d['origin_uuid'])
-        obj.logged = d['logged']
-        obj.paused = d['paused']
-        obj.extension = d['extension']
-        obj.context = d['context']
-        obj.state_interface = d['state_interface']
-        obj.tenant_uuid = d['tenant_uuid']
-        obj.queues = d.get('queues', [])
-        return obj
+        # values repeated across agents are interned so that large snapshots
+        # share a single copy of each tenant, origin, context and queue name
+        return cls(
+            d['id'],
+            d['number'],
+            _intern(d['origin_uuid']),
+            d['logged'],
+            d['paused'],
+            d['extension'],
+            _intern(d['context']),
+            d['state_interface'],
+            _intern(d['tenant_uuid']),
+            [_intern(queue) for queue in d.get('queues', ())],
+        )
+
+
+def _intern(value):
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+@dataclass(slots=True)
+class _AgentStatusChange:
+    # added, removed, login, logoff, pause, unpause, queue_added, queue_removed
+    # or updated; status is the previous status of removed agents
+    kind: str
+    agent_id: int
+    status: _AgentStatus
+    changes: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    queue: str | None = None
+
+
+_WATCHED_FIELDS = (
+    'number',
+    'logged',
+    'paused',
+    'extension',
+    'context',
+    'state_interface',
+    'tenant_uuid',
+)
+
+
+def _diff_agent_statuses(previous, statuses):
+    """Return the statuses indexed by agent id and their changes since `previous`."""
+    current = {status.id: status for status in statuses}
+    changes = []
+    nb_added = 0
+    for agent_id, status in current.items():
+        old = previous.get(agent_id)
+        if old is None:
+            changes.append(_AgentStatusChange('added', agent_id, status))
+            nb_added += 1
+        elif old != status:
+            changes.extend(_agent_status_changes(old, status))
+    # agents can only have been removed when the counts do not add up
+    if len(previous) + nb_added != len(current):
+        for agent_id, old in previous.items():
+            if agent_id not in current:
+                changes.append(_AgentStatusChange('removed', agent_id, old))
+    return current, changes
+
+
+def _agent_status_changes(old, new):
+    fields = {
+        name: (getattr(old, name), getattr(new, name))
+        for name in _WATCHED_FIELDS
+        if getattr(old, name) != getattr(new, name)
+    }
+    if 'logged' in fields:
+        kind = 'login' if new.logged else 'logoff'
+        yield _AgentStatusChange(kind, new.id, new, fields)
+    elif 'paused' in fields:
+        kind = 'pause' if new.paused else 'unpause'
+        yield _AgentStatusChange(kind, new.id, new, fields)
+    elif fields:
+        yield _AgentStatusChange('updated', new.id, new, fields)
+
+    if old.queues != new.queues:
+        queues = {'queues': (old.queues, new.queues)}
+        old_queues, new_queues = set(old.queues), set(new.queues)
+        for queue in new.queues:
+            if queue not in old_queues:
+                yield _AgentStatusChange('queue_added', new.id, new, queues, queue)
+        for queue in old.queues:
+            if queue not in new_queues:
+                yield _AgentStatusChange('queue_removed', new.id, new, queues, queue)
+
+
+@dataclass
+class _BulkItemResult:
+    item: Any
+    error: Exception | None = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+@dataclass
+class _BulkResult:
+    results: list[_BulkItemResult] = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return all(result.ok for result in self.results)
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+
+@dataclass
+class _TenantResult:
+    tenant_uuid: str
+    error: Exception | None = None
+    elapsed: float = 0.0
+    completed: int = 0
+    total: int = 0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class _JSONArrayStreamDecoder:
+    """Incrementally decode the items of a top-level JSON array.
+
+    Bytes are fed as they are received and every complete item is returned as
+    soon as it has been parsed, so only the item being received is buffered.
+    """
+
+    _WHITESPACE = ' \t\n\r'
+
+    def __init__(self):
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._state = 'start'
+
+    def feed(self, data):
+        self._buffer += self._text_decoder.decode(data)
+        return self._decode(final=False)
+
+    def close(self):
+        self._buffer += self._text_decoder.decode(b'', final=True)
+        items = self._decode(final=True)
+        if self._state != 'done':
+            raise ValueError('incomplete JSON array')
+        return items
+
+    def _decode(self, final):
+        items = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == 'start':
+                if char != '[':
+                    raise ValueError(f'expected a JSON array, got {char!r}')
+                pos += 1
+                self._state = 'first'
+            elif self._state in ('first', 'next') and char == ']':
+                pos += 1
+                self._state = 'done'
+            elif self._state in ('first', 'item'):
+                try:
+                    item, end = self._json_decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                if not final and (
+                    end == len(buffer) or (_is_number(item) and buffer[end] in '.eE+-')
+                ):
+                    # a number could still be continued by the next chunk
+                    break
+                items.append(item)
+                pos = end
+                self._state = 'next'
+            elif self._state == 'next':
+                if char != ',':
+                    raise ValueError(f'expected "," or "]", got {char!r}')
+                pos += 1
+                self._state = 'item'
+            else:
+                raise ValueError(f'unexpected data after JSON array: {char!r}')
+        self._buffer = buffer[pos:]
+        return items
+
+
+def _is_number(value):
+    return type(value) in (int, float)
@@ -0,0 +1,201 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import os
+import ssl
+import threading
+from datetime import timedelta
+from time import perf_counter
+
+import httpx
+from requests import certs
+from requests.adapters import BaseAdapter
+from requests.utils import select_proxy
+
+from wazo_agentd_client.aio.helpers import (
+    to_httpx_timeout,
+    to_requests_exceptions,
+    to_requests_response,
+)
+
+# connection-specific headers are forbidden in HTTP/2, and the sessions of
+# wazo_lib_rest_client send "Connection: close"
+_EXCLUDED_HEADERS = frozenset(
+    ['connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade']
+)
+
+
+class HTTP2Adapter(BaseAdapter):
+    """A requests transport adapter sending requests with an HTTP/2 httpx client.
+
+    Concurrent requests to a host are multiplexed over a single connection.
+    HTTP/2 is negotiated with ALPN over HTTPS, HTTP/1.1 is used when the
+    server does not support it. With `http1=False`, plain HTTP connections
+    use HTTP/2 directly (prior knowledge).
+
+    Requests are sent by an asyncio httpx client running in a thread of the
+    adapter: the HTTP/2 connections of the threaded httpx client may open
+    streams of concurrent threads out of order.
+
+    `verify` is used for requests sent with `verify=True`. Requests sent with
+    another `verify`, a client `cert` or through a proxy have an httpx client
+    of their own for each such configuration.
+    """
+
+    def __init__(self, verify=True, http1=True, max_connections=10):
+        super().__init__()
+        self._verify = verify
+        self._http1 = http1
+        self._limits = httpx.Limits(max_connections=max_connections)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        # the client of the adapter configuration, and the others by
+        # (verify, cert, proxy)
+        self._client = None
+        self._clients = {}
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name.lower() not in _EXCLUDED_HEADERS
+        }
+        if verify is True or verify == self._verify:
+            verify = self._verify
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        proxy = select_proxy(request.url, proxies or {})
+        configuration = (verify, cert, proxy)
+        start = perf_counter()
+        resp = self._run(self._send(request, headers, timeout, stream, configuration))
+        if stream:
+            raw = _StreamedBody(self, resp)
+            response = to_requests_response(resp, request, raw=raw)
+        else:
+            response = to_requests_response(resp, request)
+        response.elapsed = timedelta(seconds=perf_counter() - start)
+        response.connection = self
+        return response
+
+    def close(self):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            clients = [self._client, *self._clients.values()]
+            self._loop = self._thread = self._client = None
+            self._clients = {}
+        if loop is None:
+            return
+        for client in clients:
+            if client is not None:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def _send(self, request, headers, timeout, stream, configuration):
+        client = self._client_for(configuration)
+        httpx_request = client.build_request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=request.body,
+            timeout=to_httpx_timeout(timeout),
+        )
+        with to_requests_exceptions():
+            return await client.send(httpx_request, stream=stream)
+
+    def _client_for(self, configuration):
+        # only called in the event loop thread
+        if configuration == (self._verify, None, None):
+            if self._client is None:
+                self._client = self._new_client(configuration)
+            return self._client
+        client = self._clients.get(configuration)
+        if client is None:
+            client = self._clients[configuration] = self._new_client(configuration)
+        return client
+
+    def _new_client(self, configuration):
+        verify, cert, proxy = configuration
+        # the proxies from the environment are already those of the request
+        return httpx.AsyncClient(
+            http1=self._http1,
+            http2=True,
+            verify=_ssl_verify(verify, cert),
+            proxy=proxy,
+            limits=self._limits,
+            trust_env=False,
+        )
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop()).result()
+
+    def _event_loop(self):
+        # started again after close, since closing a session closes its adapters
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='wazo-agentd-http2',
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+
+def _ssl_verify(verify, cert):
+    """Return the httpx `verify` of the requests `verify` and `cert`."""
+    if cert is None and not isinstance(verify, str):
+        return verify
+    if isinstance(verify, ssl.SSLContext):
+        raise ValueError('a client cert needs verify to be a bool or a CA path')
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        context = ssl.create_default_context(cafile=certs.where())
+    elif os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify)
+    if cert is not None:
+        context.load_cert_chain(*cert if isinstance(cert, tuple) else (cert,))
+    return context
+
+
+class _StreamedBody:
+    """The `raw` of a streamed response, reading the decoded httpx body."""
+
+    def __init__(self, adapter, resp):
+        self._adapter = adapter
+        self._resp = resp
+        self._chunks = resp.aiter_bytes()
+        self._buffer = b''
+
+    def read(self, amt=None):
+        while amt is None or len(self._buffer) < amt:
+            chunk = self._adapter._run(self._next_chunk())
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            amt = len(self._buffer)
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def tell(self):
+        # bytes received on the wire, before content decoding
+        return self._resp.num_bytes_downloaded
+
+    def close(self):
+        self._adapter._run(self._resp.aclose())
+
+    async def _next_chunk(self):
+        with to_requests_exceptions():
+            return await anext(self._chunks, None)
@@ -0,0 +1,176 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dataclasses import dataclass
+
+
+class StatusIndex:
+    """Queue, tenant and extension indexes over a snapshot of agent statuses.
+
+    Build it from `get_agent_statuses()` and keep it current with `update`,
+    `remove` or `apply_change` (for `watch_agent_statuses` changes). Counts are
+    answered in O(1) and agent lists in O(result). A status may be modified in
+    place, e.g. by AgentStatusReplica.apply_event, before passing it to
+    `update`.
+    """
+
+    def __init__(self, statuses=()):
+        self._statuses = {}
+        # agent id -> queues, tenant and interface it is indexed under
+        self._keys = {}
+        self._queues = {}
+        self._tenants = {}
+        self._interfaces = {}
+        for status in statuses:
+            self.update(status)
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def __contains__(self, agent_id):
+        return agent_id in self._statuses
+
+    def __iter__(self):
+        return iter(self._statuses.values())
+
+    def get(self, agent_id):
+        return self._statuses.get(agent_id)
+
+    def update(self, status):
+        """Add the status of an agent or replace its previous status."""
+        self._unindex(status.id)
+        self._statuses[status.id] = status
+        self._index(status)
+
+    def remove(self, agent_id):
+        if self._statuses.pop(agent_id, None) is not None:
+            self._unindex(agent_id)
+
+    def apply_change(self, change):
+        if change.kind == 'removed':
+            self.remove(change.agent_id)
+        else:
+            self.update(change.status)
+
+    def queues(self):
+        return list(self._queues)
+
+    def tenants(self):
+        return list(self._tenants)
+
+    def queue_agents(self, queue, logged=None, paused=None):
+        """Return the agents member of `queue`, optionally by logged/paused state."""
+        return self._select(self._queues.get(queue), logged, paused)
+
+    def tenant_agents(self, tenant_uuid, logged=None, paused=None):
+        return self._select(self._tenants.get(tenant_uuid), logged, paused)
+
+    def agents_at(self, extension, context):
+        """Return the agents logged on extension@context."""
+        agent_ids = self._interfaces.get((extension, context), ())
+        return [self._statuses[agent_id] for agent_id in agent_ids]
+
+    def queue_counts(self, queue):
+        return _counts(self._queues.get(queue))
+
+    def tenant_counts(self, tenant_uuid):
+        return _counts(self._tenants.get(tenant_uuid))
+
+    def counts_per_queue(self):
+        return {queue: _counts(group) for queue, group in self._queues.items()}
+
+    def counts_per_tenant(self):
+        return {tenant: _counts(group) for tenant, group in self._tenants.items()}
+
+    def _select(self, group, logged, paused):
+        if group is None:
+            return []
+        if paused:
+            agent_ids = group.paused
+        elif logged:
+            agent_ids = group.logged
+        else:
+            agent_ids = group.members
+        statuses = self._statuses
+        return [
+            statuses[agent_id]
+            for agent_id in agent_ids
+            if (logged is None or statuses[agent_id].logged == logged)
+            and (paused is None or statuses[agent_id].paused == paused)
+        ]
+
+    def _index(self, status):
+        queues = tuple(status.queues)
+        for queue in queues:
+            self._group(self._queues, queue).add(status)
+        self._group(self._tenants, status.tenant_uuid).add(status)
+        interface = None
+        if status.extension is not None:
+            interface = (status.extension, status.context)
+            self._interfaces.setdefault(interface, set()).add(status.id)
+        self._keys[status.id] = (queues, status.tenant_uuid, interface)
+
+    def _unindex(self, agent_id):
+        # the status may have changed since it was indexed
+        keys = self._keys.pop(agent_id, None)
+        if keys is None:
+            return
+        queues, tenant_uuid, interface = keys
+        for queue in queues:
+            self._discard(self._queues, queue, agent_id)
+        self._discard(self._tenants, tenant_uuid, agent_id)
+        if interface is not None:
+            agent_ids = self._interfaces[interface]
+            agent_ids.discard(agent_id)
+            if not agent_ids:
+                del self._interfaces[interface]
+
+    @staticmethod
+    def _group(groups, key):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = _Group()
+        return group
+
+    @staticmethod
+    def _discard(groups, key, agent_id):
+        group = groups.get(key)
+        if group is None:
+            return
+        group.discard(agent_id)
+        if not group.members:
+            del groups[key]
+
+
+@dataclass(frozen=True, slots=True)
+class StatusCounts:
+    total: int = 0
+    logged: int = 0
+    paused: int = 0
+
+
+class _Group:
+    __slots__ = ('members', 'logged', 'paused')
+
+    def __init__(self):
+        self.members = set()
+        self.logged = set()
+        self.paused = set()
+
+    def add(self, status):
+        self.members.add(status.id)
+        if status.logged:
+            self.logged.add(status.id)
+        if status.paused:
+            self.paused.add(status.id)
+
+    def discard(self, agent_id):
+        self.members.discard(agent_id)
+        self.logged.discard(agent_id)
+        self.paused.discard(agent_id)
+
+
+def _counts(group):
+    if group is None:
+        return StatusCounts()
+    return StatusCounts(len(group.members), len(group.logged), len(group.paused))
@@ -0,0 +1,240 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PHASES = ('prepare', 'wait', 'download', 'decode', 'total')
+
+
+@dataclass(slots=True)
+class CallMetrics:
+    """Measurements of a single call, handed to every instrumentation callback.
+
+    `wait_time` runs from sending the request to receiving the response
+    headers: the connection setup, the upload and the server time are not
+    told apart. `download_time` is the time spent reading the body after that
+    and `decode_time` the time spent turning it into the returned value.
+    Times are in seconds. `bytes_received` counts the response body as
+    transferred, compressed or not, and `bytes_decoded` the body after
+    decompression.
+    """
+
+    command: str
+    tenant_uuid: str | None = None
+    status_code: int | None = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+    prepare_time: float = 0.0
+    wait_time: float = 0.0
+    download_time: float = 0.0
+    decode_time: float = 0.0
+    total_time: float = 0.0
+    error: BaseException | None = None
+
+
+class CallTracker:
+    """Time the phases of a call and report them to `listeners` on exit."""
+
+    __slots__ = ('metrics', '_listeners', '_start', '_mark', '_received')
+
+    def __init__(self, listeners, command, tenant_uuid=None):
+        self.metrics = CallMetrics(command, tenant_uuid)
+        self._listeners = listeners
+        self._received = False
+        self._start = self._mark = perf_counter()
+
+    def prepared(self, prepared_request):
+        now = perf_counter()
+        self.metrics.prepare_time = now - self._mark
+        self.metrics.bytes_sent = _body_size(prepared_request.body)
+        self._mark = now
+
+    def received(self, resp):
+        now = perf_counter()
+        metrics = self.metrics
+        send_time = now - self._mark
+        metrics.wait_time = min(resp.elapsed.total_seconds(), send_time)
+        metrics.download_time = send_time - metrics.wait_time
+        metrics.status_code = resp.status_code
+        if not metrics.bytes_sent and resp.request is not None:
+            metrics.bytes_sent = _body_size(resp.request.body)
+        metrics.bytes_decoded = _decoded_size(resp)
+        metrics.bytes_received = _transferred_size(resp, metrics.bytes_decoded)
+        self._mark = now
+        self._received = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        now = perf_counter()
+        metrics = self.metrics
+        if self._received:
+            metrics.decode_time = now - self._mark
+        metrics.total_time = now - self._start
+        metrics.error = exc_value
+        for listener in self._listeners:
+            try:
+                listener(metrics)
+            except Exception:
+                logger.exception('instrumentation callback %r failed', listener)
+        return False
+
+
+class HistogramCollector:
+    """In-memory latency histograms and byte counters fed by CallMetrics.
+
+    Series are labelled by command and status code (`error` when no response
+    was received), and by tenant when `per_tenant` is set.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, per_tenant=False, prefix='wazo_agentd'):
+        self.buckets = tuple(sorted(buckets))
+        self.per_tenant = per_tenant
+        self.prefix = prefix
+        self._histograms = {}
+        self._bytes = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics):
+        labels = (
+            ('command', metrics.command),
+            ('status', str(metrics.status_code or 'error')),
+        )
+        if self.per_tenant:
+            labels += (('tenant', metrics.tenant_uuid or ''),)
+
+        with self._lock:
+            for phase in PHASES:
+                value = getattr(metrics, f'{phase}_time')
+                histogram = self._histograms.get((labels, phase))
+                if histogram is None:
+                    histogram = self._histograms[(labels, phase)] = _Histogram(
+                        len(self.buckets)
+                    )
+                histogram.observe(bisect_left(self.buckets, value), value)
+            for direction, value in (
+                ('sent', metrics.bytes_sent),
+                ('received', metrics.bytes_received),
+                ('decoded', metrics.bytes_decoded),
+            ):
+                key = (labels, direction)
+                self._bytes[key] = self._bytes.get(key, 0) + value
+
+    def count(self, command, status=None):
+        """Return the number of calls recorded for `command`."""
+        with self._lock:
+            return sum(
+                histogram.count
+                for (labels, phase), histogram in self._histograms.items()
+                if phase == 'total'
+                and labels[0][1] == command
+                and (status is None or labels[1][1] == str(status))
+            )
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._bytes.clear()
+
+    def export_prometheus(self):
+        """Return every series in the Prometheus text exposition format."""
+        duration = f'{self.prefix}_client_request_duration_seconds'
+        transferred = f'{self.prefix}_client_request_bytes_total'
+        lines = [
+            f'# HELP {duration} Time spent in each phase of a wazo-agentd call.',
+            f'# TYPE {duration} histogram',
+        ]
+        with self._lock:
+            for (labels, phase), histogram in sorted(self._histograms.items()):
+                base = _format_labels(labels + (('phase', phase),))
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    le = _format_labels((('le', repr(float(bound))),))
+                    lines.append(f'{duration}_bucket{{{base},{le}}} {cumulative}')
+                lines.append(f'{duration}_bucket{{{base},le="+Inf"}} {histogram.count}')
+                lines.append(f'{duration}_sum{{{base}}} {histogram.sum!r}')
+                lines.append(f'{duration}_count{{{base}}} {histogram.count}')
+
+            lines.append(
+                f'# HELP {transferred} Bytes of request and response bodies, '
+                'as transferred and after decompression.'
+            )
+            lines.append(f'# TYPE {transferred} counter')
+            for (labels, direction), value in sorted(self._bytes.items()):
+                base = _format_labels(labels + (('direction', direction),))
+                lines.append(f'{transferred}{{{base}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self, nb_buckets):
+        # the last slot counts the observations above the highest bucket
+        self.counts = [0] * (nb_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, index, value):
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+def _format_labels(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return len(body)
+
+
+def _decoded_size(resp):
+    # never read the body here: streamed responses are consumed by the caller
+    content = resp._content
+    if isinstance(content, bytes):
+        return len(content)
+    return 0
+
+
+def _transferred_size(resp, decoded_size):
+    try:
+        return int(resp.headers['Content-Length'])
+    except (KeyError, ValueError):
+        pass
+    tell = getattr(resp.raw, 'tell', None)
+    if tell is not None and resp.headers.get('Content-Encoding'):
+        return tell()
+    return decoded_size
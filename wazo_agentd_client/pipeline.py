@@ -0,0 +1,289 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+
+from wazo_agentd_client.deadline import _in_context
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import _BulkItemResult, _BulkResult
+
+DEFAULT_WINDOW = 0.2
+DEFAULT_PIPELINE_WORKERS = 10
+
+# command name -> (slot, on, rank); the operations of a slot change the same
+# state of an agent, `on` tells which way, and the operations kept for an
+# agent are sent by rank
+_OPERATIONS = {
+    'logoff_agent': ('session', False, 0),
+    'logoff_agent_by_number': ('session', False, 0),
+    'login_agent': ('session', True, 1),
+    'login_agent_by_number': ('session', True, 1),
+    'remove_agent_from_queue': ('queue', False, 2),
+    'add_agent_to_queue': ('queue', True, 3),
+    'pause_agent_by_number': ('pause', True, 4),
+    'unpause_agent_by_number': ('pause', False, 4),
+}
+
+
+@dataclass
+class _Operation:
+    name: str
+    kwargs: dict[str, Any]
+    seq: int = 0
+
+    @property
+    def agent(self):
+        kwargs = self.kwargs
+        if 'agent_id' in kwargs:
+            return kwargs.get('tenant_uuid'), 'by-id', kwargs['agent_id']
+        return kwargs.get('tenant_uuid'), 'by-number', kwargs['agent_number']
+
+    @property
+    def slot(self):
+        slot = _OPERATIONS[self.name][0]
+        if slot == 'queue':
+            return slot, self.kwargs['queue_id']
+        return slot
+
+    @property
+    def on(self):
+        return _OPERATIONS[self.name][1]
+
+    @property
+    def rank(self):
+        return _OPERATIONS[self.name][2]
+
+
+@dataclass
+class _ElidedOperation:
+    operation: _Operation
+    # cancelled, duplicate or superseded
+    reason: str
+
+
+@dataclass
+class _PipelineResult(_BulkResult):
+    elided: list[_ElidedOperation] = field(default_factory=list)
+
+
+class OperationPipeline:
+    """Buffer agent mutations and send what is left of them once reduced.
+
+    The methods queuing mutations have the arguments of the AgentsCommand
+    methods of the same name. Operations are flushed `window` seconds after
+    the first one is queued, by `flush`, or on exit of a `with` block. The
+    operations of each agent are reduced, in the order they were queued:
+
+    - an operation undone by the next one on the same state (a login by a
+      logoff, a pause by an unpause, adding to a queue by removing from it,
+      and the other way around) is cancelled with it; a logoff followed by a
+      login is kept, since the login may use another extension
+    - an operation repeating the previous one on the same state is a duplicate
+    - pauses and unpauses followed by a logoff are superseded, since logging
+      off unpauses the agent
+
+    What is left is sent in that order: logoff, login, queue removals, queue
+    additions, then pause or unpause. Agents are handled concurrently, at most
+    `max_workers` at a time, and the operations of an agent one after the
+    other. Agents are told apart by the tenant, and by id or by number as
+    given; `agent_numbers` maps agent ids to numbers, for the operations by id
+    of an agent to be reduced and sent with those by number. The agents of a
+    tenant addressed both ways are otherwise sent one after the other, in the
+    order they were first queued, since they may be the same agent.
+
+    A flush only starts sending once the previous one is done, so that the
+    operations of the next window are sent after those already in flight.
+
+    With a `callback`, it receives the _PipelineResult of flushes done after
+    `window` seconds; `flush` returns it. With `window=None`, operations are
+    only sent by `flush`.
+    """
+
+    def __init__(
+        self,
+        agents,
+        window=DEFAULT_WINDOW,
+        max_workers=None,
+        callback=None,
+        agent_numbers=None,
+    ):
+        self.window = window
+        self.max_workers = max_workers or DEFAULT_PIPELINE_WORKERS
+        self.callback = callback
+        self.agent_numbers = agent_numbers or {}
+        self._agents = agents
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._operations = []
+        self._seq = itertools.count()
+        self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def __len__(self):
+        return len(self._operations)
+
+    def add_agent_to_queue(self, agent_id, queue_id, tenant_uuid=None):
+        self._queue('add_agent_to_queue', locals())
+
+    def remove_agent_from_queue(self, agent_id, queue_id, tenant_uuid=None):
+        self._queue('remove_agent_from_queue', locals())
+
+    def login_agent(self, agent_id, extension, context, tenant_uuid=None):
+        self._queue('login_agent', locals())
+
+    def login_agent_by_number(self, agent_number, extension, context, tenant_uuid=None):
+        self._queue('login_agent_by_number', locals())
+
+    def logoff_agent(self, agent_id, tenant_uuid=None):
+        self._queue('logoff_agent', locals())
+
+    def logoff_agent_by_number(self, agent_number, tenant_uuid=None):
+        self._queue('logoff_agent_by_number', locals())
+
+    def pause_agent_by_number(self, agent_number, tenant_uuid=None):
+        self._queue('pause_agent_by_number', locals())
+
+    def unpause_agent_by_number(self, agent_number, tenant_uuid=None):
+        self._queue('unpause_agent_by_number', locals())
+
+    def flush(self):
+        """Send the operations queued so far and return a _PipelineResult.
+
+        Waits for a flush in progress to be done first.
+        """
+        with self._flush_lock:
+            with self._lock:
+                operations, self._operations = self._operations, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            plans, elided = _plan(operations, self.agent_numbers)
+            if not plans:
+                return _PipelineResult(elided=elided)
+            runs = _runs(plans, self.agent_numbers)
+            max_workers = min(self.max_workers, len(runs))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(_in_context(self._run_agents), runs)
+                return _PipelineResult(list(itertools.chain(*results)), elided)
+
+    def plan(self):
+        """Return what flush would send, without sending it.
+
+        That is a list of the operations of each agent, and the
+        _ElidedOperation of the others.
+        """
+        with self._lock:
+            operations = list(self._operations)
+        return _plan(operations, self.agent_numbers)
+
+    def close(self):
+        self.flush()
+
+    def _queue(self, name, arguments):
+        kwargs = {key: value for key, value in arguments.items() if key != 'self'}
+        with self._lock:
+            self._operations.append(_Operation(name, kwargs, next(self._seq)))
+            if self._timer is None and self.window is not None:
+                self._timer = threading.Timer(self.window, self._flush_later)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_later(self):
+        result = self.flush()
+        # nothing is left when flush was called while the timer was firing
+        if self.callback is not None and (result.results or result.elided):
+            self.callback(result)
+
+    def _run_agents(self, plans):
+        results = []
+        for operation in itertools.chain(*plans):
+            fun = getattr(self._agents, operation.name)
+            try:
+                fun(**operation.kwargs)
+            except (AgentdClientError, requests.RequestException) as e:
+                results.append(_BulkItemResult(operation, e))
+            else:
+                results.append(_BulkItemResult(operation))
+        return results
+
+
+def _plan(operations, agent_numbers):
+    by_agent = {}
+    for operation in operations:
+        agent = _agent(operation, agent_numbers)
+        by_agent.setdefault(agent, []).append(operation)
+
+    plans, elided = [], []
+    for agent_operations in by_agent.values():
+        kept = _reduce(agent_operations, elided)
+        if kept:
+            plans.append(sorted(kept, key=lambda op: (op.rank, op.seq)))
+    return plans, elided
+
+
+def _runs(plans, agent_numbers):
+    # the plans of a tenant with agents by id and by number are sent in one run
+    addressing = {}
+    for plan in plans:
+        tenant_uuid, how, _ = _agent(plan[0], agent_numbers)
+        addressing.setdefault(tenant_uuid, set()).add(how)
+
+    runs, mixed = [], {}
+    for plan in plans:
+        tenant_uuid = plan[0].agent[0]
+        if len(addressing[tenant_uuid]) == 1:
+            runs.append([plan])
+        elif tenant_uuid in mixed:
+            mixed[tenant_uuid].append(plan)
+        else:
+            mixed[tenant_uuid] = [plan]
+            runs.append(mixed[tenant_uuid])
+    return runs
+
+
+def _agent(operation, agent_numbers):
+    tenant_uuid, how, value = operation.agent
+    if how == 'by-id' and value in agent_numbers:
+        return tenant_uuid, 'by-number', agent_numbers[value]
+    return tenant_uuid, how, value
+
+
+def _reduce(operations, elided):
+    slots = {}
+    for operation in operations:
+        kept = slots.setdefault(operation.slot, [])
+        last = kept[-1] if kept else None
+        if last is None:
+            kept.append(operation)
+        elif last.name == operation.name and last.kwargs == operation.kwargs:
+            elided.append(_ElidedOperation(operation, 'duplicate'))
+        elif last.on != operation.on and _undoes(operation):
+            kept.pop()
+            elided.append(_ElidedOperation(last, 'cancelled'))
+            elided.append(_ElidedOperation(operation, 'cancelled'))
+        else:
+            kept.append(operation)
+
+        if operation.slot == 'session' and not operation.on:
+            pauses = slots.get('pause', [])
+            for pause in pauses:
+                elided.append(_ElidedOperation(pause, 'superseded'))
+            pauses.clear()
+    return [operation for kept in slots.values() for operation in kept]
+
+
+def _undoes(operation):
+    # a login after a logoff is a relog, which may change the extension
+    return operation.slot != 'session' or not operation.on
@@ -0,0 +1,189 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from wazo_agentd_client.deadline import remaining_time
+from wazo_agentd_client.error import DeadlineExceededError
+
+
+class RateLimiter:
+    """Token buckets and in-flight caps applied to the calls of a client.
+
+    `rate` is the number of calls per second allowed in bursts of at most
+    `burst` calls, and `max_in_flight` the number of calls sent at the same
+    time. The `tenant_*` arguments apply the same limits to every tenant
+    separately. None disables a limit. Callers over budget block, or await with
+    the async client, until their deadline at most: a call that would wait
+    past it raises DeadlineExceededError instead. `waits` counts the calls that
+    had to wait and `wait_time` the seconds they spent waiting.
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        max_in_flight=None,
+        tenant_rate=None,
+        tenant_burst=None,
+        tenant_max_in_flight=None,
+        clock=time.monotonic,
+    ):
+        self.max_in_flight = max_in_flight
+        self.tenant_max_in_flight = tenant_max_in_flight
+        self.calls = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slot_released = threading.Condition(self._lock)
+        self._async_waiters = []
+        self._bucket = _TokenBucket(rate, burst, clock) if rate else None
+        self._tenant_rate = tenant_rate
+        self._tenant_burst = tenant_burst
+        self._tenant_buckets = {}
+        self._in_flight = 0
+        self._tenant_in_flight = {}
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def tenant_in_flight(self, tenant_uuid):
+        return self._tenant_in_flight.get(tenant_uuid, 0)
+
+    @contextmanager
+    def limit(self, tenant_uuid=None):
+        start = self._clock()
+        delay = self._reserve(tenant_uuid)
+        waited = delay > 0
+        if waited:
+            time.sleep(delay)
+        with self._lock:
+            while not self._enter(tenant_uuid):
+                waited = True
+                remaining = remaining_time()
+                if remaining == 0:
+                    raise DeadlineExceededError()
+                self._slot_released.wait(remaining)
+        if waited:
+            self._record_wait(self._clock() - start)
+        try:
+            yield
+        finally:
+            self._exit(tenant_uuid)
+
+    @asynccontextmanager
+    async def alimit(self, tenant_uuid=None):
+        start = self._clock()
+        delay = self._reserve(tenant_uuid)
+        waited = delay > 0
+        if waited:
+            await asyncio.sleep(delay)
+        while True:
+            with self._lock:
+                if self._enter(tenant_uuid):
+                    break
+                remaining = remaining_time()
+                if remaining == 0:
+                    raise DeadlineExceededError()
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+            waited = True
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except TimeoutError:
+                pass
+        if waited:
+            self._record_wait(self._clock() - start)
+        try:
+            yield
+        finally:
+            self._exit(tenant_uuid)
+
+    def _reserve(self, tenant_uuid):
+        remaining = remaining_time()
+        with self._lock:
+            buckets = [self._bucket] if self._bucket else []
+            if self._tenant_rate:
+                bucket = self._tenant_buckets.get(tenant_uuid)
+                if bucket is None:
+                    bucket = self._tenant_buckets[tenant_uuid] = _TokenBucket(
+                        self._tenant_rate, self._tenant_burst, self._clock
+                    )
+                buckets.append(bucket)
+            delay = max((bucket.reserve() for bucket in buckets), default=0.0)
+            if remaining is not None and delay >= remaining:
+                # the call is not sleeping past its deadline: give back its tokens
+                for bucket in buckets:
+                    bucket.tokens += 1
+                raise DeadlineExceededError()
+            return delay
+
+    def _enter(self, tenant_uuid):
+        # called with the lock held
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return False
+        tenant_in_flight = self._tenant_in_flight.get(tenant_uuid, 0)
+        if (
+            self.tenant_max_in_flight is not None
+            and tenant_in_flight >= self.tenant_max_in_flight
+        ):
+            return False
+        self.calls += 1
+        self._in_flight += 1
+        self._tenant_in_flight[tenant_uuid] = tenant_in_flight + 1
+        return True
+
+    def _exit(self, tenant_uuid):
+        with self._lock:
+            self._in_flight -= 1
+            remaining = self._tenant_in_flight[tenant_uuid] - 1
+            if remaining:
+                self._tenant_in_flight[tenant_uuid] = remaining
+            else:
+                del self._tenant_in_flight[tenant_uuid]
+            self._slot_released.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def _record_wait(self, waited):
+        with self._lock:
+            self.waits += 1
+            self.wait_time += waited
+            self.max_wait = max(self.max_wait, waited)
+
+
+class _TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated_at', '_clock')
+
+    def __init__(self, rate, burst, clock):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self._clock = clock
+        self.updated_at = clock()
+
+    def reserve(self):
+        """Take a token and return how long to wait before it is available.
+
+        Tokens go negative when reserved ahead, so concurrent callers are
+        spaced out instead of all waking up at once.
+        """
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,223 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+
+from wazo_agentd_client import error
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import _AgentStatus, _intern
+
+
+class AgentStatusReplica:
+    """Agent statuses kept in memory and updated from wazo agent events.
+
+    The replica is loaded with `agents.get_agent_statuses(tenant_uuid,
+    recurse=True)` on the first read, then kept current by `apply_event`.
+    It is loaded again on the next read after a gap in the event sequence, an
+    event for an unknown agent, or, when `max_age` is set, `max_age` seconds
+    without any event.
+
+    Events are dicts with a `name` and `data`, and an optional `sequence`
+    number:
+
+    - agent_status_update: `status` is logged_in (with `extension`, `context`
+      and `state_interface`) or logged_out
+    - agent_paused, agent_unpaused
+    - agent_added_to_queue, agent_removed_from_queue: `queue` is the queue name
+
+    Events received while the statuses are loaded are applied again to the
+    loaded statuses. The statuses returned are the ones updated in place by
+    later events.
+    """
+
+    def __init__(self, agents, tenant_uuid=None, max_age=None, clock=time.monotonic):
+        self.tenant_uuid = tenant_uuid
+        self.max_age = max_age
+        self.events = 0
+        self.syncs = 0
+        self._agents = agents
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._by_number = {}
+        self._sequence = None
+        self._updated_at = None
+        self._stale = True
+        # events received since begin_reset, and the sequence before them
+        self._pending = None
+        self._pending_sequence = None
+
+    @property
+    def stale(self):
+        """True when the next read loads the statuses again."""
+        if self._stale:
+            return True
+        if self.max_age is None:
+            return False
+        return self._clock() - self._updated_at > self.max_age
+
+    def sync(self):
+        self.begin_reset()
+        try:
+            statuses = self._agents.get_agent_statuses(self.tenant_uuid, recurse=True)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        self.reset(statuses)
+
+    def begin_reset(self):
+        """Keep the events received from now on, to apply them after `reset`.
+
+        Call it before fetching the statuses passed to `reset`.
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = []
+                self._pending_sequence = self._sequence
+
+    def reset(self, statuses):
+        """Replace every status, e.g. with a snapshot fetched by an async client."""
+        # statuses may be shared with a cache or other callers, the replica
+        # updates its own copies
+        statuses = {status.id: _copy_status(status) for status in statuses}
+        by_number = {}
+        for status in statuses.values():
+            by_number[(status.tenant_uuid, status.number)] = status
+            # without tenant, a number is looked up in every tenant
+            by_number.setdefault((None, status.number), status)
+        with self._lock:
+            self._statuses = statuses
+            self._by_number = by_number
+            self._updated_at = self._clock()
+            self._stale = False
+            self.syncs += 1
+            # the statuses may predate events received during the fetch, which
+            # set states rather than change them and can be applied again
+            pending, self._pending = self._pending, None
+            if pending:
+                self._sequence = self._pending_sequence
+                for apply, data, sequence in pending:
+                    if self._follows(sequence):
+                        self._apply(apply, data)
+
+    def get_agent_status(self, agent_id, tenant_uuid=None):
+        self._sync_if_stale()
+        status = self._statuses.get(agent_id)
+        if status is None or (tenant_uuid and status.tenant_uuid != tenant_uuid):
+            raise AgentdClientError(error.NO_SUCH_AGENT)
+        return status
+
+    def get_agent_status_by_number(self, agent_number, tenant_uuid=None):
+        self._sync_if_stale()
+        tenant_uuid = tenant_uuid or self.tenant_uuid
+        status = self._by_number.get((tenant_uuid, agent_number))
+        if status is None:
+            raise AgentdClientError(error.NO_SUCH_AGENT)
+        return status
+
+    def get_agent_statuses(self):
+        self._sync_if_stale()
+        return list(self._statuses.values())
+
+    def apply_event(self, event):
+        """Apply an event to the status of its agent and return that status.
+
+        Events of other names, and events older than the last one applied,
+        are ignored and return None.
+        """
+        apply = _APPLIERS.get(event.get('name'))
+        if apply is None:
+            return None
+
+        data = event.get('data', {})
+        sequence = event.get('sequence')
+        with self._lock:
+            if not self._follows(sequence):
+                return None
+            self.events += 1
+            if self._pending is not None:
+                self._pending.append((apply, data, sequence))
+            return self._apply(apply, data)
+
+    def _follows(self, sequence):
+        # False for an event older than the last one applied
+        if sequence is not None and self._sequence is not None:
+            if sequence <= self._sequence:
+                return False
+            if sequence != self._sequence + 1:
+                self._stale = True
+        if sequence is not None:
+            self._sequence = sequence
+        self._updated_at = self._clock()
+        return True
+
+    def _apply(self, apply, data):
+        status = self._statuses.get(data.get('agent_id'))
+        if status is None:
+            self._stale = True
+            return None
+        apply(status, data)
+        return status
+
+    def _sync_if_stale(self):
+        if self.stale:
+            self.sync()
+
+
+def _logged(status, data):
+    if data.get('status') == 'logged_in':
+        status.logged = True
+        status.extension = data.get('extension', status.extension)
+        status.context = _intern(data.get('context', status.context))
+        status.state_interface = data.get('state_interface', status.state_interface)
+    else:
+        status.logged = False
+        status.paused = False
+        status.extension = None
+        status.context = None
+
+
+def _paused(status, data):
+    status.paused = True
+
+
+def _unpaused(status, data):
+    status.paused = False
+
+
+def _added_to_queue(status, data):
+    queue = _intern(data['queue'])
+    if queue not in status.queues:
+        status.queues.append(queue)
+
+
+def _removed_from_queue(status, data):
+    queue = data['queue']
+    if queue in status.queues:
+        status.queues.remove(queue)
+
+
+_APPLIERS = {
+    'agent_status_update': _logged,
+    'agent_paused': _paused,
+    'agent_unpaused': _unpaused,
+    'agent_added_to_queue': _added_to_queue,
+    'agent_removed_from_queue': _removed_from_queue,
+}
+
+
+def _copy_status(s):
+    return _AgentStatus(
+        s.id,
+        s.number,
+        s.origin_uuid,
+        s.logged,
+        s.paused,
+        s.extension,
+        s.context,
+        s.state_interface,
+        s.tenant_uuid,
+        list(s.queues),
+    )
@@ -0,0 +1,196 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from wazo_agentd_client.error import CircuitOpenError
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class CircuitBreaker:
+    """Fail fast on a host after `failure_threshold` consecutive failures.
+
+    An open circuit lets a single trial call through once `reset_timeout`
+    seconds have elapsed: its success closes the circuit, its failure opens it
+    again, and a trial ending without an outcome must be released. A breaker
+    may be shared by several clients talking to the same host.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def state(self, host):
+        with self._lock:
+            host_state = self._hosts.get(host)
+            if host_state is None or host_state.opened_at is None:
+                return 'closed'
+            if host_state.trial or self._can_retry(host_state):
+                return 'half-open'
+            return 'open'
+
+    def allow(self, host):
+        return self.enter(host) is not None
+
+    def enter(self, host):
+        """Return None when a call to `host` must fail fast.
+
+        Else return whether the call is the trial of an open circuit, to be
+        followed by record_success, record_failure or release.
+        """
+        with self._lock:
+            host_state = self._hosts.get(host)
+            if host_state is None or host_state.opened_at is None:
+                return False
+            if host_state.trial or not self._can_retry(host_state):
+                return None
+            host_state.trial = True
+            return True
+
+    def release(self, host):
+        """End a trial call to `host` without an outcome, e.g. cancelled."""
+        with self._lock:
+            host_state = self._hosts.get(host)
+            if host_state is not None:
+                host_state.trial = False
+
+    def retry_after(self, host):
+        with self._lock:
+            host_state = self._hosts.get(host)
+            if host_state is None or host_state.opened_at is None:
+                return 0.0
+            elapsed = self._clock() - host_state.opened_at
+            return max(0.0, self.reset_timeout - elapsed)
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            host_state = self._hosts.setdefault(host, _HostState())
+            host_state.failures += 1
+            if host_state.trial or host_state.failures >= self.failure_threshold:
+                host_state.opened_at = self._clock()
+                host_state.trial = False
+
+    def _can_retry(self, host_state):
+        return self._clock() - host_state.opened_at >= self.reset_timeout
+
+
+class RetryPolicy:
+    """Decide whether and when a failed call is sent again.
+
+    Idempotent requests are retried on transport errors and on the statuses of
+    `retry_statuses`. Other requests are only retried when agentd cannot have
+    acted on them: the connection could not be established, or the response
+    status is in `unsafe_retry_statuses`. The delay before attempt n is drawn
+    uniformly between 0 and min(`max_backoff`, `backoff_factor` * 2 ** n); a
+    longer Retry-After header is honoured up to `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.2,
+        max_backoff=10.0,
+        retry_statuses=(429, 500, 502, 503, 504),
+        unsafe_retry_statuses=(429, 503),
+        circuit_breaker=None,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.unsafe_retry_statuses = frozenset(unsafe_retry_statuses)
+        self.circuit_breaker = circuit_breaker
+
+    def before_attempt(self, host):
+        """Raise CircuitOpenError when the circuit of `host` is open.
+
+        Return whether the attempt is the trial of the circuit: unless its
+        outcome is given to retry_delay, it must be ended by release_trial.
+        """
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return False
+        trial = breaker.enter(host)
+        if trial is None:
+            raise CircuitOpenError(host, breaker.retry_after(host))
+        return trial
+
+    def release_trial(self, host):
+        self.circuit_breaker.release(host)
+
+    def retry_delay(self, host, method, attempt, resp=None, error=None):
+        """Return the seconds to wait before retrying, or None to stop.
+
+        Must be called with the outcome of every attempt, `resp` or `error`,
+        so that the circuit breaker sees every success and failure.
+        """
+        failed = error is not None or resp.status_code >= 500
+        if self.circuit_breaker is not None:
+            if failed:
+                self.circuit_breaker.record_failure(host)
+            else:
+                self.circuit_breaker.record_success(host)
+
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if error is not None:
+            if not self._can_retry_error(method, error):
+                return None
+            return self.backoff(attempt)
+        if not self._can_retry_status(method, resp.status_code):
+            return None
+        return max(self.backoff(attempt), _retry_after(resp, self.max_backoff))
+
+    def backoff(self, attempt):
+        cap = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, cap)
+
+    def _can_retry_status(self, method, status_code):
+        if method in IDEMPOTENT_METHODS:
+            return status_code in self.retry_statuses
+        return status_code in self.unsafe_retry_statuses
+
+    @staticmethod
+    def _can_retry_error(method, error):
+        if method in IDEMPOTENT_METHODS:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return _is_connect_error(error)
+
+
+class _HostState:
+    __slots__ = ('failures', 'opened_at', 'trial')
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+
+def _is_connect_error(error):
+    # the request never reached agentd
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], 'reason', error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+def _retry_after(resp, max_backoff):
+    try:
+        return min(max(0.0, float(resp.headers['Retry-After'])), max_backoff)
+    except (KeyError, TypeError, ValueError):
+        return 0.0
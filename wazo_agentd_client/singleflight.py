@@ -0,0 +1,101 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import threading
+
+from wazo_agentd_client.deadline import remaining_time
+from wazo_agentd_client.error import DeadlineExceededError
+
+# the result of a call whose caller was interrupted before it completed
+_ABANDONED = object()
+
+
+class SingleFlight:
+    """Share the result of a call between concurrent callers of the same key.
+
+    The first caller of a key runs the call; callers arriving while it is in
+    flight wait for it and receive the same result, or the same exception.
+    Results are shared between callers and must not be modified. When the
+    caller running the call is interrupted or cancelled, one of those waiting
+    runs it again for the others. Callers wait at most until their deadline.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._in_flight_async = {}
+
+    def do(self, key, fun):
+        while True:
+            with self._lock:
+                call = self._in_flight.get(key)
+                if call is None:
+                    call = self._in_flight[key] = _Call()
+                    self.calls += 1
+                    break
+                self.shared += 1
+
+            if not call.done.wait(remaining_time()):
+                raise DeadlineExceededError()
+            if call.error is not None:
+                raise call.error
+            if call.result is not _ABANDONED:
+                return call.result
+
+        try:
+            call.result = fun()
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.result = _ABANDONED
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key, fun):
+        """Same as `do` for a coroutine function, within a single event loop."""
+        while (future := self._in_flight_async.get(key)) is not None:
+            self.shared += 1
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(future), remaining_time()
+                )
+            except TimeoutError:
+                raise DeadlineExceededError() from None
+            if result is not _ABANDONED:
+                return result
+
+        future = self._in_flight_async[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            result = await fun()
+        except Exception as e:
+            future.set_exception(e)
+            # the exception is raised here, waiters may not exist to retrieve it
+            future.exception()
+            raise
+        except BaseException:
+            # cancelled: the others were not, one of them runs the call again
+            future.set_result(_ABANDONED)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight_async[key]
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -0,0 +1,354 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+from wazo_agentd_client import error
+from wazo_agentd_client.deadline import _in_context
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import _AgentStatus
+
+DEFAULT_SNAPSHOT_WORKERS = 10
+
+_MAGIC = b'WAGS'
+_VERSION = 1
+# magic, version, number of agents, length of the JSON metadata
+_HEADER = struct.Struct('<4sHxxIQ')
+# id, flags, origin, context, tenant and number of queues; the strings are
+# codes of the metadata string table, followed by the queue codes and the
+# number, extension and state interface
+_RECORD = struct.Struct('<qBIIIH')
+_LENGTH = struct.Struct('<H')
+_NONE = 0xFFFFFFFF
+_NO_STRING = 0xFFFF
+_LOGGED = 1
+_PAUSED = 2
+
+
+class StatusSnapshot:
+    """Agent statuses saved to a file, read from a memory map.
+
+    Opening a snapshot only reads its metadata: the timestamp of the save,
+    the validators of each tenant or of the recursive read, and a table of
+    the tenants, contexts, origins and queues. A lookup by id or by number
+    decodes the status of a single agent, found by bisecting indexes of the
+    mapped file.
+
+    Statuses are decoded on every call, and may be modified by the caller.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def age(self):
+        return time.time() - self.timestamp
+
+    def get_agent_status(self, agent_id, tenant_uuid=None):
+        try:
+            agent_id = int(agent_id)
+        except (TypeError, ValueError):
+            raise AgentdClientError(error.NO_SUCH_AGENT)
+        ids = self._ids
+        row = bisect_left(ids, agent_id)
+        if row < len(ids) and ids[row] == agent_id:
+            status = self._decode(row)
+            if not tenant_uuid or status.tenant_uuid == tenant_uuid:
+                return status
+        raise AgentdClientError(error.NO_SUCH_AGENT)
+
+    def get_agent_status_by_number(self, agent_number, tenant_uuid=None):
+        # without tenant, a number is looked up in every tenant
+        agent_number = str(agent_number)
+        number_hash = _hash(agent_number)
+        hashes, rows = self._number_hashes, self._number_rows
+        i = bisect_left(hashes, number_hash)
+        while i < len(hashes) and hashes[i] == number_hash:
+            status = self._decode(rows[i])
+            if status.number == agent_number and (
+                not tenant_uuid or status.tenant_uuid == tenant_uuid
+            ):
+                return status
+            i += 1
+        raise AgentdClientError(error.NO_SUCH_AGENT)
+
+    def get_agent_statuses(self, tenant_uuid=None):
+        statuses = (self._decode(row) for row in range(self._count))
+        if tenant_uuid is None:
+            return list(statuses)
+        return [status for status in statuses if status.tenant_uuid == tenant_uuid]
+
+    def close(self):
+        # the views must be released before the map is closed
+        for view in (self._ids, self._offsets, self._number_hashes, self._number_rows):
+            view.release()
+        self._mmap.close()
+
+    def _load(self):
+        buf = self._mmap
+        magic, version, count, meta_length = _HEADER.unpack_from(buf)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{self.path}: not a status snapshot')
+        offset = _HEADER.size
+        meta = json.loads(buf[offset : offset + meta_length])
+        if meta['byteorder'] != sys.byteorder:
+            raise ValueError(f'{self.path}: saved with another byte order')
+
+        self.timestamp = meta['timestamp']
+        self.validators = meta['validators']
+        self.recursive_validators = meta.get('recursive_validators')
+        self.tenants = meta['tenants']
+        self._strings = meta['strings']
+        self._count = count
+
+        view = memoryview(buf)
+        offset = _align(offset + meta_length)
+        self._ids, offset = _section(view, offset, 'q', count)
+        self._offsets, offset = _section(view, offset, 'Q', count + 1)
+        self._number_hashes, offset = _section(view, offset, 'I', count)
+        self._number_rows, offset = _section(view, offset, 'I', count)
+        self._records = _align(offset)
+        view.release()
+
+    def _decode(self, row):
+        buf, strings = self._mmap, self._strings
+        offset = self._records + self._offsets[row]
+        agent_id, flags, origin, context, tenant, nb_queues = _RECORD.unpack_from(
+            buf, offset
+        )
+        offset += _RECORD.size
+        queue_codes = struct.unpack_from(f'<{nb_queues}I', buf, offset)
+        offset += 4 * nb_queues
+        number, offset = _read_string(buf, offset)
+        extension, offset = _read_string(buf, offset)
+        state_interface, offset = _read_string(buf, offset)
+        return _AgentStatus(
+            agent_id,
+            number,
+            _string(strings, origin),
+            bool(flags & _LOGGED),
+            bool(flags & _PAUSED),
+            extension,
+            _string(strings, context),
+            state_interface,
+            _string(strings, tenant),
+            [strings[code] for code in queue_codes],
+        )
+
+
+def save_snapshot(
+    path, statuses, validators=None, timestamp=None, recursive_validators=None
+):
+    """Save statuses and the validators of each tenant to `path`.
+
+    `validators` maps each tenant to the conditional headers of its last
+    status response, `recursive_validators` are those of the last recursive
+    status response. The file is replaced atomically: snapshots opened
+    before keep reading the previous one.
+    """
+    statuses = sorted(statuses, key=lambda status: status.id)
+    validators = validators or {}
+    string_codes = {}
+
+    def code(value):
+        if value is None:
+            return _NONE
+        return string_codes.setdefault(value, len(string_codes))
+
+    records = bytearray()
+    offsets = array('Q')
+    number_index = []
+    for row, status in enumerate(statuses):
+        offsets.append(len(records))
+        flags = (_LOGGED if status.logged else 0) | (_PAUSED if status.paused else 0)
+        records += _RECORD.pack(
+            status.id,
+            flags,
+            code(status.origin_uuid),
+            code(status.context),
+            code(status.tenant_uuid),
+            len(status.queues),
+        )
+        records += struct.pack(
+            f'<{len(status.queues)}I', *(code(queue) for queue in status.queues)
+        )
+        for value in (status.number, status.extension, status.state_interface):
+            _write_string(records, value)
+        number_index.append((_hash(status.number), row))
+    offsets.append(len(records))
+    number_index.sort()
+
+    tenants = dict.fromkeys(status.tenant_uuid for status in statuses)
+    tenants.update(dict.fromkeys(validators))
+    meta = json.dumps(
+        {
+            'byteorder': sys.byteorder,
+            'timestamp': time.time() if timestamp is None else timestamp,
+            'validators': validators,
+            'recursive_validators': recursive_validators,
+            'tenants': [tenant for tenant in tenants if tenant is not None],
+            'strings': list(string_codes),
+        }
+    ).encode()
+
+    sections = [
+        array('q', (status.id for status in statuses)),
+        offsets,
+        array('I', (number_hash for number_hash, _ in number_index)),
+        array('I', (row for _, row in number_index)),
+    ]
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+        try:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(statuses), len(meta)))
+            f.write(meta)
+            for section in sections:
+                _pad(f)
+                f.write(section.tobytes())
+            _pad(f)
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+def refresh_snapshot(agents, path, tenant_uuids=None, max_workers=None):
+    """Fetch the statuses of each tenant, save them to `path` and open them.
+
+    Without `tenant_uuids`, the statuses of every tenant are fetched by a
+    recursive status read, which finds the tenants added since the last
+    refresh. With a ValidatorCache on the client, the validators of the
+    snapshot are sent: a tenant unchanged since the snapshot, or every tenant
+    for a recursive read, is answered 304 Not Modified instead of its
+    statuses.
+
+    Meant to run in a background thread while the previous snapshot is
+    served.
+    """
+    try:
+        previous = StatusSnapshot(path)
+    except FileNotFoundError:
+        previous = None
+
+    try:
+        if tenant_uuids is None:
+            headers = previous.recursive_validators if previous else None
+            statuses, recursive_validators = _fetch(
+                agents,
+                agents._status_all_validator_key(recurse=True),
+                headers,
+                lambda: previous.get_agent_statuses(),
+                recurse=True,
+            )
+            save_snapshot(path, statuses, recursive_validators=recursive_validators)
+        else:
+            statuses, validators = _fetch_tenants(
+                agents, tenant_uuids, previous, max_workers
+            )
+            save_snapshot(path, statuses, validators)
+    finally:
+        if previous is not None:
+            previous.close()
+    return StatusSnapshot(path)
+
+
+def _fetch(agents, key, headers, previous_statuses, **kwargs):
+    # a status read sending the validators of the snapshot, and its validators
+    validator_cache = agents._client.validator_cache
+    if validator_cache is None:
+        return agents.get_agent_statuses(**kwargs), None
+    if headers and validator_cache.get(key) is None:
+        validator_cache.seed(key, headers, previous_statuses())
+    statuses = agents.get_agent_statuses(**kwargs)
+    validated = validator_cache.get(key)
+    return statuses, validated[0] if validated else None
+
+
+def _fetch_tenants(agents, tenant_uuids, previous, max_workers):
+    def fetch(tenant_uuid):
+        return _fetch(
+            agents,
+            agents._status_all_validator_key(tenant_uuid),
+            previous.validators.get(tenant_uuid) if previous else None,
+            lambda: previous.get_agent_statuses(tenant_uuid),
+            tenant_uuid=tenant_uuid,
+        )
+
+    tenant_uuids = list(tenant_uuids)
+    max_workers = max_workers or DEFAULT_SNAPSHOT_WORKERS
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_in_context(fetch), tenant_uuids))
+
+    statuses, validators = [], {}
+    for tenant_uuid, (tenant_statuses, headers) in zip(tenant_uuids, results):
+        statuses.extend(tenant_statuses)
+        if headers:
+            validators[tenant_uuid] = headers
+    return statuses, validators
+
+
+def _hash(number):
+    return zlib.crc32(number.encode())
+
+
+def _string(strings, code):
+    return None if code == _NONE else strings[code]
+
+
+def _read_string(buf, offset):
+    (length,) = _LENGTH.unpack_from(buf, offset)
+    offset += _LENGTH.size
+    if length == _NO_STRING:
+        return None, offset
+    return str(buf[offset : offset + length], 'utf-8'), offset + length
+
+
+def _write_string(records, value):
+    if value is None:
+        records += _LENGTH.pack(_NO_STRING)
+        return
+    encoded = value.encode()
+    records += _LENGTH.pack(len(encoded))
+    records += encoded
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _pad(f):
+    f.write(b'\0' * (_align(f.tell()) - f.tell()))
+
+
+def _section(view, offset, typecode, count):
+    size = array(typecode).itemsize * count
+    return view[offset : offset + size].cast(typecode), _align(offset + size)
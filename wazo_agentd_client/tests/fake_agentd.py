@@ -0,0 +1,474 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""In-process stand-in for the wazo-agentd REST API.
+
+It keeps agents, queues and tenants in memory and serves every endpoint used by
+AgentsCommand and StatusCommand, for tests and benchmarks:
+
+    with FakeAgentd() as agentd:
+        agentd.state.populate(nb_agents=1000)
+        client = Client('127.0.0.1', port=agentd.port, https=False)
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from wazo_agentd_client import error
+
+PREFIX = '/api/agentd/1.0'
+MASTER_TENANT = '00000000-0000-4000-8000-000000000000'
+ORIGIN_UUID = 'f3c4ad4d-7a5b-4f0b-9d2f-0b8a3b3e9a11'
+
+
+@dataclass
+class _Agent:
+    id: int
+    number: str
+    tenant_uuid: str
+    logged: bool = False
+    paused: bool = False
+    paused_reason: str | None = None
+    extension: str | None = None
+    context: str | None = None
+    queue_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class _Queue:
+    id: int
+    name: str
+    tenant_uuid: str
+
+
+class _Error(Exception):
+    def __init__(self, status_code, error):
+        super().__init__(error)
+        self.status_code = status_code
+        self.error = error
+
+
+class FakeAgentdState:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.agents = {}
+        self.agent_ids_by_number = {}
+        self.queues = {}
+        # tenant_uuid -> parent tenant_uuid
+        self.tenants = {MASTER_TENANT: None}
+        # token -> agent id, for the users/me endpoints
+        self.user_agents = {}
+        # (method, path, headers) of the last requests received
+        self.requests = deque(maxlen=1000)
+        # time of the last successful change, for Last-Modified
+        self.last_modified = time.time()
+        # compress responses when the client accepts gzip or deflate
+        self.compression = True
+        self._routes = [
+            ('GET', r'/status', self._get_status),
+            ('GET', r'/agents', self._list_agents),
+            ('GET', r'/agents/by-(id|number)/([^/]+)', self._get_agent),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/login', self._login),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/logoff', self._logoff),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/add', self._add_to_queue),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/remove', self._remove_from_queue),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/pause', self._pause),
+            ('POST', r'/agents/by-(id|number)/([^/]+)/unpause', self._unpause),
+            ('POST', r'/agents/logoff', self._logoff_all),
+            ('POST', r'/agents/relog', self._relog_all),
+            ('GET', r'/users/me/agents', self._get_user_agent),
+            ('POST', r'/users/me/agents/login', self._login_user_agent),
+            ('POST', r'/users/me/agents/logoff', self._logoff_user_agent),
+            ('POST', r'/users/me/agents/pause', self._pause_user_agent),
+            ('POST', r'/users/me/agents/unpause', self._unpause_user_agent),
+        ]
+        self._routes = [
+            (method, re.compile(f'{PREFIX}{pattern}$'), handler)
+            for method, pattern, handler in self._routes
+        ]
+
+    def add_tenant(self, tenant_uuid, parent_uuid=MASTER_TENANT):
+        with self.lock:
+            self.tenants[tenant_uuid] = parent_uuid
+
+    def add_queue(self, queue_id, name, tenant_uuid=MASTER_TENANT):
+        with self.lock:
+            self.queues[queue_id] = _Queue(queue_id, name, tenant_uuid)
+
+    def add_agent(self, agent_id, number, tenant_uuid=MASTER_TENANT, **kwargs):
+        with self.lock:
+            self.agents[agent_id] = _Agent(agent_id, number, tenant_uuid, **kwargs)
+            self.agent_ids_by_number[number] = agent_id
+
+    def populate(self, nb_agents, nb_tenants=1, nb_queues=10, logged_ratio=0.5):
+        """Add agents spread over sub-tenants of the master tenant."""
+        with self.lock:
+            tenants = [MASTER_TENANT]
+            for i in range(1, nb_tenants):
+                tenant_uuid = f'{i:08x}-0000-4000-8000-000000000000'
+                self.add_tenant(tenant_uuid)
+                tenants.append(tenant_uuid)
+            for i in range(nb_queues):
+                self.add_queue(i + 1, f'queue-{i + 1}', tenants[i % nb_tenants])
+            logged_every = round(1 / logged_ratio) if logged_ratio else 0
+            for i in range(nb_agents):
+                tenant_uuid = tenants[i % nb_tenants]
+                logged = bool(logged_every) and i % logged_every == 0
+                queue_ids = [
+                    queue.id
+                    for queue in self.queues.values()
+                    if queue.tenant_uuid == tenant_uuid
+                ][:2]
+                self.add_agent(
+                    i + 1,
+                    str(1000 + i + 1),
+                    tenant_uuid,
+                    logged=logged,
+                    extension=str(2000 + i + 1) if logged else None,
+                    context=f'ctx-{tenant_uuid[:8]}' if logged else None,
+                    queue_ids=queue_ids,
+                )
+
+    def handle(self, method, target, headers, body):
+        """Return (status_code, headers, body) for a request."""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests.append((method, url.path, dict(headers)))
+            for route_method, pattern, handler in self._routes:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    break
+            else:
+                return 404, {}, b''
+            request = _RequestContext(headers, query, body)
+            try:
+                status_code, result = handler(request, *match.groups())
+            except _Error as e:
+                status_code, result = e.status_code, {'error': e.error}
+            if method != 'GET' and status_code // 100 == 2:
+                self.last_modified = time.time()
+            last_modified = self.last_modified
+        if result is None:
+            return status_code, {}, b''
+
+        response_headers = {'Content-Type': 'application/json'}
+        content = json.dumps(result).encode()
+        if method == 'GET' and status_code == 200:
+            etag = f'"{hashlib.sha1(content).hexdigest()}"'
+            response_headers['ETag'] = etag
+            response_headers['Last-Modified'] = formatdate(last_modified, usegmt=True)
+            if _not_modified(headers, etag, last_modified):
+                return 304, response_headers, b''
+        return (status_code, *self._encode(headers, response_headers, content))
+
+    def _encode(self, request_headers, headers, content):
+        accepted = request_headers.get('Accept-Encoding', '')
+        if self.compression and 'gzip' in accepted:
+            headers['Content-Encoding'] = 'gzip'
+            content = gzip.compress(content)
+        elif self.compression and 'deflate' in accepted:
+            headers['Content-Encoding'] = 'deflate'
+            content = zlib.compress(content)
+        headers['Vary'] = 'Accept-Encoding'
+        return headers, content
+
+    def visible_tenants(self, tenant_uuid, recurse):
+        tenant_uuid = tenant_uuid or MASTER_TENANT
+        if tenant_uuid not in self.tenants:
+            raise _Error(401, error.UNAUTHORIZED)
+        if not recurse:
+            return {tenant_uuid}
+        visible = {tenant_uuid}
+        changed = True
+        while changed:
+            changed = False
+            for child, parent in self.tenants.items():
+                if parent in visible and child not in visible:
+                    visible.add(child)
+                    changed = True
+        return visible
+
+    def agent_status(self, agent):
+        return {
+            'id': agent.id,
+            'tenant_uuid': agent.tenant_uuid,
+            'origin_uuid': ORIGIN_UUID,
+            'number': agent.number,
+            'logged': agent.logged,
+            'paused': agent.paused,
+            'paused_reason': agent.paused_reason,
+            'extension': agent.extension,
+            'context': agent.context,
+            'state_interface': (
+                f'Local/id-{agent.id}@agentcallback' if agent.logged else None
+            ),
+            'queues': [self.queues[queue_id].name for queue_id in agent.queue_ids],
+        }
+
+    def _find_agent(self, request, by, value):
+        visible = self.visible_tenants(request.tenant_uuid, recurse=True)
+        if by == 'id':
+            agent_id = int(value) if value.isdigit() else None
+        else:
+            agent_id = self.agent_ids_by_number.get(value)
+        agent = self.agents.get(agent_id)
+        if agent is None or agent.tenant_uuid not in visible:
+            raise _Error(404, error.NO_SUCH_AGENT)
+        return agent
+
+    def _user_agent(self, request):
+        agent_id = self.user_agents.get(request.headers.get('X-Auth-Token'))
+        if agent_id is None:
+            raise _Error(404, error.NO_SUCH_AGENT)
+        return self.agents[agent_id]
+
+    def _get_status(self, request):
+        return 200, {'rest_api': {'status': 'ok'}, 'bus_consumer': {'status': 'ok'}}
+
+    def _list_agents(self, request):
+        recurse = request.query.get('recurse', '').lower() == 'true'
+        visible = self.visible_tenants(request.tenant_uuid, recurse)
+        return 200, [
+            self.agent_status(agent)
+            for agent in self.agents.values()
+            if agent.tenant_uuid in visible
+        ]
+
+    def _get_agent(self, request, by, value):
+        return 200, self.agent_status(self._find_agent(request, by, value))
+
+    def _login(self, request, by, value):
+        agent = self._find_agent(request, by, value)
+        body = request.json()
+        return self._do_login(agent, body['extension'], body['context'])
+
+    def _do_login(self, agent, extension, context):
+        if agent.logged:
+            raise _Error(409, error.ALREADY_LOGGED)
+        for other in self.agents.values():
+            if other.logged and (other.extension, other.context) == (
+                extension,
+                context,
+            ):
+                raise _Error(409, error.ALREADY_IN_USE)
+        agent.logged = True
+        agent.extension = extension
+        agent.context = context
+        return 204, None
+
+    def _logoff(self, request, by, value):
+        return self._do_logoff(self._find_agent(request, by, value))
+
+    def _do_logoff(self, agent):
+        if not agent.logged:
+            raise _Error(409, error.NOT_LOGGED)
+        agent.logged = False
+        agent.paused = False
+        agent.paused_reason = None
+        agent.extension = None
+        agent.context = None
+        return 204, None
+
+    def _add_to_queue(self, request, by, value):
+        agent = self._find_agent(request, by, value)
+        queue = self.queues.get(request.json()['queue_id'])
+        if queue is None:
+            raise _Error(400, error.NO_SUCH_QUEUE)
+        if queue.tenant_uuid != agent.tenant_uuid:
+            raise _Error(400, error.QUEUE_DIFFERENT_TENANT)
+        if queue.id in agent.queue_ids:
+            raise _Error(409, error.ALREADY_IN_QUEUE)
+        agent.queue_ids.append(queue.id)
+        return 204, None
+
+    def _remove_from_queue(self, request, by, value):
+        agent = self._find_agent(request, by, value)
+        queue = self.queues.get(request.json()['queue_id'])
+        if queue is None:
+            raise _Error(400, error.NO_SUCH_QUEUE)
+        if queue.id not in agent.queue_ids:
+            raise _Error(409, error.NOT_IN_QUEUE)
+        agent.queue_ids.remove(queue.id)
+        return 204, None
+
+    def _pause(self, request, by, value):
+        agent = self._find_agent(request, by, value)
+        return self._do_pause(agent, (request.json() or {}).get('reason'))
+
+    def _do_pause(self, agent, reason):
+        if not agent.logged:
+            raise _Error(409, error.NOT_LOGGED)
+        agent.paused = True
+        agent.paused_reason = reason
+        return 204, None
+
+    def _unpause(self, request, by, value):
+        return self._do_unpause(self._find_agent(request, by, value))
+
+    def _do_unpause(self, agent):
+        if not agent.logged:
+            raise _Error(409, error.NOT_LOGGED)
+        agent.paused = False
+        agent.paused_reason = None
+        return 204, None
+
+    def _logoff_all(self, request):
+        recurse = request.query.get('recurse', '').lower() == 'true'
+        visible = self.visible_tenants(request.tenant_uuid, recurse)
+        for agent in self.agents.values():
+            if agent.tenant_uuid in visible and agent.logged:
+                self._do_logoff(agent)
+        return 204, None
+
+    def _relog_all(self, request):
+        recurse = request.query.get('recurse', '').lower() == 'true'
+        visible = self.visible_tenants(request.tenant_uuid, recurse)
+        for agent in self.agents.values():
+            if agent.tenant_uuid in visible and agent.logged:
+                agent.paused = False
+                agent.paused_reason = None
+        return 204, None
+
+    def _get_user_agent(self, request):
+        return 200, self.agent_status(self._user_agent(request))
+
+    def _login_user_agent(self, request):
+        line_id = request.json()['line_id']
+        return self._do_login(self._user_agent(request), f'line-{line_id}', 'default')
+
+    def _logoff_user_agent(self, request):
+        return self._do_logoff(self._user_agent(request))
+
+    def _pause_user_agent(self, request):
+        reason = (request.json() or {}).get('reason')
+        return self._do_pause(self._user_agent(request), reason)
+
+    def _unpause_user_agent(self, request):
+        return self._do_unpause(self._user_agent(request))
+
+
+def _not_modified(headers, etag, last_modified):
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        return etag in (tag.strip() for tag in if_none_match.split(','))
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+class _RequestContext:
+    def __init__(self, headers, query, body):
+        self.headers = headers
+        self.query = query
+        self.body = body
+        self.tenant_uuid = headers.get('Wazo-Tenant')
+
+    def json(self):
+        if not self.body:
+            return None
+        return json.loads(self.body)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status_code, headers, content = self.server.state.handle(
+            self.command, self.path, self.headers, body
+        )
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    # connections accepted, to compare transports in benchmarks
+    connections = 0
+    # the default backlog of 5 resets connections of concurrent clients
+    request_queue_size = 128
+    # seconds before a new connection is served, standing in for the TCP and
+    # TLS handshakes of a real network
+    connect_latency = 0.0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        super().process_request_thread(request, client_address)
+
+
+class FakeAgentd:
+    def __init__(self, state=None, host='127.0.0.1', port=0, connect_latency=0.0):
+        self.state = state or FakeAgentdState()
+        self._server = _Server((host, port), _Handler)
+        self._server.connect_latency = connect_latency
+        self._server.daemon_threads = True
+        self._server.state = self.state
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def connections(self):
+        return self._server.connections
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,34 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from unittest.mock import Mock
+
+import requests
+
+FAKE_TENANT = 'eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee'
+
+
+def new_client(session=None, **attributes):
+    """Return a mock client of `session` with every optional feature disabled.
+
+    `attributes` override the defaults, e.g. `retry_policy=RetryPolicy()`, or
+    `**{'url.side_effect': ...}` for the attributes of child mocks.
+    """
+    return Mock(
+        **{
+            'url.return_value': 'http://example.org/foo',
+            'cached_session.return_value': session or requests.Session(),
+            'host': 'example.org',
+            'port': 443,
+            'tenant_uuid': FAKE_TENANT,
+            'timeout': 10,
+            'status_cache': None,
+            'instrumentation': [],
+            'retry_policy': None,
+            'single_flight': None,
+            'validator_cache': None,
+            'rate_limiter': None,
+            'codec': None,
+            **attributes,
+        }
+    )
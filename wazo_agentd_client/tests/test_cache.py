@@ -0,0 +1,123 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, equal_to, none, same_instance
+from wazo_lib_rest_client.tests.command import RESTCommandTestCase
+
+from wazo_agentd_client.cache import AgentStatusCache, ValidatorCache
+from wazo_agentd_client.helpers import _AgentStatus
+
+new_response = RESTCommandTestCase.new_response
+
+TENANT_A = 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa'
+TENANT_B = 'bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def new_status(agent_id, number, tenant_uuid=TENANT_A):
+    return _AgentStatus(agent_id, number, 'origin', tenant_uuid=tenant_uuid)
+
+
+class TestAgentStatusCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = AgentStatusCache(ttl=10, maxsize=3, clock=self.clock)
+
+    def test_hit_and_miss(self):
+        status = new_status(1, '1001')
+
+        assert_that(self.cache.get(TENANT_A, 'by-id', 1), none())
+        self.cache.set(TENANT_A, 'by-id', 1, status)
+
+        assert_that(self.cache.get(TENANT_A, 'by-id', '1'), same_instance(status))
+        assert_that(self.cache.get(TENANT_B, 'by-id', 1), none())
+        assert_that(self.cache.hits, equal_to(1))
+        assert_that(self.cache.misses, equal_to(2))
+
+    def test_ttl(self):
+        self.cache.set(TENANT_A, 'by-id', 1, new_status(1, '1001'))
+
+        self.clock.now = 10
+
+        assert_that(self.cache.get(TENANT_A, 'by-id', 1), none())
+        assert_that(len(self.cache), equal_to(0))
+
+    def test_lru_eviction(self):
+        for agent_id in (1, 2, 3):
+            self.cache.set(TENANT_A, 'by-id', agent_id, new_status(agent_id, '100'))
+        self.cache.get(TENANT_A, 'by-id', 1)
+
+        self.cache.set(TENANT_A, 'by-id', 4, new_status(4, '1004'))
+
+        assert_that(self.cache.get(TENANT_A, 'by-id', 2), none())
+        assert_that(self.cache.get(TENANT_A, 'by-id', 1).id, equal_to(1))
+        assert_that(self.cache.evictions, equal_to(1))
+
+    def test_invalidate_by_number_drops_entry_cached_by_id(self):
+        self.cache.set(TENANT_A, 'by-id', 1, new_status(1, '1001'))
+        self.cache.set(TENANT_A, 'by-number', '1001', new_status(1, '1001'))
+
+        self.cache.invalidate('by-number', '1001')
+
+        assert_that(len(self.cache), equal_to(0))
+
+    def test_invalidate_tenant(self):
+        self.cache.set(TENANT_A, 'by-id', 1, new_status(1, '1001'))
+        self.cache.set(None, 'by-id', 2, new_status(2, '1002', TENANT_B))
+
+        self.cache.invalidate_tenant(TENANT_B)
+
+        assert_that(self.cache.get(TENANT_A, 'by-id', 1).id, equal_to(1))
+        assert_that(self.cache.get(None, 'by-id', 2), none())
+
+
+class TestValidatorCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ValidatorCache(maxsize=2)
+
+    def test_conditional_headers(self):
+        resp = new_response(200)
+        resp.headers['ETag'] = '"abc"'
+        resp.headers['Last-Modified'] = 'Sun, 18 Oct 2026 10:00:00 GMT'
+        result = [new_status(1, '1001')]
+
+        self.cache.set('key', resp, result)
+
+        headers, cached = self.cache.get('key')
+        assert_that(
+            headers,
+            equal_to(
+                {
+                    'If-None-Match': '"abc"',
+                    'If-Modified-Since': 'Sun, 18 Oct 2026 10:00:00 GMT',
+                }
+            ),
+        )
+        assert_that(cached, same_instance(result))
+
+    def test_response_without_validators_drops_the_entry(self):
+        resp = new_response(200)
+        resp.headers['ETag'] = '"abc"'
+        self.cache.set('key', resp, [])
+
+        self.cache.set('key', new_response(200), [])
+
+        assert_that(self.cache.get('key'), none())
+
+    def test_lru_eviction(self):
+        resp = new_response(200)
+        resp.headers['ETag'] = '"abc"'
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, resp, [])
+
+        assert_that(self.cache.get('a'), none())
+        assert_that(len(self.cache), equal_to(2))
@@ -0,0 +1,206 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_inanyorder,
+    contains_string,
+    equal_to,
+    instance_of,
+)
+
+from wazo_agentd_client import error
+from wazo_agentd_client.cli import main, read_operations, run
+from wazo_agentd_client.tests.fake_agentd import FakeAgentd, FakeAgentdState
+
+CSV = '''action,agent_id,agent_number,extension,context,queue_id
+login,1,1001,2001,default,
+pause,,1001,,,
+remove_from_queue,2,,,,2
+logoff,3,,,,
+'''
+
+
+class TestReadOperations(unittest.TestCase):
+    def test_csv(self):
+        operations = list(read_operations(io.StringIO(CSV), 'csv'))
+
+        assert_that(
+            operations,
+            contains_exactly(
+                (
+                    2,
+                    {
+                        'action': 'login',
+                        'agent_id': 1,
+                        'agent_number': '1001',
+                        'extension': '2001',
+                        'context': 'default',
+                    },
+                ),
+                (3, {'action': 'pause', 'agent_number': '1001'}),
+                (4, {'action': 'remove_from_queue', 'agent_id': 2, 'queue_id': 2}),
+                (5, {'action': 'logoff', 'agent_id': 3}),
+            ),
+        )
+
+    def test_csv_not_an_integer(self):
+        lines = io.StringIO('action,agent_id\nlogoff,abc\n')
+
+        [(line_num, operation)] = read_operations(lines, 'csv')
+
+        assert_that(line_num, equal_to(2))
+        assert_that(operation, instance_of(ValueError))
+
+    def test_jsonl(self):
+        lines = io.StringIO('{"action": "logoff", "agent_id": 1}\n\n[1]\n{\n')
+
+        operations = list(read_operations(lines))
+
+        assert_that(operations[0], equal_to((1, {'action': 'logoff', 'agent_id': 1})))
+        assert_that([line_num for line_num, _ in operations], equal_to([1, 3, 4]))
+        assert_that(operations[1][1], instance_of(ValueError))
+        assert_that(operations[2][1], instance_of(ValueError))
+
+
+class TestRun(unittest.TestCase):
+    def test_operations_of_an_agent_in_input_order(self):
+        calls = []
+
+        def login(agent_number, extension, context):
+            time.sleep(0.05)
+            calls.append(('login', agent_number))
+
+        agents = Mock(
+            login_agent_by_number=Mock(side_effect=login),
+            add_agent_to_queue=Mock(
+                side_effect=lambda agent_id, queue_id: calls.append(('add', agent_id))
+            ),
+            pause_agent_by_number=Mock(
+                side_effect=lambda agent_number: calls.append(('pause', agent_number))
+            ),
+        )
+        operations = [
+            (
+                1,
+                {
+                    'action': 'login',
+                    'agent_id': 1,
+                    'agent_number': '1001',
+                    'extension': '2001',
+                    'context': 'default',
+                },
+            ),
+            (2, {'action': 'add_to_queue', 'agent_id': 1, 'queue_id': 2}),
+            (3, {'action': 'pause', 'agent_number': '1001'}),
+            (4, {'action': 'pause', 'agent_number': '1002'}),
+        ]
+        output = io.StringIO()
+
+        summary = run(agents, iter(operations), output, workers=4)
+
+        assert_that(
+            calls,
+            equal_to(
+                [('pause', '1002'), ('login', '1001'), ('add', 1), ('pause', '1001')]
+            ),
+        )
+        assert_that(summary.failed, equal_to(0))
+        lines = [json.loads(line)['line'] for line in output.getvalue().splitlines()]
+        assert_that(lines, equal_to([4, 1, 2, 3]))
+
+    def test_read_ahead(self):
+        agents = Mock()
+        operations = (
+            (line_num, {'action': 'logoff', 'agent_id': 1})
+            for line_num in range(1, 101)
+        )
+
+        summary = run(agents, operations, io.StringIO(), workers=2)
+
+        assert_that(summary.total, equal_to(100))
+        assert_that(agents.logoff_agent.call_count, equal_to(100))
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.state = FakeAgentdState()
+        self.state.populate(nb_agents=4, nb_queues=2, logged_ratio=0)
+        self.agentd = FakeAgentd(self.state).start()
+        self.addCleanup(self.agentd.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_main(self, filename, content, *args):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'w') as f:
+            f.write(content)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        argv = [
+            '--host',
+            self.agentd.host,
+            '--port',
+            str(self.agentd.port),
+            '--no-https',
+            '--workers',
+            '2',
+            *args,
+            path,
+        ]
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(argv)
+        results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return code, results, stderr.getvalue()
+
+    def test_csv_operations(self):
+        code, results, summary = self.run_main('operations.csv', CSV)
+
+        assert_that(code, equal_to(1))
+        outcomes = [(r['line'], r['ok'], r.get('error')) for r in results]
+        assert_that(
+            outcomes,
+            contains_inanyorder(
+                (2, True, None),
+                (3, True, None),
+                (4, True, None),
+                (5, False, error.NOT_LOGGED),
+            ),
+        )
+        assert_that(summary, contains_string('4 operations, 1 failed'))
+        assert_that(summary, contains_string('p99'))
+        assert_that(self.state.agents[1].logged, equal_to(True))
+        assert_that(self.state.agents[1].paused, equal_to(True))
+        assert_that(self.state.agents[2].queue_ids, contains_exactly(1))
+
+    def test_invalid_operations(self):
+        content = '\n'.join(
+            [
+                '{"action": "dance", "agent_id": 1}',
+                '{"action": "pause", "agent_id": 1}',
+                '{"action": "add_to_queue", "agent_number": "1001", "queue_id": 1}',
+                'not json',
+            ]
+        )
+
+        code, results, summary = self.run_main(
+            'operations.jsonl', content, '--rate', '100'
+        )
+
+        assert_that(code, equal_to(1))
+        errors = dict((r['line'], r['error']) for r in results)
+        assert_that(errors[1], equal_to('unknown action: dance'))
+        assert_that(errors[2], equal_to('pause needs agent_number'))
+        assert_that(errors[3], equal_to('add_to_queue needs an agent_id'))
+        assert_that(errors[4], contains_string('invalid JSON'))
+        assert_that(summary, contains_string('4 operations, 4 failed'))
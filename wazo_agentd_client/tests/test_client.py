@@ -0,0 +1,111 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_string,
+    equal_to,
+    instance_of,
+    is_not,
+    raises,
+    same_instance,
+)
+from wazo_lib_rest_client.client import BaseClient
+
+from wazo_agentd_client.aio.client import AsyncAgentdClient
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.commands.agents import AgentsCommand
+from wazo_agentd_client.commands.status import StatusCommand
+from wazo_agentd_client.http2 import HTTP2Adapter
+
+TENANT_A = 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa'
+TENANT_B = 'bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb'
+
+
+class TestTransport(unittest.TestCase):
+    def test_http2_adapter_is_shared_by_sessions(self):
+        client = AgentdClient('localhost', token='token-a', transport='http2')
+
+        session = client.cached_session()
+        client.set_token('token-b')
+
+        adapter = session.get_adapter('https://localhost/api/agentd/1.0/agents')
+        assert_that(adapter, instance_of(HTTP2Adapter))
+        other = client.cached_session()
+        assert_that(other, is_not(same_instance(session)))
+        assert_that(
+            other.get_adapter('https://localhost/api/agentd/1.0/agents'),
+            same_instance(adapter),
+        )
+
+    def test_http1_keeps_requests_adapter(self):
+        client = AgentdClient('localhost', token='token-a')
+
+        adapter = client.session().get_adapter('https://localhost/')
+
+        assert_that(adapter, is_not(instance_of(HTTP2Adapter)))
+
+    def test_unknown_transport(self):
+        assert_that(
+            calling(AgentdClient).with_args('localhost', transport='http3'),
+            raises(ValueError),
+        )
+
+
+class TestCachedSession(unittest.TestCase):
+    def setUp(self):
+        self.client = AgentdClient('localhost', token='token-a', tenant=TENANT_A)
+
+    def test_session_is_reused(self):
+        session = self.client.cached_session()
+
+        assert_that(self.client.cached_session(), same_instance(session))
+
+    def test_set_token_renews_session(self):
+        session = self.client.cached_session()
+
+        self.client.set_token('token-b')
+
+        new_session = self.client.cached_session()
+        assert_that(new_session, is_not(same_instance(session)))
+        assert_that(new_session.headers['X-Auth-Token'], equal_to('token-b'))
+
+    def test_tenant_change_renews_session(self):
+        session = self.client.cached_session()
+
+        self.client.tenant_uuid = TENANT_B
+
+        new_session = self.client.cached_session()
+        assert_that(new_session, is_not(same_instance(session)))
+        assert_that(new_session.headers['Wazo-Tenant'], equal_to(TENANT_B))
+
+
+class TestStaticRegistry(unittest.TestCase):
+    def test_entry_points_are_not_scanned(self):
+        with patch.object(BaseClient, '_load_plugins') as load_plugins:
+            client = AgentdClient('localhost', static_registry=True)
+
+        load_plugins.assert_not_called()
+        assert_that(client.agents, instance_of(AgentsCommand))
+        assert_that(client.agents, same_instance(client.agents))
+        assert_that(client.status, instance_of(StatusCommand))
+
+    def test_unknown_attribute(self):
+        client = AgentdClient('localhost', static_registry=True)
+
+        self.assertRaises(AttributeError, getattr, client, 'unknown')
+
+    def test_registry_matches_entry_points(self):
+        setup_py = Path(__file__).parents[2] / 'setup.py'
+        if not setup_py.exists():
+            self.skipTest('setup.py is not available')
+        entry_points = setup_py.read_text()
+
+        for client_class in (AgentdClient, AsyncAgentdClient):
+            for name, target in client_class.command_registry.items():
+                assert_that(entry_points, contains_string(f"'{name} = {target}'"))
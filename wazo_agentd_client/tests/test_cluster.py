@@ -0,0 +1,141 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import itertools
+import unittest
+
+from hamcrest import assert_that, contains_inanyorder, equal_to, has_key, instance_of
+from requests.exceptions import ConnectionError
+
+from wazo_agentd_client.client import AgentdClient
+from wazo_agentd_client.cluster import AgentdClusterClient
+from wazo_agentd_client.commands.agents import AgentsCommand
+from wazo_agentd_client.error import AgentdClusterError
+from wazo_agentd_client.tests.fake_agentd import (
+    MASTER_TENANT,
+    FakeAgentd,
+    FakeAgentdState,
+)
+
+TENANT_B = 'bbbbbbbb-0000-4000-8000-000000000000'
+
+
+class _Client(AgentdClient):
+    def _load_plugins(self):
+        self.agents = AgentsCommand(self)
+
+
+class TestAgentdClusterClient(unittest.TestCase):
+    def setUp(self):
+        state_a = FakeAgentdState()
+        state_a.add_agent(1, '1001')
+        state_a.add_agent(2, '1002')
+        self.state_a = state_a
+        state_b = self.state_b = FakeAgentdState()
+        state_b.add_tenant(TENANT_B)
+        state_b.add_agent(10, '1010', TENANT_B)
+        self.agentd_a = FakeAgentd(state_a).start()
+        self.addCleanup(self.agentd_a.stop)
+        self.agentd_b = FakeAgentd(state_b).start()
+        self.addCleanup(self.agentd_b.stop)
+        self.cluster = AgentdClusterClient(
+            {
+                'a': self._new_client(self.agentd_a),
+                'b': self._new_client(self.agentd_b),
+            },
+            tenants={TENANT_B: 'b'},
+        )
+
+    @staticmethod
+    def _new_client(agentd):
+        return _Client(agentd.host, port=agentd.port, https=False, token='token')
+
+    def test_routing(self):
+        assert_that(self.cluster.node_for(TENANT_B), equal_to('b'))
+        assert_that(self.cluster.node_for(MASTER_TENANT), equal_to('a'))
+        assert_that(self.cluster.node_for(None), equal_to('a'))
+
+        status = self.cluster.agents.get_agent_status(10, tenant_uuid=TENANT_B)
+
+        assert_that(status.tenant_uuid, equal_to(TENANT_B))
+
+    def test_bulk_items_are_routed_on_their_tenant(self):
+        logins = [
+            {'agent_id': 1, 'extension': '2001', 'context': 'default'},
+            {
+                'agent_id': 10,
+                'extension': '2010',
+                'context': 'default',
+                'tenant_uuid': TENANT_B,
+            },
+        ]
+
+        result = self.cluster.agents.login_agents(logins)
+
+        assert_that(result.ok, equal_to(True))
+        status = self.cluster.agents.get_agent_status_by_number('1010', TENANT_B)
+        assert_that(status.logged, equal_to(True))
+
+    def test_statuses_are_merged(self):
+        statuses = self.cluster.agents.get_agent_statuses(recurse=True)
+        streamed = self.cluster.agents.iter_agent_statuses(recurse=True)
+
+        assert_that([s.id for s in statuses], contains_inanyorder(1, 2, 10))
+        assert_that([s.id for s in streamed], contains_inanyorder(1, 2, 10))
+
+    def test_status_columns_are_merged(self):
+        columns = self.cluster.agents.get_agent_status_columns(recurse=True)
+
+        assert_that(list(columns.ids), contains_inanyorder(1, 2, 10))
+        assert_that(columns.tenants, contains_inanyorder(MASTER_TENANT, TENANT_B))
+
+    def test_watched_statuses_are_merged(self):
+        changes = self.cluster.agents.watch_agent_statuses(recurse=True)
+
+        added = list(itertools.islice(changes, 3))
+
+        assert_that([c.kind for c in added], equal_to(['added'] * 3))
+        assert_that([c.agent_id for c in added], contains_inanyorder(1, 2, 10))
+
+    def test_tenants_are_relogged_on_their_node(self):
+        results = self.cluster.agents.relog_tenants([MASTER_TENANT, TENANT_B])
+
+        assert_that(
+            [(r.tenant_uuid, r.error) for r in results],
+            contains_inanyorder((MASTER_TENANT, None), (TENANT_B, None)),
+        )
+        assert_that(self._relogged(self.state_a), equal_to([MASTER_TENANT]))
+        assert_that(self._relogged(self.state_b), equal_to([TENANT_B]))
+
+    def test_tenants_of_every_node_are_logged_off(self):
+        self.cluster.agents.login_agent(1, '2001', 'default')
+        self.cluster.agents.login_agent(10, '2010', 'default', tenant_uuid=TENANT_B)
+
+        results = list(self.cluster.agents.logoff_tenants())
+
+        assert_that(
+            [r.tenant_uuid for r in results],
+            contains_inanyorder(MASTER_TENANT, TENANT_B),
+        )
+        assert_that(self.state_a.agents[1].logged, equal_to(False))
+        assert_that(self.state_b.agents[10].logged, equal_to(False))
+
+    @staticmethod
+    def _relogged(state):
+        return [
+            headers.get('Wazo-Tenant')
+            for method, path, headers in state.requests
+            if path.endswith('/agents/relog')
+        ]
+
+    def test_failed_nodes_are_reported(self):
+        self.agentd_b.stop()
+
+        with self.assertRaises(AgentdClusterError) as cm:
+            self.cluster.agents.logoff_all_agents()
+
+        assert_that(cm.exception.errors['b'], instance_of(ConnectionError))
+        assert_that(cm.exception.results, has_key('a'))
+
+    def test_unknown_method(self):
+        self.assertRaises(AttributeError, getattr, self.cluster.agents, 'unknown')
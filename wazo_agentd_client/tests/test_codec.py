@@ -0,0 +1,113 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import sys
+import unittest
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    instance_of,
+    raises,
+    same_instance,
+)
+from wazo_lib_rest_client.tests.command import RESTCommandTestCase
+
+from wazo_agentd_client.codec import (
+    JSONCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    fastest_codec,
+)
+from wazo_agentd_client.helpers import ResponseProcessor, _AgentStatus
+
+new_response = RESTCommandTestCase.new_response
+
+STATUSES = [
+    {
+        'id': agent_id,
+        'number': str(1000 + agent_id),
+        'origin_uuid': 'origin',
+        'logged': agent_id % 2 == 0,
+        'paused': False,
+        'extension': '1001' if agent_id % 2 == 0 else None,
+        'context': 'default',
+        'state_interface': 'PJSIP/abc',
+        'tenant_uuid': 'tenant',
+        'queues': ['sales', 'support'],
+        'paused_reason': None,
+    }
+    for agent_id in (1, 2, 3)
+]
+
+
+def _available_codecs():
+    codecs = [JSONCodec()]
+    for codec_class in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+class TestCodecs(unittest.TestCase):
+    def test_decode_statuses_same_as_stdlib(self):
+        data = json.dumps(STATUSES).encode()
+        expected = [_AgentStatus.new_from_dict(d) for d in STATUSES]
+
+        for codec in _available_codecs():
+            with self.subTest(codec=codec.name):
+                statuses = codec.decode_statuses(data)
+
+                assert_that(statuses, equal_to(expected))
+                assert_that(
+                    statuses[0].tenant_uuid, same_instance(statuses[2].tenant_uuid)
+                )
+                assert_that(statuses[0].queues[0], same_instance(sys.intern('sales')))
+
+    def test_decode_status(self):
+        data = json.dumps(STATUSES[1]).encode()
+
+        for codec in _available_codecs():
+            with self.subTest(codec=codec.name):
+                status = codec.decode_status(data)
+
+                assert_that(status, equal_to(_AgentStatus.new_from_dict(STATUSES[1])))
+
+    def test_dumps_loads(self):
+        obj = {'extension': '1001', 'context': 'default'}
+
+        for codec in _available_codecs():
+            with self.subTest(codec=codec.name):
+                assert_that(json.loads(codec.dumps(obj)), equal_to(obj))
+                assert_that(codec.loads(json.dumps(obj).encode()), equal_to(obj))
+
+    def test_malformed_payload_raises_value_error(self):
+        for codec in _available_codecs():
+            with self.subTest(codec=codec.name):
+                assert_that(
+                    calling(codec.decode_statuses).with_args(b'[{"id": 1'),
+                    raises(ValueError),
+                )
+
+    def test_fastest_codec_falls_back_to_stdlib(self):
+        with patch.dict(sys.modules, {'msgspec': None, 'orjson': None}):
+            codec = fastest_codec()
+
+        assert_that(codec, instance_of(JSONCodec))
+        assert_that(codec.name, equal_to('json'))
+
+
+class TestResponseProcessorCodec(unittest.TestCase):
+    def test_status_all_uses_codec(self):
+        processor = ResponseProcessor(fastest_codec())
+
+        statuses = processor.status_all(new_response(200, STATUSES))
+
+        assert_that(
+            statuses, equal_to([_AgentStatus.new_from_dict(d) for d in STATUSES])
+        )
@@ -0,0 +1,109 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to
+
+from wazo_agentd_client.columns import StatusColumns
+from wazo_agentd_client.helpers import _AgentStatus
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STATUSES = [
+    {
+        'id': 1,
+        'number': '1001',
+        'origin_uuid': 'origin',
+        'logged': True,
+        'paused': True,
+        'extension': '2001',
+        'context': 'default',
+        'state_interface': 'PJSIP/a',
+        'tenant_uuid': 't1',
+        'queues': ['sales', 'support'],
+    },
+    {
+        'id': 2,
+        'number': '1002',
+        'origin_uuid': 'origin',
+        'logged': False,
+        'paused': False,
+        'extension': None,
+        'context': None,
+        'state_interface': 'PJSIP/b',
+        'tenant_uuid': 't2',
+        'queues': [],
+    },
+    {
+        'id': 3,
+        'number': '1003',
+        'origin_uuid': 'origin',
+        'logged': True,
+        'paused': False,
+        'extension': '2003',
+        'context': 'default',
+        'state_interface': 'PJSIP/c',
+        'tenant_uuid': 't1',
+        'queues': ['support'],
+    },
+]
+
+
+class TestStatusColumns(unittest.TestCase):
+    def test_from_dicts(self):
+        columns = StatusColumns.from_dicts(STATUSES)
+
+        assert_that(len(columns), equal_to(3))
+        assert_that(list(columns.ids), contains_exactly(1, 2, 3))
+        assert_that(columns.numbers, contains_exactly('1001', '1002', '1003'))
+        assert_that(columns.tenants, contains_exactly('t1', 't2'))
+        assert_that(list(columns.tenant_codes), contains_exactly(0, 1, 0))
+        assert_that(columns.contexts, contains_exactly('default'))
+        assert_that(list(columns.context_codes), contains_exactly(0, -1, 0))
+        assert_that(list(columns.logged), contains_exactly(1, 0, 1))
+        assert_that(list(columns.paused), contains_exactly(1, 0, 0))
+        assert_that(columns.queues, contains_exactly('sales', 'support'))
+        assert_that(list(columns.queue_offsets), contains_exactly(0, 2, 2, 3))
+        assert_that(list(columns.queue_codes), contains_exactly(0, 1, 1))
+
+    def test_from_statuses_same_as_from_dicts(self):
+        statuses = [_AgentStatus.new_from_dict(d) for d in STATUSES]
+
+        columns = StatusColumns.from_statuses(statuses)
+
+        expected = StatusColumns.from_dicts(STATUSES)
+        assert_that(vars(columns), equal_to(vars(expected)))
+
+    def test_concat_same_as_from_dicts(self):
+        parts = [StatusColumns.from_dicts(STATUSES[2:]), StatusColumns.from_dicts([])]
+        parts.insert(0, StatusColumns.from_dicts(STATUSES[:2]))
+
+        columns = StatusColumns.concat(parts)
+
+        expected = StatusColumns.from_dicts(STATUSES)
+        assert_that(vars(columns), equal_to(vars(expected)))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_to_numpy(self):
+        columns = StatusColumns.from_dicts(STATUSES)
+
+        arrays = columns.to_numpy()
+
+        assert_that(arrays['id'].tolist(), equal_to([1, 2, 3]))
+        assert_that(arrays['logged'].dtype, equal_to(numpy.bool_))
+        assert_that(arrays['logged'].tolist(), equal_to([True, False, True]))
+        occupancy = numpy.bincount(arrays['tenant_code'], weights=arrays['logged'])
+        assert_that(occupancy.tolist(), equal_to([2.0, 0.0]))
+        columns.paused[2] = 1
+        assert_that(arrays['paused'].tolist(), equal_to([True, False, True]))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_to_numpy_empty(self):
+        arrays = StatusColumns.from_dicts([]).to_numpy()
+
+        assert_that(len(arrays['id']), equal_to(0))
+        assert_that(arrays['queue_offsets'].tolist(), equal_to([0]))
@@ -0,0 +1,100 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import threading
+import unittest
+
+import requests
+from hamcrest import (
+    assert_that,
+    calling,
+    close_to,
+    equal_to,
+    instance_of,
+    less_than_or_equal_to,
+    none,
+    raises,
+)
+
+from wazo_agentd_client.deadline import (
+    Deadline,
+    _check_delay,
+    _deadline_errors,
+    _in_context,
+    _timeout,
+    remaining_time,
+)
+from wazo_agentd_client.error import DeadlineExceededError
+
+
+class TestDeadline(unittest.TestCase):
+    def test_no_deadline(self):
+        assert_that(remaining_time(), none())
+        assert_that(_timeout(10), equal_to(10))
+        assert_that(_timeout(None), none())
+
+    def test_timeout_cut_to_remaining_time(self):
+        with Deadline(5):
+            assert_that(_timeout(10), close_to(5, 0.5))
+            assert_that(_timeout(2), equal_to(2))
+            connect, read = _timeout((1, None))
+            assert_that(connect, equal_to(1))
+            assert_that(read, close_to(5, 0.5))
+
+        assert_that(remaining_time(), none())
+
+    def test_expired(self):
+        deadline = Deadline(0)
+
+        with deadline:
+            assert_that(calling(_timeout).with_args(10), raises(DeadlineExceededError))
+
+        assert_that(deadline.expired, equal_to(True))
+        assert_that(deadline.remaining, equal_to(0))
+
+    def test_nested_deadlines_keep_the_earliest(self):
+        with Deadline(1):
+            with Deadline(60) as inner:
+                assert_that(remaining_time(), less_than_or_equal_to(1))
+                assert_that(inner.remaining, close_to(60, 1))
+            with Deadline(0.5):
+                assert_that(remaining_time(), less_than_or_equal_to(0.5))
+            assert_that(remaining_time(), close_to(1, 0.5))
+
+    def test_retry_delay_after_deadline(self):
+        with Deadline(1):
+            _check_delay(0.1)
+            assert_that(
+                calling(_check_delay).with_args(2), raises(DeadlineExceededError)
+            )
+
+    def test_timeout_after_deadline(self):
+        def timed_out():
+            with _deadline_errors():
+                raise requests.ReadTimeout()
+
+        assert_that(calling(timed_out), raises(requests.ReadTimeout))
+        with Deadline(0):
+            assert_that(calling(timed_out), raises(DeadlineExceededError))
+
+    def test_threads_of_bulk_methods(self):
+        remaining = []
+        with Deadline(5):
+            thread = threading.Thread(
+                target=_in_context(lambda: remaining.append(remaining_time()))
+            )
+        thread.start()
+        thread.join()
+
+        assert_that(remaining[0], close_to(5, 0.5))
+
+    def test_asyncio_tasks(self):
+        async def remaining():
+            return remaining_time()
+
+        async def main():
+            with Deadline(5):
+                return await asyncio.create_task(remaining())
+
+        assert_that(asyncio.run(main()), instance_of(float))
@@ -0,0 +1,106 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import unittest
+
+from hamcrest import assert_that, calling, equal_to, raises
+
+from wazo_agentd_client.helpers import (
+    _AgentStatus,
+    _diff_agent_statuses,
+    _JSONArrayStreamDecoder,
+)
+
+
+def decode(chunks):
+    decoder = _JSONArrayStreamDecoder()
+    items = []
+    for chunk in chunks:
+        items.extend(decoder.feed(chunk))
+    items.extend(decoder.close())
+    return items
+
+
+class TestJSONArrayStreamDecoder(unittest.TestCase):
+    def test_every_split_position(self):
+        value = [{'id': 1, 'name': 'é"\\u00e9'}, 12, [1, 2], None, 'x', 3.5, {}]
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+        for i in range(len(data) + 1):
+            assert_that(decode([data[:i], data[i:]]), equal_to(value), str(i))
+
+    def test_byte_by_byte(self):
+        value = [{'id': n, 'queues': ['a', 'b']} for n in range(20)]
+        data = json.dumps(value, indent=2).encode()
+
+        assert_that(decode(data[i : i + 1] for i in range(len(data))), equal_to(value))
+
+    def test_items_are_returned_as_soon_as_complete(self):
+        decoder = _JSONArrayStreamDecoder()
+
+        assert_that(decoder.feed(b'[{"id": 1}, {"id"'), equal_to([{'id': 1}]))
+        assert_that(decoder.feed(b': 2}]'), equal_to([{'id': 2}]))
+        assert_that(decoder.close(), equal_to([]))
+
+    def test_empty_array(self):
+        assert_that(decode([b' [ ', b'] ']), equal_to([]))
+
+    def test_not_an_array(self):
+        assert_that(calling(decode).with_args([b'{"a": 1}']), raises(ValueError))
+
+    def test_truncated(self):
+        assert_that(calling(decode).with_args([b'[{"a": 1}, ']), raises(ValueError))
+        assert_that(calling(decode).with_args([b'']), raises(ValueError))
+
+    def test_missing_separator(self):
+        assert_that(calling(decode).with_args([b'[1 2]']), raises(ValueError))
+
+
+def new_status(agent_id, **kwargs):
+    return _AgentStatus(agent_id, str(1000 + agent_id), 'origin', **kwargs)
+
+
+class TestDiffAgentStatuses(unittest.TestCase):
+    def test_first_snapshot(self):
+        statuses = [new_status(1), new_status(2)]
+
+        snapshot, changes = _diff_agent_statuses({}, statuses)
+
+        assert_that(snapshot, equal_to({1: statuses[0], 2: statuses[1]}))
+        assert_that(
+            [(c.kind, c.agent_id) for c in changes],
+            equal_to([('added', 1), ('added', 2)]),
+        )
+
+    def test_unchanged(self):
+        snapshot, _ = _diff_agent_statuses({}, [new_status(1), new_status(2)])
+
+        _, changes = _diff_agent_statuses(snapshot, [new_status(1), new_status(2)])
+
+        assert_that(changes, equal_to([]))
+
+    def test_login_and_queues(self):
+        snapshot, _ = _diff_agent_statuses({}, [new_status(1, queues=['q1', 'q2'])])
+        logged = new_status(1, logged=True, extension='2001', queues=['q2', 'q3'])
+
+        _, changes = _diff_agent_statuses(snapshot, [logged])
+
+        login, added, removed = changes
+        assert_that(login.kind, equal_to('login'))
+        assert_that(
+            login.changes,
+            equal_to({'logged': (False, True), 'extension': (None, '2001')}),
+        )
+        assert_that((added.kind, added.queue), equal_to(('queue_added', 'q3')))
+        assert_that((removed.kind, removed.queue), equal_to(('queue_removed', 'q1')))
+
+    def test_pause_and_removal(self):
+        snapshot, _ = _diff_agent_statuses({}, [new_status(1), new_status(2)])
+
+        _, changes = _diff_agent_statuses(snapshot, [new_status(1, paused=True)])
+
+        assert_that(
+            [(c.kind, c.agent_id) for c in changes],
+            equal_to([('pause', 1), ('removed', 2)]),
+        )
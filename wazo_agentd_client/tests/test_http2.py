@@ -0,0 +1,114 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gzip
+import json
+import unittest
+
+import httpx
+import requests
+from hamcrest import assert_that, calling, equal_to, is_not, raises
+
+from wazo_agentd_client.http2 import HTTP2Adapter
+
+STATUSES = [{'id': 1}, {'id': 2}]
+
+
+class TestHTTP2Adapter(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.adapter = HTTP2Adapter()
+        self.adapter._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle)
+        )
+        self.session = requests.Session()
+        self.session.headers = {'Connection': 'close', 'X-Auth-Token': 'token'}
+        # the CA bundle and proxies of the environment are request settings
+        self.session.trust_env = False
+        self.session.mount('https://', self.adapter)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_closed_adapter_can_be_reused(self):
+        self.adapter.close()
+        self.adapter._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle)
+        )
+
+        resp = self.session.get('https://agentd/agents')
+
+        assert_that(resp.json(), equal_to(STATUSES))
+
+    def _handle(self, request):
+        self.requests.append(request)
+        if request.url.path.endswith('/login'):
+            return httpx.Response(204)
+        if request.url.path.endswith('/down'):
+            raise httpx.ConnectError('connection refused', request=request)
+        return httpx.Response(
+            200,
+            headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+            content=gzip.compress(json.dumps(STATUSES).encode()),
+        )
+
+    def test_send(self):
+        resp = self.session.post(
+            'https://agentd/agents/by-id/1/login',
+            json={'extension': '1001'},
+            timeout=5,
+        )
+
+        assert_that(resp.status_code, equal_to(204))
+        (request,) = self.requests
+        assert_that(json.loads(request.content), equal_to({'extension': '1001'}))
+        assert_that(request.headers['X-Auth-Token'], equal_to('token'))
+        assert_that(request.headers.get('Connection'), is_not(equal_to('close')))
+        assert_that(request.extensions['timeout']['read'], equal_to(5))
+
+    def test_decoded_body(self):
+        resp = self.session.get('https://agentd/agents')
+
+        assert_that(resp.json(), equal_to(STATUSES))
+        assert_that(resp.elapsed.total_seconds() > 0, equal_to(True))
+
+    def test_streamed_body(self):
+        resp = self.session.get('https://agentd/agents', stream=True)
+
+        body = b''.join(resp.iter_content(4))
+        assert_that(json.loads(body), equal_to(STATUSES))
+        assert_that(resp.raw.tell() < len(body), equal_to(True))
+
+    def test_request_verify_cert_and_proxies(self):
+        configurations = []
+
+        def new_client(configuration):
+            configurations.append(configuration)
+            return httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+
+        self.adapter._new_client = new_client
+        proxies = {'https': 'http://proxy:3128'}
+
+        self.session.get('https://agentd/agents')
+        self.session.get('https://agentd/agents', verify=False)
+        self.session.get('https://agentd/agents', verify=False)
+        self.session.get('https://agentd/agents', proxies=proxies)
+        self.session.get('https://agentd/agents', cert=('client.pem', 'key.pem'))
+
+        assert_that(
+            configurations,
+            equal_to(
+                [
+                    (False, None, None),
+                    (True, None, 'http://proxy:3128'),
+                    (True, ('client.pem', 'key.pem'), None),
+                ]
+            ),
+        )
+        assert_that(len(self.requests), equal_to(5))
+
+    def test_connect_error(self):
+        assert_that(
+            calling(self.session.get).with_args('https://agentd/down'),
+            raises(requests.ConnectionError),
+        )
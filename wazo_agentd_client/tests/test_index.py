@@ -0,0 +1,141 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_inanyorder, empty, equal_to
+
+from wazo_agentd_client.helpers import _AgentStatus, _diff_agent_statuses
+from wazo_agentd_client.index import StatusCounts, StatusIndex
+from wazo_agentd_client.replica import AgentStatusReplica
+
+TENANT_A = 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa'
+TENANT_B = 'bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb'
+
+
+def new_status(agent_id, tenant_uuid=TENANT_A, queues=(), **kwargs):
+    return _AgentStatus(
+        agent_id,
+        str(1000 + agent_id),
+        'origin',
+        tenant_uuid=tenant_uuid,
+        queues=list(queues),
+        **kwargs,
+    )
+
+
+class TestStatusIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = StatusIndex(
+            [
+                new_status(
+                    1, queues=['q1', 'q2'], logged=True, extension='2001', context='ctx'
+                ),
+                new_status(
+                    2, queues=['q1'], logged=True, paused=True, extension='2002'
+                ),
+                new_status(3, queues=['q1']),
+                new_status(4, TENANT_B, queues=['q2'], logged=True),
+            ]
+        )
+
+    def ids(self, statuses):
+        return [status.id for status in statuses]
+
+    def test_queue_agents(self):
+        assert_that(
+            self.ids(self.index.queue_agents('q1')), contains_inanyorder(1, 2, 3)
+        )
+        assert_that(
+            self.ids(self.index.queue_agents('q1', logged=True)),
+            contains_inanyorder(1, 2),
+        )
+        assert_that(
+            self.ids(self.index.queue_agents('q1', logged=True, paused=False)),
+            equal_to([1]),
+        )
+        assert_that(
+            self.ids(self.index.queue_agents('q1', logged=False)), equal_to([3])
+        )
+        assert_that(self.index.queue_agents('unknown'), empty())
+
+    def test_counts(self):
+        assert_that(self.index.queue_counts('q1'), equal_to(StatusCounts(3, 2, 1)))
+        assert_that(
+            self.index.counts_per_tenant(),
+            equal_to(
+                {TENANT_A: StatusCounts(3, 2, 1), TENANT_B: StatusCounts(1, 1, 0)}
+            ),
+        )
+        assert_that(self.index.queue_counts('unknown'), equal_to(StatusCounts()))
+
+    def test_agents_at(self):
+        assert_that(self.ids(self.index.agents_at('2001', 'ctx')), equal_to([1]))
+        assert_that(self.index.agents_at('2001', 'other'), empty())
+
+    def test_update(self):
+        self.index.update(new_status(1, queues=['q3']))
+
+        assert_that(self.ids(self.index.queue_agents('q1')), contains_inanyorder(2, 3))
+        assert_that(self.index.queue_counts('q2'), equal_to(StatusCounts(1, 1, 0)))
+        assert_that(self.index.queue_counts('q3'), equal_to(StatusCounts(1, 0, 0)))
+        assert_that(self.index.agents_at('2001', 'ctx'), empty())
+        assert_that(self.index.queues(), contains_inanyorder('q1', 'q2', 'q3'))
+
+    def test_remove(self):
+        self.index.remove(4)
+
+        assert_that(len(self.index), equal_to(3))
+        assert_that(self.index.tenants(), equal_to([TENANT_A]))
+
+    def test_apply_change(self):
+        snapshot = {status.id: status for status in self.index}
+        statuses = [
+            new_status(1, queues=['q1'], logged=True, paused=True),
+            new_status(2),
+        ]
+        _, changes = _diff_agent_statuses(snapshot, statuses)
+
+        for change in changes:
+            self.index.apply_change(change)
+
+        assert_that(len(self.index), equal_to(2))
+        assert_that(self.index.queue_counts('q1'), equal_to(StatusCounts(1, 1, 1)))
+
+
+class TestStatusIndexFromReplica(unittest.TestCase):
+    def setUp(self):
+        agents = Mock()
+        agents.get_agent_statuses.return_value = [
+            new_status(1, queues=['q1'], logged=True, extension='2001', context='ctx'),
+            new_status(2, queues=['q1']),
+        ]
+        self.replica = AgentStatusReplica(agents)
+        self.index = StatusIndex(self.replica.get_agent_statuses())
+
+    def apply(self, name, **data):
+        # the replica returns the status it modified in place
+        self.index.update(self.replica.apply_event({'name': name, 'data': data}))
+
+    def test_statuses_modified_in_place(self):
+        self.apply('agent_removed_from_queue', agent_id=1, queue='q1')
+        self.apply('agent_status_update', agent_id=1, status='logged_out')
+        self.apply(
+            'agent_status_update',
+            agent_id=2,
+            status='logged_in',
+            extension='2001',
+            context='ctx',
+        )
+        self.apply('agent_added_to_queue', agent_id=1, queue='q2')
+
+        assert_that([s.id for s in self.index.queue_agents('q1')], equal_to([2]))
+        assert_that([s.id for s in self.index.queue_agents('q2')], equal_to([1]))
+        assert_that(self.index.queue_counts('q1'), equal_to(StatusCounts(1, 1, 0)))
+        assert_that([s.id for s in self.index.agents_at('2001', 'ctx')], equal_to([2]))
+
+        self.apply('agent_status_update', agent_id=2, status='logged_out')
+
+        assert_that(self.index.agents_at('2001', 'ctx'), empty())
+        assert_that(self.index.tenant_counts(TENANT_A), equal_to(StatusCounts(2)))
@@ -0,0 +1,116 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_string, equal_to, has_item, instance_of, none
+
+from wazo_agentd_client.instrumentation import (
+    CallMetrics,
+    CallTracker,
+    HistogramCollector,
+)
+
+TENANT = 'eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee'
+
+
+class TestCallTracker(unittest.TestCase):
+    def test_listeners_receive_metrics_on_error(self):
+        listener = Mock()
+
+        with self.assertRaises(ValueError):
+            with CallTracker([listener], 'status_all', TENANT):
+                raise ValueError('meh')
+
+        (metrics,) = listener.call_args.args
+        assert_that(metrics.command, equal_to('status_all'))
+        assert_that(metrics.tenant_uuid, equal_to(TENANT))
+        assert_that(metrics.status_code, none())
+        assert_that(metrics.error, instance_of(ValueError))
+
+    def test_phases(self):
+        listener = Mock()
+        resp = Mock(
+            status_code=200,
+            headers={'Content-Length': '2'},
+            request=None,
+            _content=b'[]',
+            **{'elapsed.total_seconds.return_value': 0.0},
+        )
+
+        with CallTracker([listener], 'status_all') as tracker:
+            tracker.prepared(Mock(body='{}'))
+            tracker.received(resp)
+
+        (metrics,) = listener.call_args.args
+        assert_that(metrics.wait_time, equal_to(0.0))
+        assert_that(metrics.bytes_sent, equal_to(2))
+        assert_that(metrics.bytes_received, equal_to(2))
+        assert_that(
+            metrics.total_time >= metrics.prepare_time + metrics.download_time,
+            equal_to(True),
+        )
+        collector = HistogramCollector()
+        collector(metrics)
+        assert_that(collector.export_prometheus(), contains_string('phase="wait"'))
+
+    def test_failing_listener_does_not_fail_the_call(self):
+        listener = Mock()
+
+        with CallTracker([Mock(side_effect=RuntimeError), listener], 'status'):
+            pass
+
+        listener.assert_called_once()
+
+
+class TestHistogramCollector(unittest.TestCase):
+    def setUp(self):
+        self.collector = HistogramCollector(buckets=(0.01, 0.1))
+
+    def test_count(self):
+        self.collector(CallMetrics('status_all', TENANT, 200, total_time=0.05))
+        self.collector(CallMetrics('status_all', TENANT, 404, total_time=0.05))
+        self.collector(CallMetrics('login_by_id', TENANT, 204, total_time=0.05))
+
+        assert_that(self.collector.count('status_all'), equal_to(2))
+        assert_that(self.collector.count('status_all', 404), equal_to(1))
+
+    def test_export_prometheus(self):
+        for total_time in (0.005, 0.05, 1.0):
+            self.collector(
+                CallMetrics(
+                    'status_all', TENANT, 200, bytes_received=10, total_time=total_time
+                )
+            )
+        self.collector(CallMetrics('login_by_id', TENANT, error=ValueError()))
+
+        lines = self.collector.export_prometheus().splitlines()
+
+        name = 'wazo_agentd_client_request_duration_seconds'
+        labels = 'command="status_all",status="200",phase="total"'
+        assert_that(lines, has_item(f'# TYPE {name} histogram'))
+        assert_that(lines, has_item(f'{name}_bucket{{{labels},le="0.01"}} 1'))
+        assert_that(lines, has_item(f'{name}_bucket{{{labels},le="0.1"}} 2'))
+        assert_that(lines, has_item(f'{name}_bucket{{{labels},le="+Inf"}} 3'))
+        assert_that(lines, has_item(f'{name}_count{{{labels}}} 3'))
+        assert_that(lines, has_item(f'{name}_sum{{{labels}}} 1.055'))
+        assert_that(
+            lines,
+            has_item(
+                'wazo_agentd_client_request_bytes_total'
+                '{command="status_all",status="200",direction="received"} 30'
+            ),
+        )
+        assert_that(
+            '\n'.join(lines), contains_string('command="login_by_id",status="error"')
+        )
+
+    def test_per_tenant_labels(self):
+        collector = HistogramCollector(per_tenant=True)
+
+        collector(CallMetrics('status_all', TENANT, 200))
+
+        assert_that(
+            collector.export_prometheus(), contains_string(f'tenant="{TENANT}"')
+        )
@@ -0,0 +1,235 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock, call
+
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_length
+
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.pipeline import OperationPipeline
+
+TENANT = 'tenant'
+
+
+def names(operations):
+    return [operation.name for operation in operations]
+
+
+def elided(result):
+    return [(e.operation.name, e.reason) for e in result.elided]
+
+
+class TestOperationPipeline(unittest.TestCase):
+    def setUp(self):
+        self.agents = Mock()
+        self.pipeline = OperationPipeline(self.agents, window=None)
+
+    def test_login_then_logoff_cancelled(self):
+        self.pipeline.login_agent(1, '1001', 'default')
+        self.pipeline.logoff_agent(1)
+
+        result = self.pipeline.flush()
+
+        assert_that(result.results, empty())
+        assert_that(
+            elided(result),
+            contains_exactly(
+                ('login_agent', 'cancelled'), ('logoff_agent', 'cancelled')
+            ),
+        )
+        assert_that(self.agents.mock_calls, empty())
+
+    def test_logoff_then_login_kept_as_relog(self):
+        self.pipeline.logoff_agent(1)
+        self.pipeline.login_agent(1, '1002', 'default')
+        self.pipeline.login_agent(1, '1002', 'default')
+
+        result = self.pipeline.flush()
+
+        assert_that(
+            self.agents.mock_calls,
+            contains_exactly(
+                call.logoff_agent(agent_id=1, tenant_uuid=None),
+                call.login_agent(
+                    agent_id=1, extension='1002', context='default', tenant_uuid=None
+                ),
+            ),
+        )
+        assert_that(elided(result), contains_exactly(('login_agent', 'duplicate')))
+
+    def test_inverse_queue_and_pause_operations_cancelled(self):
+        self.pipeline.add_agent_to_queue(1, 10)
+        self.pipeline.remove_agent_from_queue(1, 10)
+        self.pipeline.remove_agent_from_queue(1, 11)
+        self.pipeline.add_agent_to_queue(1, 11)
+        self.pipeline.pause_agent_by_number('1001')
+        self.pipeline.unpause_agent_by_number('1001')
+
+        result = self.pipeline.flush()
+
+        assert_that(self.agents.mock_calls, empty())
+        assert_that(result.elided, has_length(6))
+
+    def test_pause_superseded_by_logoff(self):
+        self.pipeline.pause_agent_by_number('1001')
+        self.pipeline.logoff_agent_by_number('1001')
+        self.pipeline.login_agent_by_number('1001', '1001', 'default')
+        self.pipeline.pause_agent_by_number('1001')
+
+        result = self.pipeline.flush()
+
+        assert_that(
+            names(r.item for r in result.results),
+            contains_exactly(
+                'logoff_agent_by_number',
+                'login_agent_by_number',
+                'pause_agent_by_number',
+            ),
+        )
+        assert_that(
+            elided(result),
+            contains_exactly(('pause_agent_by_number', 'superseded')),
+        )
+
+    def test_operations_of_an_agent_ordered(self):
+        self.pipeline.add_agent_to_queue(1, 10)
+        self.pipeline.remove_agent_from_queue(1, 11)
+        self.pipeline.login_agent(1, '1001', 'default')
+        self.pipeline.logoff_agent(1)
+        self.pipeline.login_agent(1, '1001', 'default')
+
+        plans, elided_operations = self.pipeline.plan()
+
+        assert_that(plans, has_length(1))
+        assert_that(
+            names(plans[0]),
+            contains_exactly(
+                'login_agent', 'remove_agent_from_queue', 'add_agent_to_queue'
+            ),
+        )
+        assert_that(elided_operations, has_length(2))
+        assert_that(self.pipeline, has_length(5))
+
+    def test_agents_planned_separately(self):
+        self.pipeline.login_agent(1, '1001', 'default', tenant_uuid=TENANT)
+        self.pipeline.logoff_agent(1)
+        self.pipeline.logoff_agent(2, tenant_uuid=TENANT)
+
+        plans, elided_operations = self.pipeline.plan()
+
+        assert_that(plans, has_length(3))
+        assert_that(elided_operations, empty())
+
+    def test_agents_of_a_tenant_addressed_both_ways_sent_in_turn(self):
+        calls = []
+
+        def login_agent(**kwargs):
+            time.sleep(0.05)
+            calls.append('login_agent')
+
+        self.agents.login_agent.side_effect = login_agent
+        self.agents.pause_agent_by_number.side_effect = lambda **kwargs: calls.append(
+            'pause_agent_by_number'
+        )
+        self.agents.logoff_agent.side_effect = lambda **kwargs: calls.append(
+            'logoff_agent'
+        )
+        self.pipeline.login_agent(12, '1012', 'default')
+        self.pipeline.pause_agent_by_number('1012')
+        self.pipeline.logoff_agent(13, tenant_uuid=TENANT)
+
+        self.pipeline.flush()
+
+        assert_that(
+            calls,
+            contains_exactly('logoff_agent', 'login_agent', 'pause_agent_by_number'),
+        )
+
+    def test_agent_numbers(self):
+        pipeline = OperationPipeline(
+            self.agents, window=None, agent_numbers={12: '1012'}
+        )
+        pipeline.pause_agent_by_number('1012')
+        pipeline.login_agent(12, '1012', 'default')
+        pipeline.logoff_agent_by_number('1012')
+
+        plans, elided_operations = pipeline.plan()
+
+        assert_that(plans, empty())
+        assert_that(
+            [(e.operation.name, e.reason) for e in elided_operations],
+            contains_exactly(
+                ('login_agent', 'cancelled'),
+                ('logoff_agent_by_number', 'cancelled'),
+                ('pause_agent_by_number', 'superseded'),
+            ),
+        )
+
+    def test_errors_reported_per_operation(self):
+        self.agents.login_agent.side_effect = AgentdClientError('already logged')
+        self.pipeline.login_agent(1, '1001', 'default')
+        self.pipeline.add_agent_to_queue(1, 10)
+
+        result = self.pipeline.flush()
+
+        assert_that(result.ok, equal_to(False))
+        assert_that(
+            names(r.item for r in result.failed), contains_exactly('login_agent')
+        )
+        assert_that(
+            names(r.item for r in result.succeeded),
+            contains_exactly('add_agent_to_queue'),
+        )
+
+    def test_flushed_after_window(self):
+        flushed = threading.Event()
+        results = []
+
+        def callback(result):
+            results.append(result)
+            flushed.set()
+
+        pipeline = OperationPipeline(self.agents, window=0.01, callback=callback)
+        pipeline.logoff_agent(1)
+
+        assert_that(flushed.wait(5), equal_to(True))
+        assert_that(results[0].results, has_length(1))
+        self.agents.logoff_agent.assert_called_once_with(agent_id=1, tenant_uuid=None)
+        assert_that(pipeline, has_length(0))
+
+    def test_next_window_sent_after_the_previous_one(self):
+        calls = []
+        login_started = threading.Event()
+
+        def login_agent(**kwargs):
+            login_started.set()
+            time.sleep(0.2)
+            calls.append('login_agent')
+
+        self.agents.login_agent.side_effect = login_agent
+        self.agents.add_agent_to_queue.side_effect = lambda **kwargs: calls.append(
+            'add_agent_to_queue'
+        )
+        flushed = threading.Semaphore(0)
+        pipeline = OperationPipeline(
+            self.agents, window=0.05, callback=lambda result: flushed.release()
+        )
+
+        pipeline.login_agent(12, '1012', 'default')
+        assert_that(login_started.wait(5), equal_to(True))
+        pipeline.add_agent_to_queue(12, 4)
+
+        assert_that(flushed.acquire(timeout=5), equal_to(True))
+        assert_that(flushed.acquire(timeout=5), equal_to(True))
+        assert_that(calls, contains_exactly('login_agent', 'add_agent_to_queue'))
+
+    def test_flushed_on_exit(self):
+        with OperationPipeline(self.agents, window=None) as pipeline:
+            pipeline.unpause_agent_by_number('1001')
+
+        self.agents.unpause_agent_by_number.assert_called_once_with(
+            agent_number='1001', tenant_uuid=None
+        )
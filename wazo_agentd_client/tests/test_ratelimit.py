@@ -0,0 +1,154 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from hamcrest import assert_that, calling, close_to, equal_to, less_than, raises
+
+from wazo_agentd_client.deadline import Deadline
+from wazo_agentd_client.error import DeadlineExceededError
+from wazo_agentd_client.ratelimit import RateLimiter, _TokenBucket
+
+TENANT_A = 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa'
+TENANT_B = 'bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_reservations_are_spaced(self):
+        clock = FakeClock()
+        bucket = _TokenBucket(rate=10, burst=2, clock=clock)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        assert_that(delays, equal_to([0.0, 0.0, 0.1, 0.2]))
+
+    def test_refill(self):
+        clock = FakeClock()
+        bucket = _TokenBucket(rate=10, burst=2, clock=clock)
+        bucket.reserve(), bucket.reserve()
+
+        clock.now = 0.1
+
+        assert_that(bucket.reserve(), equal_to(0.0))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_wait_time_is_recorded(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, burst=1, clock=clock)
+
+        def sleep(delay):
+            clock.now += delay
+
+        with patch('wazo_agentd_client.ratelimit.time.sleep', side_effect=sleep):
+            for _ in range(3):
+                with limiter.limit():
+                    pass
+
+        assert_that(limiter.calls, equal_to(3))
+        assert_that(limiter.waits, equal_to(2))
+        assert_that(limiter.wait_time, close_to(0.2, 1e-9))
+        assert_that(limiter.max_wait, close_to(0.1, 1e-9))
+
+    def test_tenant_rates_are_separate(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tenant_rate=1, clock=clock)
+
+        with limiter.limit(TENANT_A), limiter.limit(TENANT_B):
+            pass
+
+        assert_that(limiter.waits, equal_to(0))
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=2, tenant_max_in_flight=1)
+        peak = {TENANT_A: 0, TENANT_B: 0, None: 0}
+        lock = threading.Lock()
+
+        def call(tenant_uuid):
+            with limiter.limit(tenant_uuid):
+                with lock:
+                    peak[None] = max(peak[None], limiter.in_flight)
+                    peak[tenant_uuid] = max(
+                        peak[tenant_uuid], limiter.tenant_in_flight(tenant_uuid)
+                    )
+                time.sleep(0.005)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(call, [TENANT_A, TENANT_B] * 5))
+
+        assert_that(peak, equal_to({TENANT_A: 1, TENANT_B: 1, None: 2}))
+        assert_that(limiter.in_flight, equal_to(0))
+        assert_that(limiter.calls, equal_to(10))
+
+    def test_delay_past_the_deadline_fails_without_sleeping(self):
+        limiter = RateLimiter(rate=1, burst=1, tenant_rate=1)
+        with limiter.limit(TENANT_A):
+            pass
+
+        with patch('wazo_agentd_client.ratelimit.time.sleep') as sleep:
+            with Deadline(0.5):
+                assert_that(
+                    calling(limiter.limit(TENANT_A).__enter__),
+                    raises(DeadlineExceededError),
+                )
+
+        sleep.assert_not_called()
+        assert_that(limiter.calls, equal_to(1))
+        # the tokens of the failed call are given back
+        assert_that(limiter._bucket.tokens, close_to(0, 0.01))
+
+    def test_in_flight_wait_ends_at_the_deadline(self):
+        limiter = RateLimiter(max_in_flight=1)
+
+        with limiter.limit():
+            start = time.monotonic()
+            with Deadline(0.02):
+                assert_that(
+                    calling(limiter.limit().__enter__), raises(DeadlineExceededError)
+                )
+
+        assert_that(time.monotonic() - start, less_than(1))
+        assert_that(limiter.in_flight, equal_to(0))
+
+
+class TestRateLimiterAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.alimit(TENANT_A):
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert_that(peak, equal_to(2))
+        assert_that(limiter.waits, equal_to(4))
+        assert_that(limiter.in_flight, equal_to(0))
+
+    async def test_in_flight_wait_ends_at_the_deadline(self):
+        limiter = RateLimiter(max_in_flight=1)
+
+        async with limiter.alimit():
+            with Deadline(0.02):
+                with self.assertRaises(DeadlineExceededError):
+                    async with limiter.alimit():
+                        pass
+
+        assert_that(limiter.in_flight, equal_to(0))
+        assert_that(limiter.calls, equal_to(1))
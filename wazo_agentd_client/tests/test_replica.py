@@ -0,0 +1,175 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    is_not,
+    none,
+    not_none,
+    raises,
+    same_instance,
+)
+
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import _AgentStatus
+from wazo_agentd_client.replica import AgentStatusReplica
+
+TENANT = 'tenant'
+OTHER_TENANT = 'other'
+
+
+def new_status(agent_id, number, tenant_uuid=TENANT, logged=False, queues=()):
+    return _AgentStatus(
+        agent_id,
+        number,
+        'origin',
+        logged=logged,
+        extension='1001' if logged else None,
+        context='default' if logged else None,
+        tenant_uuid=tenant_uuid,
+        queues=list(queues),
+    )
+
+
+class TestAgentStatusReplica(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.statuses = [
+            new_status(1, '1001', logged=True, queues=['sales']),
+            new_status(2, '1002'),
+            new_status(3, '1001', tenant_uuid=OTHER_TENANT),
+        ]
+        self.agents = Mock()
+        self.agents.get_agent_statuses.side_effect = lambda *a, **kw: self.statuses
+        self.replica = AgentStatusReplica(
+            self.agents, max_age=60, clock=lambda: self.now
+        )
+
+    def test_loaded_on_first_read(self):
+        status = self.replica.get_agent_status(1)
+
+        assert_that(status, equal_to(self.statuses[0]))
+        assert_that(status, is_not(same_instance(self.statuses[0])))
+        self.replica.get_agent_status(2)
+        self.agents.get_agent_statuses.assert_called_once_with(None, recurse=True)
+
+    def test_lookups(self):
+        assert_that(
+            self.replica.get_agent_status_by_number('1001', OTHER_TENANT).id,
+            equal_to(3),
+        )
+        assert_that(self.replica.get_agent_status_by_number('1002').id, equal_to(2))
+        assert_that(
+            calling(self.replica.get_agent_status).with_args(1, OTHER_TENANT),
+            raises(AgentdClientError),
+        )
+        assert_that(
+            calling(self.replica.get_agent_status).with_args(42),
+            raises(AgentdClientError),
+        )
+
+    def test_events_update_statuses_in_place(self):
+        status = self.replica.get_agent_status(2)
+        events = [
+            {
+                'name': 'agent_status_update',
+                'data': {
+                    'agent_id': 2,
+                    'status': 'logged_in',
+                    'extension': '1002',
+                    'context': 'default',
+                },
+            },
+            {'name': 'agent_paused', 'data': {'agent_id': 2}},
+            {'name': 'agent_added_to_queue', 'data': {'agent_id': 2, 'queue': 'q'}},
+        ]
+
+        for event in events:
+            assert_that(self.replica.apply_event(event), same_instance(status))
+
+        assert_that(status.logged, equal_to(True))
+        assert_that(status.paused, equal_to(True))
+        assert_that(status.extension, equal_to('1002'))
+        assert_that(status.queues, contains_exactly('q'))
+        assert_that(self.statuses[1].logged, equal_to(False))
+
+        event = {'name': 'agent_status_update', 'data': {'agent_id': 2}}
+        self.replica.apply_event(event)
+
+        assert_that(status.logged, equal_to(False))
+        assert_that(status.paused, equal_to(False))
+        assert_that(status.extension, none())
+
+    def test_sequence_gap_triggers_a_resync(self):
+        self.replica.get_agent_status(1)
+        event = {'name': 'agent_paused', 'data': {'agent_id': 1}}
+
+        self.replica.apply_event(dict(event, sequence=10))
+        self.replica.apply_event(dict(event, sequence=11))
+        assert_that(self.replica.stale, equal_to(False))
+        assert_that(self.replica.apply_event(dict(event, sequence=11)), none())
+
+        self.replica.apply_event(dict(event, sequence=13))
+        assert_that(self.replica.stale, equal_to(True))
+        self.replica.get_agent_status(1)
+        assert_that(self.agents.get_agent_statuses.call_count, equal_to(2))
+
+    def test_events_received_during_a_sync_are_applied(self):
+        login = {
+            'name': 'agent_status_update',
+            'data': {'agent_id': 2, 'status': 'logged_in', 'extension': '1002'},
+            'sequence': 5,
+        }
+
+        def get_agent_statuses(*args, **kwargs):
+            # the snapshot is taken before the event
+            self.replica.apply_event(login)
+            return self.statuses
+
+        self.agents.get_agent_statuses.side_effect = get_agent_statuses
+
+        status = self.replica.get_agent_status(2)
+
+        assert_that(status.logged, equal_to(True))
+        assert_that(status.extension, equal_to('1002'))
+        assert_that(self.replica.stale, equal_to(False))
+        self.replica.apply_event({'name': 'agent_paused', 'data': {'agent_id': 2}})
+        assert_that(self.replica.apply_event(dict(login, sequence=6)), not_none())
+        assert_that(self.replica.stale, equal_to(False))
+
+    def test_sequence_is_kept_by_a_resync(self):
+        self.replica.get_agent_status(1)
+        event = {'name': 'agent_paused', 'data': {'agent_id': 1}}
+        self.replica.apply_event(dict(event, sequence=10))
+        self.replica.apply_event({'name': 'agent_paused', 'data': {'agent_id': 4}})
+
+        self.replica.get_agent_status(1)
+
+        assert_that(self.replica.apply_event(dict(event, sequence=10)), none())
+        self.replica.apply_event(dict(event, sequence=11))
+        assert_that(self.replica.stale, equal_to(False))
+
+    def test_unknown_agent_triggers_a_resync(self):
+        self.replica.get_agent_status(1)
+
+        self.replica.apply_event({'name': 'agent_paused', 'data': {'agent_id': 4}})
+
+        assert_that(self.replica.stale, equal_to(True))
+
+    def test_resync_after_max_age(self):
+        self.replica.get_agent_status(1)
+        self.now = 30
+        self.replica.apply_event({'name': 'agent_unpaused', 'data': {'agent_id': 1}})
+        self.now = 80
+        assert_that(self.replica.stale, equal_to(False))
+
+        self.now = 91
+        self.replica.get_agent_status(1)
+
+        assert_that(self.replica.syncs, equal_to(2))
@@ -0,0 +1,149 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+import requests
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    less_than_or_equal_to,
+    none,
+    not_none,
+    raises,
+)
+from urllib3.exceptions import NewConnectionError
+from wazo_lib_rest_client.tests.command import RESTCommandTestCase
+
+from wazo_agentd_client.error import CircuitOpenError
+from wazo_agentd_client.retry import CircuitBreaker, RetryPolicy
+
+new_response = RESTCommandTestCase.new_response
+
+HOST = 'agentd:443'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_factor=1, max_backoff=3)
+
+    def test_get_is_retried_on_server_errors(self):
+        delay = self.policy.retry_delay(HOST, 'GET', 0, resp=new_response(502))
+
+        assert_that(delay, not_none())
+
+    def test_post_is_not_retried_on_server_errors(self):
+        delay = self.policy.retry_delay(HOST, 'POST', 0, resp=new_response(502))
+
+        assert_that(delay, none())
+
+    def test_post_is_retried_when_rejected(self):
+        delay = self.policy.retry_delay(HOST, 'POST', 0, resp=new_response(503))
+
+        assert_that(delay, not_none())
+
+    def test_post_is_retried_on_connection_errors_only(self):
+        refused = requests.ConnectionError(NewConnectionError(None, 'refused'))
+        reset = requests.ConnectionError('connection reset')
+
+        assert_that(self.policy.retry_delay(HOST, 'POST', 0, error=refused), not_none())
+        assert_that(self.policy.retry_delay(HOST, 'POST', 0, error=reset), none())
+        assert_that(self.policy.retry_delay(HOST, 'GET', 0, error=reset), not_none())
+
+    def test_read_timeout(self):
+        timeout = requests.ReadTimeout()
+
+        assert_that(self.policy.retry_delay(HOST, 'POST', 0, error=timeout), none())
+        assert_that(self.policy.retry_delay(HOST, 'GET', 0, error=timeout), not_none())
+
+    def test_max_attempts(self):
+        delay = self.policy.retry_delay(HOST, 'GET', 2, resp=new_response(503))
+
+        assert_that(delay, none())
+
+    def test_backoff_is_capped(self):
+        for attempt in range(10):
+            assert_that(self.policy.backoff(attempt), less_than_or_equal_to(3))
+
+    def test_retry_after(self):
+        resp = new_response(429)
+        resp.headers['Retry-After'] = '2'
+
+        delay = self.policy.retry_delay(HOST, 'GET', 0, resp=resp)
+
+        assert_that(delay, equal_to(2))
+
+    def test_circuit_breaker_is_fed(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        policy = RetryPolicy(circuit_breaker=breaker)
+
+        policy.retry_delay(HOST, 'GET', 0, resp=new_response(500))
+
+        assert_that(
+            calling(policy.before_attempt).with_args(HOST), raises(CircuitOpenError)
+        )
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=10, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure(HOST)
+        self.breaker.record_success(HOST)
+        self.breaker.record_failure(HOST)
+        assert_that(self.breaker.state(HOST), equal_to('closed'))
+
+        self.breaker.record_failure(HOST)
+
+        assert_that(self.breaker.state(HOST), equal_to('open'))
+        assert_that(self.breaker.allow(HOST), equal_to(False))
+        assert_that(self.breaker.allow('other:443'), equal_to(True))
+
+    def test_half_open_allows_a_single_trial(self):
+        self.breaker.record_failure(HOST)
+        self.breaker.record_failure(HOST)
+        self.clock.now = 10
+
+        assert_that(self.breaker.allow(HOST), equal_to(True))
+        assert_that(self.breaker.allow(HOST), equal_to(False))
+
+        self.breaker.record_success(HOST)
+
+        assert_that(self.breaker.state(HOST), equal_to('closed'))
+
+    def test_released_trial_lets_another_through(self):
+        self.breaker.record_failure(HOST)
+        self.breaker.record_failure(HOST)
+        self.clock.now = 10
+        assert_that(self.breaker.enter(HOST), equal_to(True))
+
+        self.breaker.release(HOST)
+
+        assert_that(self.breaker.state(HOST), equal_to('half-open'))
+        assert_that(self.breaker.enter(HOST), equal_to(True))
+        assert_that(self.breaker.enter(HOST), none())
+        assert_that(self.breaker.enter('other:443'), equal_to(False))
+
+    def test_failed_trial_reopens(self):
+        self.breaker.record_failure(HOST)
+        self.breaker.record_failure(HOST)
+        self.clock.now = 10
+        self.breaker.allow(HOST)
+
+        self.breaker.record_failure(HOST)
+
+        assert_that(self.breaker.state(HOST), equal_to('open'))
+        assert_that(self.breaker.retry_after(HOST), equal_to(10))
@@ -0,0 +1,159 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hamcrest import assert_that, calling, equal_to, not_none, raises
+
+from wazo_agentd_client.deadline import Deadline
+from wazo_agentd_client.error import DeadlineExceededError
+from wazo_agentd_client.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.nb_calls = 0
+
+    def _slow_call(self):
+        self.nb_calls += 1
+        self.release.wait(5)
+        return object()
+
+    def test_concurrent_callers_share_the_call(self):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(self.single_flight.do, 'key', self._slow_call)
+                for _ in range(5)
+            ]
+            while self.single_flight.shared < 4:
+                threading.Event().wait(0.001)
+            self.release.set()
+            results = {id(future.result()) for future in futures}
+
+        assert_that(self.nb_calls, equal_to(1))
+        assert_that(len(results), equal_to(1))
+        assert_that(self.single_flight.calls, equal_to(1))
+
+    def test_sequential_callers_do_not_share(self):
+        self.release.set()
+
+        self.single_flight.do('key', self._slow_call)
+        self.single_flight.do('key', self._slow_call)
+
+        assert_that(self.nb_calls, equal_to(2))
+
+    def test_errors_are_raised(self):
+        def fail():
+            raise ValueError()
+
+        assert_that(
+            calling(self.single_flight.do).with_args('key', fail), raises(ValueError)
+        )
+
+    def test_interrupted_call_is_run_again_by_a_waiting_caller(self):
+        started = threading.Event()
+
+        def interrupted():
+            started.set()
+            self.release.wait(5)
+            raise KeyboardInterrupt()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(self.single_flight.do, 'key', interrupted)
+            started.wait(5)
+            follower = executor.submit(self.single_flight.do, 'key', self._slow_call)
+            while self.single_flight.shared < 1:
+                threading.Event().wait(0.001)
+            self.release.set()
+
+            assert_that(calling(leader.result), raises(KeyboardInterrupt))
+            assert_that(follower.result(), not_none())
+        assert_that(self.nb_calls, equal_to(1))
+
+    def test_callers_wait_until_their_deadline(self):
+        self.addCleanup(self.release.set)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(self.single_flight.do, 'key', self._slow_call)
+            while self.single_flight.calls < 1:
+                threading.Event().wait(0.001)
+
+            with Deadline(0.01):
+                assert_that(
+                    calling(self.single_flight.do).with_args('key', self._slow_call),
+                    raises(DeadlineExceededError),
+                )
+            self.release.set()
+
+
+class TestSingleFlightAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_the_call(self):
+        single_flight = SingleFlight()
+        nb_calls = 0
+
+        async def call():
+            nonlocal nb_calls
+            nb_calls += 1
+            await asyncio.sleep(0.01)
+            return nb_calls
+
+        results = await asyncio.gather(
+            *(single_flight.ado('key', call) for _ in range(5))
+        )
+
+        assert_that(results, equal_to([1] * 5))
+        assert_that(single_flight.shared, equal_to(4))
+
+    async def test_errors_are_raised_to_every_caller(self):
+        single_flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError()
+
+        results = await asyncio.gather(
+            single_flight.ado('key', fail),
+            single_flight.ado('key', fail),
+            return_exceptions=True,
+        )
+
+        assert_that([type(result) for result in results], equal_to([ValueError] * 2))
+
+    async def test_cancelled_call_is_run_again_by_a_waiting_caller(self):
+        single_flight = SingleFlight()
+        nb_calls = 0
+
+        async def call():
+            nonlocal nb_calls
+            nb_calls += 1
+            await asyncio.sleep(0.01)
+            return nb_calls
+
+        leader = asyncio.create_task(single_flight.ado('key', call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.ado('key', call))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert_that(await follower, equal_to(2))
+        assert_that(leader.cancelled(), equal_to(True))
+        assert_that(single_flight.calls, equal_to(2))
+
+    async def test_callers_wait_until_their_deadline(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+
+        leader = asyncio.create_task(single_flight.ado('key', call))
+        await asyncio.sleep(0)
+        with Deadline(0.01):
+            with self.assertRaises(DeadlineExceededError):
+                await single_flight.ado('key', call)
+        release.set()
+        await leader
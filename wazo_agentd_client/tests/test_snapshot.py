@@ -0,0 +1,229 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, calling, contains_exactly, equal_to, raises
+
+from wazo_agentd_client import error
+from wazo_agentd_client.cache import ValidatorCache
+from wazo_agentd_client.error import AgentdClientError
+from wazo_agentd_client.helpers import _AgentStatus
+from wazo_agentd_client.snapshot import (
+    StatusSnapshot,
+    refresh_snapshot,
+    save_snapshot,
+)
+
+TENANT = 'tenant'
+OTHER_TENANT = 'other'
+VALIDATORS = {TENANT: {'If-None-Match': '"abc"'}}
+
+
+def new_status(agent_id, number, tenant_uuid=TENANT, logged=False, queues=()):
+    return _AgentStatus(
+        agent_id,
+        number,
+        'origin',
+        logged=logged,
+        paused=logged,
+        extension='1001' if logged else None,
+        context='default' if logged else None,
+        state_interface='PJSIP/abc' if logged else None,
+        tenant_uuid=tenant_uuid,
+        queues=list(queues),
+    )
+
+
+class TestStatusSnapshot(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'statuses')
+        self.statuses = [
+            new_status(3, '1001', tenant_uuid=OTHER_TENANT),
+            new_status(1, '1001', logged=True, queues=['sales', 'support']),
+            new_status(2, '1002', queues=['sales']),
+        ]
+
+    def open(self):
+        snapshot = StatusSnapshot(self.path)
+        self.addCleanup(snapshot.close)
+        return snapshot
+
+    def test_save_and_open(self):
+        save_snapshot(self.path, self.statuses, VALIDATORS, timestamp=1234.5)
+
+        snapshot = self.open()
+
+        assert_that(len(snapshot), equal_to(3))
+        assert_that(snapshot.timestamp, equal_to(1234.5))
+        assert_that(snapshot.validators, equal_to(VALIDATORS))
+        assert_that(snapshot.tenants, contains_exactly(TENANT, OTHER_TENANT))
+        assert_that(
+            snapshot.get_agent_statuses(),
+            contains_exactly(self.statuses[1], self.statuses[2], self.statuses[0]),
+        )
+        assert_that(
+            snapshot.get_agent_statuses(OTHER_TENANT),
+            contains_exactly(self.statuses[0]),
+        )
+
+    def test_lookups(self):
+        save_snapshot(self.path, self.statuses)
+        snapshot = self.open()
+
+        assert_that(snapshot.get_agent_status(1), equal_to(self.statuses[1]))
+        assert_that(
+            snapshot.get_agent_status_by_number('1001', OTHER_TENANT),
+            equal_to(self.statuses[0]),
+        )
+        assert_that(
+            snapshot.get_agent_status_by_number('1002'), equal_to(self.statuses[2])
+        )
+        assert_that(
+            calling(snapshot.get_agent_status).with_args(4),
+            raises(AgentdClientError),
+        )
+        assert_that(
+            calling(snapshot.get_agent_status).with_args(1, OTHER_TENANT),
+            raises(AgentdClientError),
+        )
+        assert_that(
+            calling(snapshot.get_agent_status_by_number).with_args('1003'),
+            raises(AgentdClientError),
+        )
+
+    def test_lookup_arguments_normalized(self):
+        save_snapshot(self.path, self.statuses)
+        snapshot = self.open()
+
+        assert_that(snapshot.get_agent_status('1'), equal_to(self.statuses[1]))
+        assert_that(
+            snapshot.get_agent_status_by_number(1002), equal_to(self.statuses[2])
+        )
+        for agent_id in ('abc', None):
+            with self.assertRaises(AgentdClientError) as cm:
+                snapshot.get_agent_status(agent_id)
+            assert_that(cm.exception.error, equal_to(error.NO_SUCH_AGENT))
+
+    def test_empty(self):
+        save_snapshot(self.path, [])
+        snapshot = self.open()
+
+        assert_that(len(snapshot), equal_to(0))
+        assert_that(
+            calling(snapshot.get_agent_status).with_args(1),
+            raises(AgentdClientError),
+        )
+
+    def test_open_previous_after_save(self):
+        save_snapshot(self.path, self.statuses)
+        snapshot = self.open()
+
+        save_snapshot(self.path, [])
+
+        assert_that(snapshot.get_agent_status(2), equal_to(self.statuses[2]))
+        assert_that(len(self.open()), equal_to(0))
+
+    def test_not_a_snapshot(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        assert_that(calling(StatusSnapshot).with_args(self.path), raises(ValueError))
+
+
+class TestRefreshSnapshot(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'statuses')
+        self.validator_cache = ValidatorCache()
+        self.agents = Mock()
+        self.agents._client.validator_cache = self.validator_cache
+        self.agents._status_all_validator_key.side_effect = (
+            lambda tenant=None, recurse=False: 'recursive' if recurse else tenant
+        )
+
+    def test_cold_start_reads_every_tenant(self):
+        statuses = [new_status(1, '1001'), new_status(2, '1002', OTHER_TENANT)]
+        self.agents.get_agent_statuses.return_value = statuses
+
+        with refresh_snapshot(self.agents, self.path) as snapshot:
+            assert_that(snapshot.get_agent_statuses(), equal_to(statuses))
+            assert_that(snapshot.tenants, contains_exactly(TENANT, OTHER_TENANT))
+
+        self.agents.get_agent_statuses.assert_called_once_with(recurse=True)
+
+    def recursive_read(self, statuses, etag):
+        def get_agent_statuses(recurse):
+            validated = self.validator_cache.get('recursive')
+            self.sent.append(validated and validated[0])
+            if validated and validated[0]['If-None-Match'] == etag:
+                return validated[1]
+            self.validator_cache.seed('recursive', {'If-None-Match': etag}, statuses)
+            return statuses
+
+        self.sent = []
+        self.agents.get_agent_statuses.side_effect = get_agent_statuses
+
+    def test_second_recursive_refresh_is_not_modified(self):
+        statuses = [new_status(1, '1001')]
+        self.recursive_read(statuses, '"a"')
+
+        refresh_snapshot(self.agents, self.path).close()
+        self.validator_cache.clear()
+        with refresh_snapshot(self.agents, self.path) as snapshot:
+            assert_that(snapshot.get_agent_statuses(), equal_to(statuses))
+            assert_that(
+                snapshot.recursive_validators, equal_to({'If-None-Match': '"a"'})
+            )
+
+        assert_that(self.sent, equal_to([None, {'If-None-Match': '"a"'}]))
+
+    def test_recursive_refresh_finds_new_tenants(self):
+        save_snapshot(
+            self.path,
+            [new_status(1, '1001')],
+            recursive_validators={'If-None-Match': '"a"'},
+        )
+        statuses = [new_status(1, '1001'), new_status(2, '1002', OTHER_TENANT)]
+        self.recursive_read(statuses, '"b"')
+
+        with refresh_snapshot(self.agents, self.path) as snapshot:
+            assert_that(snapshot.tenants, contains_exactly(TENANT, OTHER_TENANT))
+            assert_that(
+                snapshot.recursive_validators, equal_to({'If-None-Match': '"b"'})
+            )
+
+        assert_that(self.sent, equal_to([{'If-None-Match': '"a"'}]))
+
+    def test_validators_of_previous_snapshot_sent(self):
+        unchanged = [new_status(1, '1001')]
+        save_snapshot(self.path, unchanged, VALIDATORS)
+        changed = [new_status(2, '1002', OTHER_TENANT, logged=True)]
+        sent = {}
+
+        def get_agent_statuses(tenant_uuid):
+            validated = self.validator_cache.get(tenant_uuid)
+            sent[tenant_uuid] = validated and validated[0]
+            if tenant_uuid == TENANT:
+                return validated[1]
+            self.validator_cache.seed(tenant_uuid, {'If-None-Match': '"b"'}, changed)
+            return changed
+
+        self.agents.get_agent_statuses.side_effect = get_agent_statuses
+
+        with refresh_snapshot(
+            self.agents, self.path, tenant_uuids=[TENANT, OTHER_TENANT]
+        ) as snapshot:
+            assert_that(snapshot.get_agent_statuses(), equal_to(unchanged + changed))
+            assert_that(
+                snapshot.validators,
+                equal_to({**VALIDATORS, OTHER_TENANT: {'If-None-Match': '"b"'}}),
+            )
+
+        assert_that(sent, equal_to({**VALIDATORS, OTHER_TENANT: None}))